@@ -73,6 +73,7 @@ export default function AdvancedConfigEditor() {
   const [buildProgress, setBuildProgress] = useState(0);
   const [buildComplete, setBuildComplete] = useState(false);
   const [buildLogs, setBuildLogs] = useState<string[]>([]);
+  const [activeBuildId, setActiveBuildId] = useState<string | null>(null);
 
   const [config, setConfig] = useState<BackendConfig>({
     app_name: "My WebView App",
@@ -98,6 +99,12 @@ export default function AdvancedConfigEditor() {
           user_agent: "",
           built_in_zoom_controls: false,
           support_zoom: false,
+          use_asset_loader: true,
+          cache_mode: "default",
+          layer_type: "hardware",
+          dom_storage: true,
+          offscreen_pre_raster: true,
+          renderer_priority: "important",
         },
         build: {
           build_type: "release",
@@ -289,54 +296,55 @@ export default function AdvancedConfigEditor() {
         `✅ Build started with ID: ${result.build_id || "unknown"}`,
       ]);
 
-      // If we have a build ID, poll for status
+      // If we have a build ID, follow its live event stream
       if (result.build_id) {
-        const pollInterval = setInterval(async () => {
-          try {
-            const status = await backendClient.getBuildStatus(result.build_id!);
+        setActiveBuildId(result.build_id);
 
-            setBuildLogs(status.logs);
+        const initial = await backendClient.getBuildStatus(result.build_id);
+        if (initial.status === "queued" && initial.queue_position) {
+          setBuildLogs((prev) => [
+            ...prev,
+            `⏳ Queued at position ${initial.queue_position}` +
+              (initial.eta_seconds != null
+                ? ` (ready in ~${Math.ceil(initial.eta_seconds / 60)} min)`
+                : ""),
+          ]);
+        }
 
-            if (status.status === "completed") {
-              clearInterval(pollInterval);
-              setBuildProgress(100);
+        const unsubscribe = backendClient.subscribeToBuildEvents(
+          result.build_id,
+          {
+            onLog: (line) => setBuildLogs((prev) => [...prev, line]),
+            onProgress: ({ progress }) => setBuildProgress(progress),
+            onStatus: ({ status, message }) => {
+              if (status === "queued" && message) {
+                setBuildLogs((prev) => [...prev, `⏳ ${message}`]);
+              }
+            },
+            onDone: (status) => {
+              unsubscribe();
               setIsBuilding(false);
-              setBuildComplete(true);
-              setBuildLogs((prev) => [
-                ...prev,
-                "🎉 Build completed successfully!",
-              ]);
-            } else if (status.status === "failed") {
-              clearInterval(pollInterval);
+              if (status.status === "completed") {
+                setBuildProgress(100);
+                setBuildComplete(true);
+                setBuildLogs((prev) => [
+                  ...prev,
+                  "🎉 Build completed successfully!",
+                ]);
+              } else {
+                setBuildLogs((prev) => [
+                  ...prev,
+                  `❌ Build failed${status.error ? `: ${status.error}` : ""}`,
+                ]);
+              }
+            },
+            onError: (error) => {
+              unsubscribe();
               setIsBuilding(false);
-              setBuildLogs((prev) => [...prev, "❌ Build failed"]);
-              throw new Error("Build failed on backend");
-            } else {
-              // Update progress based on logs
-              const progressPercent = Math.min(
-                (status.logs.length / 10) * 100,
-                90,
-              );
-              setBuildProgress(progressPercent);
-            }
-          } catch (error) {
-            clearInterval(pollInterval);
-            setIsBuilding(false);
-            console.error("Status polling failed:", error);
-          }
-        }, 2000);
-
-        // Cleanup after 10 minutes
-        setTimeout(() => {
-          clearInterval(pollInterval);
-          if (isBuilding) {
-            setIsBuilding(false);
-            setBuildLogs((prev) => [
-              ...prev,
-              "⚠️ Build status polling timed out",
-            ]);
-          }
-        }, 600000);
+              console.error("Build event stream failed:", error);
+            },
+          },
+        );
       } else {
         // No build ID, simulate completion
         setBuildProgress(100);
@@ -974,7 +982,7 @@ export default function AdvancedConfigEditor() {
 
       {/* Backend Status */}
       <Box sx={{ mb: 3 }}>
-        <BackendStatus />
+        <BackendStatus buildId={activeBuildId} />
       </Box>
 
       {!buildComplete ? (
@@ -6,6 +6,7 @@ import {
   Error as ErrorIcon,
   ExpandMore,
   Refresh,
+  Terminal,
 } from "@mui/icons-material";
 import {
   Accordion,
@@ -18,11 +19,19 @@ import {
   CardContent,
   Chip,
   CircularProgress,
+  LinearProgress,
   Typography,
 } from "@mui/material";
 import { useEffect, useState } from "react";
 
-export default function BackendStatus() {
+// Live log lines kept on screen
+const MAX_LIVE_LOG_LINES = 500;
+
+interface BackendStatusProps {
+  buildId?: string | null;
+}
+
+export default function BackendStatus({ buildId }: BackendStatusProps = {}) {
   const [status, setStatus] = useState<
     "checking" | "connected" | "disconnected"
   >("checking");
@@ -31,6 +40,49 @@ export default function BackendStatus() {
   );
   const [error, setError] = useState<string | null>(null);
   const [yamlPreview, setYamlPreview] = useState<string>("");
+  const [liveLogs, setLiveLogs] = useState<string[]>([]);
+  const [liveStage, setLiveStage] = useState<string | null>(null);
+  const [liveProgress, setLiveProgress] = useState(0);
+  const [liveStatus, setLiveStatus] = useState<string | null>(null);
+
+  // Follow the active build's event stream (shared with other subscribers)
+  useEffect(() => {
+    if (!buildId) {
+      return;
+    }
+    setLiveLogs([]);
+    setLiveStage(null);
+    setLiveProgress(0);
+    setLiveStatus(null);
+
+    let unsubscribe: (() => void) | undefined;
+    let cancelled = false;
+    import("../lib/backend-client").then(({ backendClient }) => {
+      if (cancelled) {
+        return;
+      }
+      unsubscribe = backendClient.subscribeToBuildEvents(buildId, {
+        onLog: (line) =>
+          setLiveLogs((prev) => [...prev, line].slice(-MAX_LIVE_LOG_LINES)),
+        onProgress: ({ progress, stage }) => {
+          setLiveProgress(progress);
+          setLiveStage(stage);
+        },
+        onStatus: ({ status }) => setLiveStatus(status),
+        onDone: (status) => {
+          setLiveStatus(status.status);
+          if (status.status === "completed") {
+            setLiveProgress(100);
+          }
+        },
+      });
+    });
+
+    return () => {
+      cancelled = true;
+      unsubscribe?.();
+    };
+  }, [buildId]);
 
   const checkBackendStatus = async () => {
     setStatus("checking");
@@ -185,6 +237,47 @@ export default function BackendStatus() {
           </Box>
         )}
 
+        {buildId && (
+          <Accordion defaultExpanded>
+            <AccordionSummary expandIcon={<ExpandMore />}>
+              <Terminal sx={{ mr: 1 }} />
+              <Typography>Live Build Logs</Typography>
+              {liveStatus && (
+                <Chip size="small" label={liveStatus} sx={{ ml: 2 }} />
+              )}
+              {liveStage && (
+                <Chip
+                  size="small"
+                  variant="outlined"
+                  label={`Stage: ${liveStage}`}
+                  sx={{ ml: 1 }}
+                />
+              )}
+            </AccordionSummary>
+            <AccordionDetails>
+              <LinearProgress
+                variant="determinate"
+                value={liveProgress}
+                sx={{ mb: 2 }}
+              />
+              <Box
+                sx={{
+                  bgcolor: "grey.900",
+                  color: "grey.100",
+                  p: 2,
+                  borderRadius: 1,
+                  fontFamily: "monospace",
+                  fontSize: "0.75rem",
+                  overflow: "auto",
+                  maxHeight: 300,
+                }}
+              >
+                <pre>{liveLogs.join("\n") || "Waiting for build output..."}</pre>
+              </Box>
+            </AccordionDetails>
+          </Accordion>
+        )}
+
         <Accordion>
           <AccordionSummary expandIcon={<ExpandMore />}>
             <Computer sx={{ mr: 1 }} />
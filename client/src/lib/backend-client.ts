@@ -5,15 +5,55 @@
 
 import type {
   BackendConfig,
+  BuildEventHandlers,
   DockerBuildRequest,
   DockerBuildResponse,
   DockerBuildStatus,
 } from "../types/backend-config";
 
+const EVENT_STREAM_RETRIES = 5;
+const EVENT_STREAM_RETRY_DELAY_MS = 2000;
+const DOWNLOAD_RETRIES = 5;
+const DOWNLOAD_RETRY_DELAY_MS = 1000;
+
+// Uploaded as-is and expanded by the backend
+const ARCHIVE_SUFFIXES = [".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz"];
+
+function isArchive(file: File): boolean {
+  const name = file.name.toLowerCase();
+  return ARCHIVE_SUFFIXES.some((suffix) => name.endsWith(suffix));
+}
+
+// Site-relative paths: folder uploads drop the selected folder's own name
+function assetPaths(files: File[]): string[] {
+  const paths = files.map(
+    (file) =>
+      (file as File & { webkitRelativePath?: string }).webkitRelativePath ||
+      file.name,
+  );
+  const roots = new Set(paths.map((path) => path.split("/")[0]));
+  if (roots.size === 1 && paths.every((path) => path.includes("/"))) {
+    return paths.map((path) => path.split("/").slice(1).join("/"));
+  }
+  return paths;
+}
+
+async function sha256Hex(file: File): Promise<string> {
+  const digest = await crypto.subtle.digest("SHA-256", await file.arrayBuffer());
+  return Array.from(new Uint8Array(digest))
+    .map((byte) => byte.toString(16).padStart(2, "0"))
+    .join("");
+}
+
 class BackendClient {
   private baseUrl: string;
   private timeout: number;
   private debugMode: boolean;
+  // One event stream per build, shared by every component watching it
+  private eventStreams = new Map<
+    string,
+    { close: () => void; handlers: Set<BuildEventHandlers> }
+  >();
 
   constructor() {
     this.baseUrl =
@@ -40,37 +80,23 @@ class BackendClient {
         console.log("Backend URL:", this.baseUrl);
       }
 
+      // Assets go to the content-addressed store first; unchanged files are not re-sent
+      const webappAssetsId =
+        webappAssets && webappAssets.length > 0
+          ? (await this.uploadWebappAssets(webappAssets)).sessionId
+          : undefined;
+
       const buildRequest: DockerBuildRequest = {
         config,
         platform: platform as any,
         skip_errors: false,
-        webapp_assets: webappAssets,
+        webapp_assets: webappAssetsId,
       };
 
-      // If webapp assets are provided, use FormData
-      let body: string | FormData;
-      const headers: Record<string, string> = {};
-
-      if (webappAssets && webappAssets.length > 0) {
-        const formData = new FormData();
-        formData.append("config", JSON.stringify(config));
-        formData.append("platform", platform);
-        formData.append("skip_errors", "false");
-
-        webappAssets.forEach((file, index) => {
-          formData.append(`webapp_assets_${index}`, file);
-        });
-
-        body = formData;
-      } else {
-        headers["Content-Type"] = "application/json";
-        body = JSON.stringify(buildRequest);
-      }
-
       const response = await fetch(`${this.baseUrl}/build`, {
         method: "POST",
-        headers,
-        body,
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(buildRequest),
         signal: AbortSignal.timeout(this.timeout),
       });
 
@@ -119,39 +145,308 @@ class BackendClient {
   }
 
   /**
-   * Download build artifact
+   * Subscribe to live build events (status, progress, log lines).
+   * Uses the backend's Server-Sent Events stream, which resumes after
+   * reconnects, and reads the same stream with fetch without EventSource.
+   * Returns a function that unsubscribes.
    */
-  async downloadArtifact(buildId: string, platform: string): Promise<Blob> {
-    try {
-      const response = await fetch(
-        `${this.baseUrl}/build/${buildId}/download/${platform}`,
-        {
-          method: "GET",
+  subscribeToBuildEvents(
+    buildId: string,
+    handlers: BuildEventHandlers,
+  ): () => void {
+    let stream = this.eventStreams.get(buildId);
+    if (!stream) {
+      const subscribers = new Set<BuildEventHandlers>();
+      // A finished stream is never reused; later subscribers open a new one
+      const forget = () => {
+        if (this.eventStreams.get(buildId) === stream) {
+          this.eventStreams.delete(buildId);
+        }
+      };
+      const emit = (callback: (h: BuildEventHandlers) => void) =>
+        subscribers.forEach(callback);
+      const close =
+        typeof EventSource === "undefined"
+          ? this.readBuildEvents(buildId, emit, forget)
+          : this.streamBuildEvents(buildId, emit, forget);
+      stream = {
+        handlers: subscribers,
+        close: () => {
+          close();
+          forget();
         },
-      );
+      };
+      this.eventStreams.set(buildId, stream);
+    }
+
+    const current = stream;
+    current.handlers.add(handlers);
+    return () => {
+      current.handlers.delete(handlers);
+      if (current.handlers.size === 0) {
+        current.close();
+      }
+    };
+  }
+
+  private streamBuildEvents(
+    buildId: string,
+    emit: (callback: (h: BuildEventHandlers) => void) => void,
+    finished: () => void,
+  ): () => void {
+    const source = new EventSource(
+      `${this.baseUrl}/build/${buildId}/events`,
+    );
+    const parse = (event: Event) => JSON.parse((event as MessageEvent).data);
+
+    source.addEventListener("status", (event) =>
+      emit((h) => h.onStatus?.(parse(event))),
+    );
+    source.addEventListener("progress", (event) =>
+      emit((h) => h.onProgress?.(parse(event))),
+    );
+    source.addEventListener("log", (event) =>
+      emit((h) => h.onLog?.(parse(event).line)),
+    );
+    source.addEventListener("done", (event) => {
+      source.close();
+      finished();
+      emit((h) => h.onDone?.(parse(event)));
+    });
+    source.onerror = () => {
+      // EventSource reconnects on its own (sending Last-Event-ID); report only when it gives up
+      if (source.readyState === EventSource.CLOSED) {
+        finished();
+        emit((h) => h.onError?.(new Error("Build event stream closed")));
+      }
+    };
+
+    return () => source.close();
+  }
+
+  // Without EventSource: reads the same /events stream with fetch and
+  // resumes after the last event id when the connection drops
+  private readBuildEvents(
+    buildId: string,
+    emit: (callback: (h: BuildEventHandlers) => void) => void,
+    finished: () => void,
+  ): () => void {
+    const controller = new AbortController();
+    let lastEventId = 0;
+    let failures = 0;
+
+    const dispatch = (block: string): boolean => {
+      let name = "message";
+      let id: string | undefined;
+      const data: string[] = [];
+      for (const line of block.split("\n")) {
+        if (line.startsWith("id:")) {
+          id = line.slice(3).trim();
+        } else if (line.startsWith("event:")) {
+          name = line.slice(6).trim();
+        } else if (line.startsWith("data:")) {
+          data.push(line.slice(5).trimStart());
+        }
+      }
+      if (data.length === 0) {
+        return false; // retry: or keepalive
+      }
+      if (id) {
+        lastEventId = parseInt(id, 10) || lastEventId;
+      }
+      const payload = JSON.parse(data.join("\n"));
+      if (name === "status") {
+        emit((h) => h.onStatus?.(payload));
+      } else if (name === "progress") {
+        emit((h) => h.onProgress?.(payload));
+      } else if (name === "log") {
+        emit((h) => h.onLog?.(payload.line));
+      } else if (name === "done") {
+        finished();
+        emit((h) => h.onDone?.(payload));
+        return true;
+      }
+      return false;
+    };
+
+    const read = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const response = await fetch(
+            `${this.baseUrl}/build/${buildId}/events?last_event_id=${lastEventId}`,
+            { signal: controller.signal },
+          );
+          if (!response.ok) {
+            const errorText = await response.text();
+            throw new Error(
+              `Event stream failed (${response.status}): ${errorText}`,
+            );
+          }
+          const reader = response.body!.getReader();
+          const decoder = new TextDecoder();
+          let buffer = "";
+          while (true) {
+            const { done, value } = await reader.read();
+            if (done) {
+              break;
+            }
+            failures = 0;
+            buffer += decoder.decode(value, { stream: true });
+            let end = buffer.indexOf("\n\n");
+            while (end !== -1) {
+              if (dispatch(buffer.slice(0, end))) {
+                return;
+              }
+              buffer = buffer.slice(end + 2);
+              end = buffer.indexOf("\n\n");
+            }
+          }
+        } catch (error) {
+          if (controller.signal.aborted) {
+            return;
+          }
+          if (++failures > EVENT_STREAM_RETRIES) {
+            finished();
+            emit((h) => h.onError?.(error as Error));
+            return;
+          }
+        }
+        // Dropped before "done": reconnect after the last event we saw
+        await new Promise((resolve) =>
+          setTimeout(resolve, EVENT_STREAM_RETRY_DELAY_MS),
+        );
+      }
+    };
+    read();
+
+    return () => controller.abort();
+  }
+
+  /**
+   * Download build artifact.
+   * An interrupted download resumes where it stopped (HTTP Range with
+   * If-Range), so large artifacts over flaky links are not re-sent from zero.
+   */
+  async downloadArtifact(buildId: string, platform: string): Promise<Blob> {
+    const url = `${this.baseUrl}/build/${buildId}/download/${platform}`;
+    const chunks: Uint8Array[] = [];
+    let received = 0;
+    let etag: string | null = null;
+
+    for (let attempt = 0; ; attempt++) {
+      const headers: Record<string, string> = {};
+      if (received > 0 && etag) {
+        headers.Range = `bytes=${received}-`;
+        headers["If-Range"] = etag;
+      }
+
+      let response: Response;
+      try {
+        response = await fetch(url, { method: "GET", headers });
+      } catch (error) {
+        if (attempt >= DOWNLOAD_RETRIES) {
+          console.error("Download failed:", error);
+          throw error;
+        }
+        await new Promise((resolve) =>
+          setTimeout(resolve, DOWNLOAD_RETRY_DELAY_MS * (attempt + 1)),
+        );
+        continue;
+      }
 
       if (!response.ok) {
         const errorText = await response.text();
-        throw new Error(`Download failed (${response.status}): ${errorText}`);
+        const error = new Error(
+          `Download failed (${response.status}): ${errorText}`,
+        );
+        console.error("Download failed:", error);
+        throw error;
       }
 
-      return await response.blob();
-    } catch (error) {
-      console.error("Download failed:", error);
-      throw error;
+      if (response.status === 200 && received > 0) {
+        // The artifact changed since the first attempt; start over
+        chunks.length = 0;
+        received = 0;
+      }
+      etag = response.headers.get("ETag");
+
+      try {
+        const reader = response.body!.getReader();
+        while (true) {
+          const { done, value } = await reader.read();
+          if (done) {
+            break;
+          }
+          chunks.push(value);
+          received += value.length;
+        }
+        return new Blob(chunks, {
+          type:
+            response.headers.get("Content-Type") || "application/octet-stream",
+        });
+      } catch (error) {
+        if (attempt >= DOWNLOAD_RETRIES) {
+          console.error("Download failed:", error);
+          throw error;
+        }
+        await new Promise((resolve) =>
+          setTimeout(resolve, DOWNLOAD_RETRY_DELAY_MS * (attempt + 1)),
+        );
+      }
     }
   }
 
   /**
-   * Upload webapp assets to backend
+   * Upload webapp assets to backend.
+   * Files are hashed first and only content the backend does not have yet
+   * is sent, so re-uploading an unchanged site transfers no file data.
+   * Zip/tar archives are sent as-is and expanded by the backend.
    */
   async uploadWebappAssets(
     files: File[],
   ): Promise<{ success: boolean; sessionId: string }> {
     try {
+      const archives = files.filter(isArchive);
+      const plainFiles = files.filter((file) => !isArchive(file));
+      const paths = assetPaths(plainFiles);
+      const entries = await Promise.all(
+        plainFiles.map(async (file, index) => ({
+          path: paths[index],
+          sha256: await sha256Hex(file),
+        })),
+      );
+
+      let missing = new Set(paths);
+      if (archives.length === 0) {
+        const check = await fetch(`${this.baseUrl}/upload`, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ files: entries }),
+        });
+        if (!check.ok) {
+          throw new Error(
+            `Upload failed (${check.status}): ${await check.text()}`,
+          );
+        }
+        const result = await check.json();
+        if (result.sessionId) {
+          return { success: true, sessionId: result.sessionId };
+        }
+        missing = new Set<string>(result.missing);
+      }
+
       const formData = new FormData();
-      files.forEach((file, index) => {
-        formData.append(`file_${index}`, file);
+      formData.append(
+        "manifest",
+        JSON.stringify(entries.filter((entry) => !missing.has(entry.path))),
+      );
+      plainFiles.forEach((file, index) => {
+        if (missing.has(paths[index])) {
+          formData.append(`file_${index}`, file, paths[index]);
+        }
+      });
+      archives.forEach((file, index) => {
+        formData.append(`archive_${index}`, file, file.name);
       });
 
       const response = await fetch(`${this.baseUrl}/upload`, {
@@ -10,6 +10,21 @@ export interface BackendConfig {
   author: string;
   url: string;
 
+  // Runtime config written to app-config.json/app-config.js in each asset root
+  app_config?: Record<string, string | number | boolean>;
+  // Opt-in streaming __KEY__ substitution in bundled files
+  asset_tokens?: {
+    enabled: boolean;
+    globs?: string[];
+    token_format?: string;
+  };
+  // Content-addressed build cache (local dir and optional shared server)
+  cache?: {
+    local_dir?: string;
+    remote_url?: string;
+    timeout?: number;
+  };
+
   // Platform-Specific Configurations
   platform_config: {
     android?: AndroidConfig;
@@ -38,6 +53,16 @@ export interface AndroidConfig {
     user_agent?: string;
     built_in_zoom_controls: boolean;
     support_zoom: boolean;
+    // WebView performance options
+    use_asset_loader?: boolean;
+    cache_mode?: "default" | "cache_else_network" | "no_cache" | "cache_only";
+    layer_type?: "hardware" | "software" | "none";
+    dom_storage?: boolean;
+    offscreen_pre_raster?: boolean;
+    renderer_priority?: "important" | "bound" | "waived";
+    // Precache manifest / service worker for bundled assets
+    precache_manifest?: boolean;
+    service_worker?: boolean;
   };
   build: {
     build_type: "debug" | "release";
@@ -48,7 +73,17 @@ export interface AndroidConfig {
     version_code: number;
     version_name: string;
     gradle_custom_configs?: Record<string, any>;
+    // gradle.properties sizing: container limits are split across `concurrency` builds
+    concurrency?: number;
+    configuration_cache?: boolean;
+    gradle_properties?: Record<string, string | number | boolean>;
+    // Pre-seeded file-based Maven repo for offline (-o) builds
+    offline_maven_repo?: string;
   };
+  // Product flavors: branded variants built in one Gradle invocation
+  flavors?: Record<string, AndroidFlavorConfig>;
+  // Bundle a runtime config asset so the APK can be re-skinned without recompiling
+  runtime_config?: boolean;
   signing?: {
     keystore_file_in_container: string;
     keystore_password: string;
@@ -57,6 +92,17 @@ export interface AndroidConfig {
   };
 }
 
+export interface AndroidFlavorConfig {
+  package_name: string;
+  app_name?: string;
+  url?: string;
+  theme_color?: string;
+  splash_background_color?: string;
+  splash_text_color?: string;
+  logo?: string;
+  version_name_suffix?: string;
+}
+
 export interface IOSConfig {
   build: {
     target_os_version: string;
@@ -114,6 +160,8 @@ export interface WindowsConfig {
     frameless: boolean;
     background_color: string;
     user_agent?: string;
+    precache_manifest?: boolean;
+    service_worker?: boolean;
   };
   icon?: string;
 }
@@ -142,7 +190,10 @@ export interface DockerBuildRequest {
   config: BackendConfig;
   platform: "all" | "android" | "ios" | "linux" | "windows" | "macos";
   skip_errors?: boolean;
-  webapp_assets?: File[]; // For file uploads
+  webapp_assets?: string; // Upload id from uploadWebappAssets
+  priority?: "interactive" | "default" | "batch" | number;
+  tenant?: string;
+  preview?: boolean; // Generator only, no native build
 }
 
 // Docker build response interface
@@ -164,5 +215,27 @@ export interface DockerBuildStatus {
     filename: string;
     download_url: string;
     size: number;
+    sha256?: string;
+    metadata?: Record<string, string | number>;
   }[];
+  progress?: number; // 0-100
+  message?: string | null;
+  error?: string | null;
+  attempts?: number;
+  queue_position?: number | null;
+  eta_seconds?: number | null;
+}
+
+// Build event stream (/build/{id}/events) handlers
+export interface BuildEventHandlers {
+  onStatus?: (event: {
+    status: DockerBuildStatus["status"];
+    message?: string;
+    error?: string;
+    attempt?: number;
+  }) => void;
+  onProgress?: (event: { progress: number; stage: string }) => void;
+  onLog?: (line: string) => void;
+  onDone?: (status: DockerBuildStatus) => void;
+  onError?: (error: Error) => void;
 }
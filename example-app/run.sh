@@ -11,9 +11,11 @@ HOST_OUTPUT_DIR="$(pwd)/output"
 HOST_WEBAPP_ASSETS_DIR="$(pwd)/app/src/webapp"
 HOST_CONFIG_FILE="$(pwd)/config.yaml" # the config file
 HOST_BUILD_DIR="$(pwd)/app/build" # adding the build dir folder as it contains all platfrom specific build opts
+HOST_CACHE_DIR="$(pwd)/.appizer-cache" # persistent build caches (Go modules/build cache) reused across runs
 
 # Ensure output directory exists on host
 mkdir -p "$HOST_OUTPUT_DIR"
+mkdir -p "$HOST_CACHE_DIR"
 
 # Parse arguments for platform and skip_errors
 PLATFORM=""
@@ -59,4 +61,5 @@ docker run --rm \
   -v "${HOST_WEBAPP_ASSETS_DIR}":/webapp \
   -v "${HOST_CONFIG_FILE}":/config.yaml \
   -v "${HOST_BUILD_DIR}":/build \
+  -v "${HOST_CACHE_DIR}":/cache \
   "$IMAGE_NAME" $BUILD_ARGS
\ No newline at end of file
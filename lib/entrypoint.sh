@@ -4,15 +4,24 @@
 echo "--- Multi-Platform WebView App Builder ---"
 
 # --- Define Paths ---
-CONFIG_FILE="/config.yaml"                           # User's mounted config.yaml
-DEFAULT_CONFIG_FILE="/generator/default_config.yaml" # Default config baked into image
-ACTIVE_CONFIG_FILE="/generator/config.yaml"          # The config file that main.py will read
-
-WEBAPP_ASSETS_DIR="/webapp"
-OUTPUT_DIR="/output"
+# Every path can be overridden from the environment, so build_worker.py can run several jobs
+# side by side in one container, each with its own workspace, config and output dir.
+CONFIG_FILE="${CONFIG_FILE:-/config.yaml}"                                   # User's mounted config.yaml
+DEFAULT_CONFIG_FILE="${DEFAULT_CONFIG_FILE:-/generator/default_config.yaml}" # Default config baked into image
+# ACTIVE_CONFIG_FILE (the merged config main.py reads) defaults to the job's scratch dir, see below.
+
+WEBAPP_ASSETS_DIR="${WEBAPP_ASSETS_DIR:-/webapp}"
+OUTPUT_DIR="${OUTPUT_DIR:-/output}"
+# Stages of the run with their input fingerprints and outputs, read back by -r (see generator/utils/journal.py).
+BUILD_JOURNAL="${BUILD_JOURNAL:-${OUTPUT_DIR}/build-journal.json}"
+BUILD_CACHE_DIR="${BUILD_CACHE_DIR:-/cache}" # Mount a volume here to keep Go caches between runs
+GO_CACHE_KEEP_KEYS=3                          # Go cache generations (go.mod/go.sum hashes) kept on the volume
+# Generator outputs (icon sets) and final artifacts, keyed by content fingerprints (see generator/utils/remote_cache.py).
+# Set APPIZER_REMOTE_CACHE_URL (e.g. a cache_server.py instance) to share them between build nodes.
+export APPIZER_CACHE_DIR="${APPIZER_CACHE_DIR:-${BUILD_CACHE_DIR}/artifacts}"
 
 # Define the root directory for each platform's project within the container
-CONTAINER_MULTI_PLATFORM_ROOT="/app" # This is the /app where template-app was copied
+CONTAINER_MULTI_PLATFORM_ROOT="${CONTAINER_MULTI_PLATFORM_ROOT:-/app}" # Platform projects are materialized here from the template store (only those being built)
 
 ANDROID_PROJECT_ROOT="${CONTAINER_MULTI_PLATFORM_ROOT}/android" # NEW
 ANDROID_APP_SRC_MAIN_DIR="${ANDROID_PROJECT_ROOT}/app/src/main" # NEW (derived)
@@ -22,13 +31,17 @@ LINUX_PROJECT_ROOT="${CONTAINER_MULTI_PLATFORM_ROOT}/linux"     # Placeholder (c
 WINDOWS_PROJECT_ROOT="${CONTAINER_MULTI_PLATFORM_ROOT}/windows" # Placeholder (changed to windows_project)
 MACOS_PROJECT_ROOT="${CONTAINER_MULTI_PLATFORM_ROOT}/macos"     # Placeholder (changed to macos_project)
 
-GENERATOR_DIR="/generator"
+GENERATOR_DIR="${GENERATOR_DIR:-/generator}"
 
 # --- Parse Command-Line Arguments ---
 PLATFORM=""
 SKIP_ERRORS="false" # Default to false: script exits on first build failure
+RESKIN_BASE_APK="" # -b: re-skin this prebuilt runtime-config APK instead of running Gradle
+OFFLINE_BUILD="false" # -o: resolve Gradle dependencies only from the pre-seeded offline Maven repo
+GENERATE_ONLY="false" # -g: stop after the Python generator (preview jobs from the build server)
+RESUME="false" # -r: skip stages the build journal records as done with unchanged inputs (retry after a failure)
 
-while getopts ":p:s" opt; do # Added 's' for -s (skip errors)
+while getopts ":p:sb:ogr" opt; do # Added 's' for -s (skip errors)
     case $opt in
     p)
         PLATFORM="$OPTARG"
@@ -37,6 +50,18 @@ while getopts ":p:s" opt; do # Added 's' for -s (skip errors)
         SKIP_ERRORS="true"
         echo "⚠️  Skip errors mode enabled. Build failures for individual platforms will be logged, but the process will continue."
         ;;
+    b)
+        RESKIN_BASE_APK="$OPTARG"
+        ;;
+    o)
+        OFFLINE_BUILD="true"
+        ;;
+    g)
+        GENERATE_ONLY="true"
+        ;;
+    r)
+        RESUME="true"
+        ;;
     \?)
         echo "❌ Error: Invalid option: -$OPTARG" >&2
         exit 1
@@ -52,7 +77,7 @@ shift $((OPTIND - 1))
 # --- Validate PLATFORM Argument ---
 if [ -z "$PLATFORM" ]; then
     echo "❌ Error: -p <platform> argument is required."
-    echo "Usage: docker run <your-image-name> -p <all|android|ios|linux|windows|macos> [-s]" # Updated usage
+    echo "Usage: docker run <your-image-name> -p <all|android|ios|linux|windows|macos> [-s] [-o] [-g] [-r] [-b <base_apk>]" # Updated usage
     exit 1
 fi
 
@@ -66,6 +91,20 @@ case "$PLATFORM" in
     ;;
 esac
 
+# --- Job scratch space ---
+# Downloads, staged icon sets and the merged config of this run live in a dir of their own (on tmpfs when
+# memory allows, see generator/utils/scratch.py), so concurrent runs never share a path. build_worker.py
+# passes one in and removes it itself; otherwise it is created here and removed on exit.
+if [ -z "$APPIZER_SCRATCH_DIR" ]; then
+    APPIZER_SCRATCH_DIR=$(python3 "${GENERATOR_DIR}/scratch_space.py" create $$ entrypoint) || {
+        echo "❌ Failed to create a scratch dir."
+        exit 1
+    }
+    export APPIZER_SCRATCH_DIR
+    trap 'rm -rf "$APPIZER_SCRATCH_DIR"' EXIT
+fi
+export ACTIVE_CONFIG_FILE="${ACTIVE_CONFIG_FILE:-${APPIZER_SCRATCH_DIR}/config.yaml}" # The config file that main.py will read
+
 # --- Configure the ACTIVE config.yaml for the generator ---
 echo "⚙️  Preparing active configuration file..."
 # This step is critical and *must* succeed, so we use '|| exit 1'
@@ -98,7 +137,7 @@ try:
 
     final_conf = merge_configs(default_conf, user_conf)
     with open(active_config_file, 'w', encoding='utf-8') as f:
-        yaml.dump(final_conf, f, default_flow_style=False)
+        yaml.dump(final_conf, f, default_flow_style=False, sort_keys=True)
     print('Merged config written to ' + active_config_file)
 except Exception as e:
     print(f'Error during config merge: {e}', file=sys.stderr)
@@ -108,60 +147,99 @@ except Exception as e:
     exit 1
 }
 
-# --- Conditional Static Asset Copy (if any platform uses local assets) ---
-# This still uses the top-level `url` to decide if /webapp should be copied.
-# If different platforms use different asset sources, this logic will need to be refined.
-APP_URL_FROM_CONFIG=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('url'))" <"$ACTIVE_CONFIG_FILE")
-APP_NAME=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('app_name'))" <"$ACTIVE_CONFIG_FILE")
-
-# This is placed here as a general asset copy step if *any* platform needs it.
-# The destination here is primarily Android-centric for now.
-# Future: This needs to be smarter based on platform, or assets are copied by platform modifiers.
-if [[ "$APP_URL_FROM_CONFIG" == file:///android_asset/* ]] && [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]]; then
-    echo "📂 App URL indicates local assets. Copying static files from ${WEBAPP_ASSETS_DIR} to ${ANDROID_APP_SRC_MAIN_DIR}/assets..."
-    mkdir -p "${ANDROID_APP_SRC_MAIN_DIR}/assets" || {
-        echo "❌ Failed to create Android assets directory."
-        exit 1
-    }
-    if [ -d "$WEBAPP_ASSETS_DIR" ] && [ "$(ls -A $WEBAPP_ASSETS_DIR)" ]; then
-        cp -r "${WEBAPP_ASSETS_DIR}/." "${ANDROID_APP_SRC_MAIN_DIR}/assets" || {
-            echo "❌ Failed to copy Android static assets."
-            exit 1
-        }
-        echo "✅ Static assets copied for local WebView use (to Android assets)."
-    else
-        echo "⚠️ No static assets found in ${WEBAPP_ASSETS_DIR}. WebView might show a blank page."
-    fi
+# --- Build journal ---
+# Without -r a run starts a fresh journal; with -r, stages whose inputs and outputs are unchanged are skipped.
+journal() {
+    python3 "${GENERATOR_DIR}/build_journal.py" "$1" "$BUILD_JOURNAL" "${@:2}"
+}
+if [ "$RESUME" = "true" ]; then
+    echo "🔁 Resume mode: skipping stages recorded as done in $BUILD_JOURNAL whose inputs are unchanged."
 else
-    echo "🌐 App URL is external or not an Android build. Skipping general static asset copy to Android assets."
+    journal reset || echo "⚠️  Could not reset the build journal at $BUILD_JOURNAL; -r will not be able to resume this run."
 fi
 
+# --- Static Asset Sync ---
+# Local web assets (url: file:///android_asset/...) are synced into each platform project by
+# the Python modifiers' "assets" stage, so watch mode and full runs share the same code path.
+APP_NAME=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('app_name'))" <"$ACTIVE_CONFIG_FILE")
+
 # Buildtypes specifications
 # NEW: Read build_type from the merged config.yaml
 ANDROID_BUILD_TYPE=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('build_settings', {}).get('default_build_type', 'debug'))" <"$ACTIVE_CONFIG_FILE")
 echo "✅ Build type read from config.yaml: $ANDROID_BUILD_TYPE"
 
-# --- Run Python Generator (Pass platform and project roots) ---
-echo "🔧 Running Python generator to configure app for platform(s): $PLATFORM..."
-# This step is critical and *must* succeed, so we use '|| exit 1'
-python3 "${GENERATOR_DIR}/main.py" \
-    "${ANDROID_PROJECT_ROOT}" \
-    "${IOS_PROJECT_ROOT}" \
-    "${LINUX_PROJECT_ROOT}" \
-    "${WINDOWS_PROJECT_ROOT}" \
-    "${MACOS_PROJECT_ROOT}" \
-    "${WEBAPP_ASSETS_DIR}" \
-    "${CONTAINER_MULTI_PLATFORM_ROOT}" \
-    "$PLATFORM" ||
-    {
-        echo "❌ Python generator failed. Check Python logs above."
+# --- Offline dependency resolution ---
+if [ "$OFFLINE_BUILD" = "true" ]; then
+    # The generator writes an init script pointing Gradle at this repo (see seed_maven_repo.py to create it)
+    export APPIZER_OFFLINE_MAVEN_REPO="${APPIZER_OFFLINE_MAVEN_REPO:-/opt/maven-offline}"
+    if [ ! -d "$APPIZER_OFFLINE_MAVEN_REPO" ]; then
+        echo "❌ Offline Maven repo not found at $APPIZER_OFFLINE_MAVEN_REPO. Build the image with SEED_OFFLINE_MAVEN_REPO=true or mount one."
         exit 1
-    }
+    fi
+    echo "📦 Offline mode: Gradle resolves dependencies from $APPIZER_OFFLINE_MAVEN_REPO only."
+fi
+
+# --- Run Python Generator (Pass platform and project roots) ---
+# Keyed by the merged config, the web assets, the templates and the generator itself; its outputs are the project dirs.
+GENERATE_KEY=$(python3 "${GENERATOR_DIR}/build_journal.py" key "generate-${PLATFORM}" "$ACTIVE_CONFIG_FILE" "$WEBAPP_ASSETS_DIR" \
+    "${APPIZER_TEMPLATE_STORE:-/opt/appizer/templates}/index.json" "workspace=${CONTAINER_MULTI_PLATFORM_ROOT}")
+case "$PLATFORM" in
+"all") GENERATED_ROOTS=("$ANDROID_PROJECT_ROOT" "$WINDOWS_PROJECT_ROOT") ;;
+"android") GENERATED_ROOTS=("$ANDROID_PROJECT_ROOT") ;;
+"windows") GENERATED_ROOTS=("$WINDOWS_PROJECT_ROOT") ;;
+*) GENERATED_ROOTS=() ;; # No modifier yet
+esac
+
+if [ "$RESUME" = "true" ] && journal check generate "$GENERATE_KEY"; then
+    echo "⏭️  Python generator finished in an earlier run for the same inputs; reusing the projects in ${CONTAINER_MULTI_PLATFORM_ROOT}."
+else
+    echo "🔧 Running Python generator to configure app for platform(s): $PLATFORM..."
+    # This step is critical and *must* succeed, so we use '|| exit 1'
+    python3 "${GENERATOR_DIR}/main.py" \
+        "${ANDROID_PROJECT_ROOT}" \
+        "${IOS_PROJECT_ROOT}" \
+        "${LINUX_PROJECT_ROOT}" \
+        "${WINDOWS_PROJECT_ROOT}" \
+        "${MACOS_PROJECT_ROOT}" \
+        "${WEBAPP_ASSETS_DIR}" \
+        "${CONTAINER_MULTI_PLATFORM_ROOT}" \
+        "$PLATFORM" ||
+        {
+            journal failed generate "$GENERATE_KEY"
+            echo "❌ Python generator failed. Check Python logs above."
+            exit 1
+        }
+    journal done generate "$GENERATE_KEY" "${GENERATED_ROOTS[@]}"
+fi
+
+if [ "$GENERATE_ONLY" = "true" ]; then
+    echo "✅ Generate-only mode: platform projects are rendered in ${CONTAINER_MULTI_PLATFORM_ROOT}; skipping native builds."
+    exit 0
+fi
 
 # --- Conditional Build Steps ---
 
+# Android Re-skin (no Gradle): patch config, web assets and images into a prebuilt runtime-config APK
+if [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]] && [ -n "$RESKIN_BASE_APK" ]; then
+    echo "🎨 Re-skinning $RESKIN_BASE_APK instead of running Gradle..."
+    mkdir -p "$OUTPUT_DIR" || {
+        echo "❌ Failed to create output directory."
+        exit 1
+    }
+    RESKIN_OUTPUT_APK="$OUTPUT_DIR/$(basename "$RESKIN_BASE_APK" .apk)-reskinned.apk"
+    if python3 "${GENERATOR_DIR}/reskin.py" "$RESKIN_BASE_APK" "$RESKIN_OUTPUT_APK" "$ACTIVE_CONFIG_FILE" "$WEBAPP_ASSETS_DIR"; then
+        python3 "${GENERATOR_DIR}/export_artifacts.py" "$ACTIVE_CONFIG_FILE" android "$OUTPUT_DIR" "$RESKIN_OUTPUT_APK" ||
+            echo "⚠️  Could not record the re-skinned APK in $OUTPUT_DIR/artifacts.json."
+        echo "🎉 Done! Re-skinned Android APK available at $RESKIN_OUTPUT_APK"
+    elif [ "$SKIP_ERRORS" = "true" ]; then
+        echo "⚠️  Skipping Android re-skin errors as requested."
+    else
+        echo "🛑 Exiting due to Android re-skin failure. Run with '-s' to skip errors."
+        exit 1
+    fi
+
 # Android Build
-if [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]]; then
+elif [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]]; then
     # Read Android-specific build type
     ANDROID_BUILD_TYPE=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('platform_config', {}).get('android', {}).get('build', {}).get('build_type', 'debug'))" <"$ACTIVE_CONFIG_FILE")
     echo "📦 Building Android APK (Type: $ANDROID_BUILD_TYPE)..."
@@ -186,18 +264,46 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]]; then
     fi
     echo "✅ gradlew found and is executable."
 
-    echo "🚀 Starting actual Gradle build (Build Type: $ANDROID_BUILD_TYPE)..."
-    ./gradlew assemble${ANDROID_BUILD_TYPE^} # Uses Android-specific build type
-    BUILD_STATUS=$?
+    # The rendered workspace (plus the keystore it signs with) fully determines the APKs, so an
+    # identical build from this or another node is restored instead of running Gradle again.
+    ANDROID_KEYSTORE_FILE=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('platform_config', {}).get('android', {}).get('signing', {}).get('keystore_file_in_container', ''))" <"$ACTIVE_CONFIG_FILE")
+    ANDROID_ARTIFACT_KEY=$(python3 "${GENERATOR_DIR}/artifact_cache.py" key "$ACTIVE_CONFIG_FILE" "android-apk-${ANDROID_BUILD_TYPE}" \
+        "${ANDROID_PROJECT_ROOT}" ${ANDROID_KEYSTORE_FILE:+"$ANDROID_KEYSTORE_FILE"})
+    ANDROID_ARTIFACT_STAGING="${ANDROID_PROJECT_ROOT}/build/appizer-cached-apks"
+    rm -rf "$ANDROID_ARTIFACT_STAGING"
+
+    # With -r, APKs an earlier run already built and exported from this exact workspace are kept as they are.
+    ANDROID_RESUMED="false"
+    if [ "$RESUME" = "true" ] && [ -n "$ANDROID_ARTIFACT_KEY" ] && journal check android-build "$ANDROID_ARTIFACT_KEY"; then
+        echo "⏭️  Android APKs for this exact workspace were built and exported by an earlier run; skipping Gradle."
+        ANDROID_RESUMED="true"
+        BUILD_STATUS=0
+    elif [ -n "$ANDROID_ARTIFACT_KEY" ] && python3 "${GENERATOR_DIR}/artifact_cache.py" get "$ACTIVE_CONFIG_FILE" "$ANDROID_ARTIFACT_KEY" "$ANDROID_ARTIFACT_STAGING"; then
+        echo "♻️  Reusing cached Android APKs for this exact workspace (key ${ANDROID_ARTIFACT_KEY:0:12}); skipping Gradle."
+        ANDROID_APK_SEARCH_DIR="$ANDROID_ARTIFACT_STAGING"
+        BUILD_STATUS=0
+    else
+        echo "🚀 Starting actual Gradle build (Build Type: $ANDROID_BUILD_TYPE)..."
+        GRADLE_ARGS=()
+        if [ "$OFFLINE_BUILD" = "true" ]; then
+            GRADLE_ARGS+=(--offline --init-script appizer-offline.init.gradle)
+        fi
+        ./gradlew "${GRADLE_ARGS[@]}" assemble${ANDROID_BUILD_TYPE^} # Uses Android-specific build type
+        BUILD_STATUS=$?
+        ANDROID_APK_SEARCH_DIR="${ANDROID_PROJECT_ROOT}/app/build/outputs/apk"
+    fi
 
     if [ $BUILD_STATUS -ne 0 ]; then
         echo "❌ Gradle build FAILED for Android."
+        [ -n "$ANDROID_ARTIFACT_KEY" ] && journal failed android-build "$ANDROID_ARTIFACT_KEY"
         if [ "$SKIP_ERRORS" = "true" ]; then
             echo "⚠️  Skipping Android build errors as requested. Continuing with other platforms if applicable."
         else
             echo "🛑 Exiting due to Android build failure. Run with '-s' to skip errors."
             exit 1
         fi
+    elif [ "$ANDROID_RESUMED" = "true" ]; then
+        echo "🎉 Done! Android APKs from the earlier run are still available in $OUTPUT_DIR"
     else
         echo "✅ Android Gradle build successful."
         echo "✅ Exporting Android APK..."
@@ -206,18 +312,33 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "android" ]]; then
             exit 1
         }
 
-        APK_PATH=$(find "${ANDROID_PROJECT_ROOT}/app/build/outputs/apk/$ANDROID_BUILD_TYPE" -name "*.apk" -print -quit)
+        # Without flavors the APK is in apk/<buildType>/; with product flavors there is one per apk/<flavor>/<buildType>/.
+        if [ "$ANDROID_APK_SEARCH_DIR" = "$ANDROID_ARTIFACT_STAGING" ]; then
+            mapfile -t APK_PATHS < <(find "$ANDROID_APK_SEARCH_DIR" -name "*.apk" | sort)
+        else
+            mapfile -t APK_PATHS < <(find "$ANDROID_APK_SEARCH_DIR" -path "*/$ANDROID_BUILD_TYPE/*.apk" | sort)
+            if [ ${#APK_PATHS[@]} -gt 0 ] && [ -n "$ANDROID_ARTIFACT_KEY" ]; then
+                python3 "${GENERATOR_DIR}/artifact_cache.py" put "$ACTIVE_CONFIG_FILE" "$ANDROID_ARTIFACT_KEY" "${APK_PATHS[@]}" ||
+                    echo "⚠️  Could not store the Android APKs in the build cache."
+            fi
+        fi
 
-        if [ -f "$APK_PATH" ]; then
-            APK_FILENAME=$(basename "$APK_PATH")
-            cp -fv "$APK_PATH" "$OUTPUT_DIR/$APK_FILENAME" || {
+        if [ ${#APK_PATHS[@]} -gt 0 ]; then
+            # Copies the APKs and records their size, SHA-256 and build metadata in $OUTPUT_DIR/artifacts.json.
+            python3 "${GENERATOR_DIR}/export_artifacts.py" "$ACTIVE_CONFIG_FILE" android "$OUTPUT_DIR" "${APK_PATHS[@]}" || {
                 echo "❌ Failed to copy Android APK to output."
                 exit 1
             }
-            echo "🎉 Done! Android APK available at /output/$APK_FILENAME"
+            ANDROID_EXPORTED_APKS=()
+            for APK_PATH in "${APK_PATHS[@]}"; do
+                ANDROID_EXPORTED_APKS+=("$OUTPUT_DIR/$(basename "$APK_PATH")")
+                echo "🎉 Done! Android APK available at $OUTPUT_DIR/$(basename "$APK_PATH")"
+            done
+            [ -n "$ANDROID_ARTIFACT_KEY" ] && journal done android-build "$ANDROID_ARTIFACT_KEY" "${ANDROID_EXPORTED_APKS[@]}"
         else
             echo "❌ Failed to find Android APK. Check Gradle build logs for errors."
-            ls -lR "${ANDROID_PROJECT_ROOT}/app/build/outputs/apk/$ANDROID_BUILD_TYPE"
+            [ -n "$ANDROID_ARTIFACT_KEY" ] && journal failed android-build "$ANDROID_ARTIFACT_KEY"
+            ls -lR "$ANDROID_APK_SEARCH_DIR"
             if [ "$SKIP_ERRORS" = "true" ]; then
                 echo "⚠️  Skipping artifact export error for Android."
             else
@@ -249,11 +370,17 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "linux" ]]; then
 fi
 
 # Windows Desktop Build
+# 'go mod tidy' edits the rendered project in place, so the stage is keyed by what was rendered (the generate key).
 if [[ "$PLATFORM" == "all" || "$PLATFORM" == "windows" ]]; then
+    WINDOWS_JOURNAL_KEY=$(python3 "${GENERATOR_DIR}/build_journal.py" key windows-wails "$GENERATE_KEY")
+fi
+if [ "$RESUME" = "true" ] && [ -n "$WINDOWS_JOURNAL_KEY" ] && journal check windows-build "$WINDOWS_JOURNAL_KEY"; then
+    echo "⏭️  The Wails app for these inputs was built and exported by an earlier run; skipping the Windows build."
+elif [[ "$PLATFORM" == "all" || "$PLATFORM" == "windows" ]]; then
     WAILS_BUILD_TYPE=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('platform_config', {}).get('wails', {}).get('build', {}).get('build_type', 'debug'))" <"$ACTIVE_CONFIG_FILE")
 
     echo "--- Wails Build (Type: $WAILS_BUILD_TYPE, Target OS: $WAILS_TARGET_OS) ---"
-    WAILS_PROJECT_ROOT=$WINDOWS_PROJECT_ROOT/go_app
+    WAILS_PROJECT_ROOT=$WINDOWS_PROJECT_ROOT/wails_app
     if [ ! -d "$WAILS_PROJECT_ROOT" ]; then
         echo "❌ Wails project directory not found: ${WAILS_PROJECT_ROOT}."
         echo "Please ensure 'template-app/wails_project' exists on your host and contains a Wails project."
@@ -271,19 +398,56 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "windows" ]]; then
     unset GOOS
     unset GOARCH
 
+    # --- Persistent Go caches, keyed by the go.mod/go.sum the build starts from ---
+    # A new key is seeded with hardlinks from the newest existing one, so a dependency bump only
+    # downloads and compiles what actually changed. Go's cache entries are immutable, so sharing is safe.
+    GO_INPUT_HASH=$(cat go.mod go.sum 2>/dev/null | sha256sum | cut -c1-16)
+    GO_CACHE_ROOT="${BUILD_CACHE_DIR}/go"
+    GO_CACHE_KEY_DIR="${GO_CACHE_ROOT}/${GO_INPUT_HASH}"
+    if [ -d "$GO_CACHE_KEY_DIR" ]; then
+        GO_CACHE_STATE="hit"
+    else
+        GO_CACHE_PREVIOUS_KEY_DIR=$(ls -1dt "${GO_CACHE_ROOT}"/*/ 2>/dev/null | head -n 1)
+        if [ -n "$GO_CACHE_PREVIOUS_KEY_DIR" ] && cp -al "${GO_CACHE_PREVIOUS_KEY_DIR%/}" "$GO_CACHE_KEY_DIR" 2>/dev/null; then
+            GO_CACHE_STATE="seeded from $(basename "$GO_CACHE_PREVIOUS_KEY_DIR")"
+            rm -rf "${GO_CACHE_KEY_DIR}/tidy" # Tidy results belong to the previous go.mod/go.sum only
+        else
+            GO_CACHE_STATE="cold"
+        fi
+        mkdir -p "$GO_CACHE_KEY_DIR"
+    fi
+    touch "$GO_CACHE_KEY_DIR" # Marks it as most recently used for seeding and pruning
+    export GOMODCACHE="${GO_CACHE_KEY_DIR}/mod"
+    export GOCACHE="${GO_CACHE_KEY_DIR}/build"
+    mkdir -p "$GOMODCACHE" "$GOCACHE"
+    GO_MODULES_BEFORE=$(find "$GOMODCACHE/cache/download" -name "*.zip" 2>/dev/null | wc -l)
+    GO_BUILD_ENTRIES_BEFORE=$(find "$GOCACHE" -type f -name "*-d" 2>/dev/null | wc -l)
+    echo "📦 Go cache: key ${GO_INPUT_HASH} (${GO_CACHE_STATE}), ${GO_MODULES_BEFORE} module(s), ${GO_BUILD_ENTRIES_BEFORE} build entr(ies)."
+
     # Run 'go mod tidy' explicitly within the Wails project context
     # This ensures dependencies are correct before Wails tries to build its internal tools.
-    go mod tidy
-    GO_MOD_STATUS=$?
-    if [ $GO_MOD_STATUS -ne 0 ]; then
-        echo "❌ 'go mod tidy' FAILED in Wails project. Please check Go module configuration."
-        if [ "$SKIP_ERRORS" = "true" ]; then
-            echo "⚠️  Skipping Wails build errors."
+    # It is skipped when the same go.mod/go.sum were already tidied successfully: the result is restored instead.
+    if [ -f "${GO_CACHE_KEY_DIR}/tidy/ok" ]; then
+        cp -f "${GO_CACHE_KEY_DIR}/tidy/go.mod" go.mod
+        [ -f "${GO_CACHE_KEY_DIR}/tidy/go.sum" ] && cp -f "${GO_CACHE_KEY_DIR}/tidy/go.sum" go.sum
+        echo "✅ go.mod/go.sum unchanged since the last successful 'go mod tidy'; skipped it."
+    else
+        go mod tidy
+        GO_MOD_STATUS=$?
+        if [ $GO_MOD_STATUS -ne 0 ]; then
+            echo "❌ 'go mod tidy' FAILED in Wails project. Please check Go module configuration."
+            if [ "$SKIP_ERRORS" = "true" ]; then
+                echo "⚠️  Skipping Wails build errors."
+            else
+                exit 1
+            fi
         else
-            exit 1
+            echo "✅ 'go mod tidy' successful in Wails project."
+            mkdir -p "${GO_CACHE_KEY_DIR}/tidy"
+            cp -f go.mod "${GO_CACHE_KEY_DIR}/tidy/go.mod"
+            [ -f go.sum ] && cp -f go.sum "${GO_CACHE_KEY_DIR}/tidy/go.sum"
+            touch "${GO_CACHE_KEY_DIR}/tidy/ok"
         fi
-    else
-        echo "✅ 'go mod tidy' successful in Wails project."
     fi
 
     WAILS_BUILD_CMD="wails build -o ${APP_NAME}.exe"
@@ -297,8 +461,21 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "windows" ]]; then
     GOOS=windows GOARCH=amd64 ${WAILS_BUILD_CMD} -skipbindings
     BUILD_STATUS=$?
 
+    GO_MODULES_AFTER=$(find "$GOMODCACHE/cache/download" -name "*.zip" 2>/dev/null | wc -l)
+    GO_BUILD_ENTRIES_AFTER=$(find "$GOCACHE" -type f -name "*-d" 2>/dev/null | wc -l)
+    GO_BUILD_NEW=$((GO_BUILD_ENTRIES_AFTER - GO_BUILD_ENTRIES_BEFORE))
+    echo "📊 Go cache stats: $((GO_MODULES_AFTER - GO_MODULES_BEFORE)) module(s) downloaded, ${GO_MODULES_BEFORE} reused;" \
+        "${GO_BUILD_NEW} new build cache entr(ies), ${GO_BUILD_ENTRIES_BEFORE} available from earlier runs."
+
+    # Keep only the most recently used cache generations (module cache dirs are read-only, hence chmod)
+    ls -1dt "${GO_CACHE_ROOT}"/*/ 2>/dev/null | tail -n +$((GO_CACHE_KEEP_KEYS + 1)) | while read -r STALE_KEY_DIR; do
+        chmod -R u+w "$STALE_KEY_DIR" && rm -rf "$STALE_KEY_DIR"
+        echo "🗑️  Pruned old Go cache generation $(basename "$STALE_KEY_DIR")."
+    done
+
     if [ $BUILD_STATUS -ne 0 ]; then
         echo "❌ Wails build FAILED."
+        [ -n "$WINDOWS_JOURNAL_KEY" ] && journal failed windows-build "$WINDOWS_JOURNAL_KEY"
         if [ "$SKIP_ERRORS" = "true" ]; then
             echo "⚠️  Skipping Wails build errors as requested."
         else
@@ -315,11 +492,12 @@ if [[ "$PLATFORM" == "all" || "$PLATFORM" == "windows" ]]; then
         APP_NAME_FROM_CONFIG=$(python3 -c "import sys, yaml; config=yaml.safe_load(sys.stdin); print(config.get('app_name', 'default-app'))" <"$ACTIVE_CONFIG_FILE")
 
         ARTIFACT_FILENAME=$(basename "$WAILS_ARTIFACT_PATH")
-        cp -rfv "$WAILS_PROJECT_ROOT/build/bin" "$OUTPUT_DIR" || {
+        python3 "${GENERATOR_DIR}/export_artifacts.py" "$ACTIVE_CONFIG_FILE" windows "$OUTPUT_DIR" "$WAILS_PROJECT_ROOT/build/bin" || {
             echo "❌ Failed to copy Wails App artifact to output."
             exit 1
         }
-        echo "🎉 Done! Wails App artifact available at /output"
+        echo "🎉 Done! Wails App artifact available at $OUTPUT_DIR"
+        [ -n "$WINDOWS_JOURNAL_KEY" ] && journal done windows-build "$WINDOWS_JOURNAL_KEY" "$OUTPUT_DIR/bin"
 
         # if [ -f "$WAILS_ARTIFACT_PATH" ]; then
         # else
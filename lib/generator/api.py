@@ -0,0 +1,95 @@
+# generator/api.py
+import os
+import time
+import shutil
+import traceback
+from contextlib import nullcontext
+
+from modifiers.loader import PLATFORM_MODIFIERS, load_modifier
+from utils.config_loader import resolve_platform_config
+from utils.placeholder_scan import check_rendered_workspace
+from utils.template_store import materialize_platform
+from utils.scratch import job_scratch
+from utils.reproducible import source_date_epoch, normalize_tree_mtimes
+from utils.metrics import GENERATOR_PLATFORM_SECONDS, GENERATOR_STAGE_SECONDS
+
+def resolve_platforms(platforms):
+    """Normalizes "all", a single platform name, or a list of names into an ordered list."""
+    if platforms == "all" or platforms is None:
+        return list(PLATFORM_MODIFIERS)
+    if isinstance(platforms, str):
+        platforms = [platforms]
+    unknown = [p for p in platforms if p not in PLATFORM_MODIFIERS]
+    if unknown:
+        raise ValueError(f"Unknown platform(s): {', '.join(unknown)}. Valid: all, {', '.join(PLATFORM_MODIFIERS)}.")
+    return [p for p in PLATFORM_MODIFIERS if p in platforms]
+
+def generate(config, workspace, platforms="all", webapp_assets_dir="", template_root=None, stages=None, project_roots=None,
+             scratch=None):
+    """
+    Runs the platform modifiers in-process and returns a structured result instead of exiting.
+
+    Args:
+        config (dict): The full merged config (what entrypoint.sh writes to the active config file).
+        workspace (str): Root holding one project dir per platform (e.g., '/app' with '/app/android').
+        platforms (str|list): "all", a platform name, or a list of platform names.
+        webapp_assets_dir (str): The path where user's static assets are mounted.
+        template_root (str, optional): If set, platform dirs missing from `workspace` are copied from here first;
+            otherwise they are materialized from the template store (see utils/template_store.py).
+        stages (dict, optional): {platform: [stage, ...]} to re-apply only some modifier stages.
+        project_roots (dict, optional): {platform: path} overrides for the default '<workspace>/<platform>'.
+        scratch (ScratchSpace, optional): Scratch space shared by the modifiers (see utils/scratch.py). Defaults to
+            the job's $APPIZER_SCRATCH_DIR, or a dir of its own that is removed when this returns.
+
+    Returns:
+        dict: {"success": bool, "duration_ms": float,
+               "platforms": {name: {"status": "ok"|"skipped"|"failed", "duration_ms": float, "error": str|None}}}
+    """
+    started = time.perf_counter()
+    result = {"success": True, "duration_ms": 0.0, "platforms": {}}
+
+    with (job_scratch("generate") if scratch is None else nullcontext(scratch)) as scratch:
+        for platform_name in resolve_platforms(platforms):
+            platform_started = time.perf_counter()
+            platform_result = {"status": "ok", "duration_ms": 0.0, "error": None}
+            result["platforms"][platform_name] = platform_result
+            try:
+                inject = load_modifier(platform_name)
+                if inject is None:
+                    print(f"--- [api] No {platform_name} modifier implemented yet (Placeholder). Skipping. ---")
+                    platform_result["status"] = "skipped"
+                    continue
+
+                project_root = (project_roots or {}).get(platform_name) or os.path.join(workspace, platform_name)
+                if template_root and not os.path.isdir(project_root):
+                    print(f"  [api] Materializing {platform_name} template into {project_root}...")
+                    shutil.copytree(os.path.join(template_root, platform_name), project_root, symlinks=True)
+                elif not os.path.isdir(project_root):
+                    # Only the platforms being generated are laid out, and only once per workspace
+                    with GENERATOR_STAGE_SECONDS.labels(platform=platform_name, stage="materialize").time():
+                        materialize_platform(platform_name, project_root)
+
+                print(f"--- [api] Invoking {platform_name} file modification ---")
+                kwargs = {"stages": stages[platform_name]} if stages and platform_name in stages else {}
+                inject(resolve_platform_config(config, platform_name), project_root, workspace, webapp_assets_dir,
+                       scratch=scratch, **kwargs)
+                if "render" in kwargs.get("stages", ("render",)):
+                    # Fail here, not minutes later in Gradle or go build
+                    with GENERATOR_STAGE_SECONDS.labels(platform=platform_name, stage="placeholder_check").time():
+                        check_rendered_workspace(project_root, platform_name)
+                if source_date_epoch() is not None:
+                    touched = normalize_tree_mtimes(project_root)
+                    print(f"  [api] Reproducible mode: set {touched} path(s) in {project_root} to SOURCE_DATE_EPOCH={source_date_epoch()}.")
+            except Exception as e:
+                print(f"❌ [api] {platform_name} modification failed: {e}")
+                traceback.print_exc()
+                platform_result["status"] = "failed"
+                platform_result["error"] = str(e)
+                result["success"] = False
+            finally:
+                platform_result["duration_ms"] = round((time.perf_counter() - platform_started) * 1000, 1)
+                GENERATOR_PLATFORM_SECONDS.labels(platform=platform_name, status=platform_result["status"]).observe(
+                    time.perf_counter() - platform_started)
+
+    result["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
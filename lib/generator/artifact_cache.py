@@ -0,0 +1,56 @@
+# generator/artifact_cache.py
+import os
+import sys
+
+from utils.config_loader import load_yaml_file
+from utils.remote_cache import fingerprint, create_build_cache
+from utils.metrics import write_textfile_from_env
+
+# Toolchain versions baked into the image; an artifact built with another toolchain is never reused.
+TOOLCHAIN_ENV_VARS = ("JAVA_HOME", "ANDROID_COMPILE_SDK_VERSION", "ANDROID_BUILD_TOOLS_VERSION", "GO_VERSION")
+
+def artifact_key(kind, paths):
+    """
+    Cache key for a final artifact: its kind (e.g., 'android-apk-release'), the content of the
+    rendered workspace and any extra inputs (e.g., the keystore), and the toolchain versions.
+    """
+    toolchain = {name: os.environ.get(name, "") for name in TOOLCHAIN_ENV_VARS}
+    return fingerprint("artifact", kind, toolchain, *(("path", os.path.abspath(path)) for path in paths))
+
+def fetch_artifacts(build_cache, key, dest_dir):
+    """Restores the artifacts stored under `key` into `dest_dir`. Returns True on a hit."""
+    return build_cache is not None and build_cache.get_dir(key, dest_dir)
+
+def store_artifacts(build_cache, key, files):
+    """Stores `files` under `key` by file name, for fetch_artifacts on this or any other node."""
+    if build_cache is not None:
+        build_cache.put_files(key, {os.path.basename(path): path for path in files})
+
+
+if __name__ == "__main__":
+    # Usage (entrypoint.sh wraps the native builds with these):
+    #   python3 artifact_cache.py key <config_file> <kind> <path>...      -> prints the key
+    #   python3 artifact_cache.py get <config_file> <key> <dest_dir>      -> exit 0 on a hit, 2 on a miss
+    #   python3 artifact_cache.py put <config_file> <key> <file>...
+    if len(sys.argv) < 5 or sys.argv[1] not in ("key", "get", "put"):
+        print("Usage: python3 artifact_cache.py key <config_file> <kind> <path>... | "
+              "get <config_file> <key> <dest_dir> | put <config_file> <key> <file>...")
+        sys.exit(1)
+
+    command, config_file = sys.argv[1], sys.argv[2]
+    if command == "key":
+        print(artifact_key(sys.argv[3], sys.argv[4:]))
+        sys.exit(0)
+
+    build_cache = create_build_cache(load_yaml_file(config_file, "active config file"))
+    if build_cache is None:
+        print("  [cache] ℹ️ No build cache configured.")
+        sys.exit(2 if command == "get" else 0)
+    if command == "get":
+        hit = fetch_artifacts(build_cache, sys.argv[3], sys.argv[4])
+        build_cache.report()
+        write_textfile_from_env()
+        sys.exit(0 if hit else 2)
+    store_artifacts(build_cache, sys.argv[3], sys.argv[4:])
+    build_cache.report()
+    write_textfile_from_env()
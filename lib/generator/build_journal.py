@@ -0,0 +1,39 @@
+# generator/build_journal.py
+import sys
+
+from utils.journal import BuildJournal, stage_key, DONE, FAILED
+
+
+if __name__ == "__main__":
+    # Usage (entrypoint.sh wraps its stages with these, see utils/journal.py):
+    #   python3 build_journal.py key <kind> <input>...                -> prints the stage's input key
+    #   python3 build_journal.py check <journal> <stage> <key>        -> exit 0 if the stage can be skipped, 2 if not
+    #   python3 build_journal.py done <journal> <stage> <key> [<output>...]
+    #   python3 build_journal.py failed <journal> <stage> <key>
+    #   python3 build_journal.py reset <journal>
+    commands = {"key": 3, "check": 5, "done": 5, "failed": 5, "reset": 3}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands or len(sys.argv) < commands[sys.argv[1]]:
+        print("Usage: python3 build_journal.py key <kind> <input>... | check <journal> <stage> <key> | "
+              "done <journal> <stage> <key> [<output>...] | failed <journal> <stage> <key> | reset <journal>")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "key":
+        print(stage_key(sys.argv[2], sys.argv[3:]))
+        sys.exit(0)
+
+    journal = BuildJournal(sys.argv[2])
+    if command == "reset":
+        journal.reset()
+    elif command == "check":
+        skip, reason = journal.check(sys.argv[3], sys.argv[4])
+        print(f"  [journal] {'⏭️ Skipping' if skip else '▶️ Running'} stage '{sys.argv[3]}': {reason}.")
+        sys.exit(0 if skip else 2)
+    elif command == "failed":
+        journal.record(sys.argv[3], sys.argv[4], FAILED)
+    else:
+        try:
+            journal.record(sys.argv[3], sys.argv[4], DONE, sys.argv[5:])
+        except OSError as e:
+            print(f"  [journal] ⚠️ Not recording stage '{sys.argv[3]}' as done: {e}")
+            sys.exit(1)
@@ -0,0 +1,564 @@
+# generator/build_server.py
+import os
+import re
+import sys
+import json
+import time
+import base64
+import struct
+import hashlib
+import threading
+import collections
+from email.utils import formatdate
+from urllib.parse import urlsplit, parse_qs, quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.build_queue import open_build_queue, QUEUED, RUNNING, SUCCEEDED, FAILED
+from utils.scheduler import priority_value
+from utils.asset_store import (AssetStore, AssetUploadError, ASSET_STORE_ENV, DEFAULT_ASSET_STORE, MAX_UPLOAD_BYTES,
+                               ingest_upload, safe_relpath)
+from utils.artifact_store import load_manifest, zip_bundle, bundle_etag, ArtifactError
+
+# HTTP API used by client/src/lib/backend-client.ts. Builds are enqueued on the shared build queue
+# and run by build_worker.py processes on any number of nodes.
+DEFAULT_PORT = 8080
+BUILD_QUEUE_ENV = "APPIZER_BUILD_QUEUE"
+DEFAULT_BUILD_QUEUE = "/cache/build-queue.db"
+
+SERVER_VERSION = "1"
+MAX_JSON_BODY_BYTES = 1024 * 1024
+STATUS_LOG_LINES = 200
+
+BUILD_PLATFORMS = ("all", "android", "ios", "linux", "windows", "macos")
+
+# Event streams (/build/{id}/events): one poller reads new job events for every watched job and fans them out
+# from per-job ring buffers, so open browser tabs cost no queue queries of their own.
+EVENT_POLL_SECONDS = 0.5
+EVENT_RING_SIZE = 1000
+EVENT_KEEPALIVE_SECONDS = 15
+SSE_RETRY_MS = 3000
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+ARTIFACT_CONTENT_TYPES = {
+    ".apk": "application/vnd.android.package-archive",
+    ".aab": "application/octet-stream",
+    ".exe": "application/vnd.microsoft.portable-executable",
+    ".msi": "application/x-msi",
+    ".zip": "application/zip",
+}
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Queue states as the client's DockerBuildStatus names them.
+CLIENT_STATUSES = {QUEUED: "queued", RUNNING: "building", SUCCEEDED: "completed", FAILED: "failed"}
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _tail(path, lines):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().splitlines()[-lines:]
+    except OSError:
+        return []
+
+def build_status(job):
+    """The client's DockerBuildStatus for a job from SqliteBuildQueue.describe(), plus scheduling details."""
+    result = job["result"] or {}
+    platform_name = job["payload"].get("platform", "android")
+    logs = _tail(result["log"], STATUS_LOG_LINES) if result.get("log") else []
+    if not logs:
+        logs = [line for line in (job["message"], job["error"]) if line]
+    artifacts = [{
+        "platform": record["platform"],
+        "filename": record["path"],
+        "download_url": f"/build/{job['id']}/download/{record['platform']}?file={quote(record['path'])}",
+        "size": record["size"],
+        "sha256": record["sha256"],
+        "metadata": record["metadata"],
+    } for record in (load_manifest(result["output_dir"]) if result.get("output_dir") else [])]
+    return {
+        "build_id": job["id"],
+        "status": CLIENT_STATUSES[job["status"]],
+        "platform": platform_name,
+        "logs": logs,
+        "artifacts": artifacts,
+        "progress": round(job["progress"] * 100, 1),
+        "message": job["message"],
+        "error": job["error"],
+        "attempts": job["attempts"],
+        "queue_position": job["queue_position"],
+        "eta_seconds": round(job["eta_seconds"]) if job["eta_seconds"] is not None else None,
+    }
+
+def parse_range(header, total):
+    """
+    (start, end) inclusive for a single-range "bytes=" header, None to send everything
+    (no header, or several ranges, which may be answered in full).
+
+    Raises:
+        HttpError: 416 when the range lies outside the content.
+    """
+    match = RANGE_PATTERN.match((header or "").strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    if match.group(1):
+        start = int(match.group(1))
+        end = min(int(match.group(2)), total - 1) if match.group(2) else total - 1
+    else:
+        start, end = max(0, total - int(match.group(2))), total - 1
+    if start >= total or end < start:
+        raise HttpError(416, f"Range not satisfiable for {total} bytes.")
+    return start, end
+
+def stream_event(event):
+    """(event name, data) as sent to clients; queue status names are mapped to the client's."""
+    data = dict(event["data"])
+    if event["type"] == "status":
+        data["status"] = CLIENT_STATUSES[data["status"]]
+    elif event["type"] == "progress":
+        data["progress"] = round(data["progress"] * 100, 1)
+    return event["type"], data
+
+def is_final_event(event):
+    return event["type"] == "status" and event["data"]["status"] in (SUCCEEDED, FAILED)
+
+def build_payload(request, tenant_header=None):
+    """
+    Validates a POST /build body into a queue payload.
+
+    Raises:
+        HttpError: 400 for an invalid platform, priority or config.
+    """
+    platform_name = request.get("platform", "all")
+    if platform_name not in BUILD_PLATFORMS:
+        raise HttpError(400, f"Unknown platform '{platform_name}'. Use one of {', '.join(BUILD_PLATFORMS)}.")
+    if not isinstance(request.get("config"), dict):
+        raise HttpError(400, "'config' must be a JSON object (the app's config.yaml content).")
+    try:
+        priority = priority_value(request.get("priority", "interactive" if request.get("preview") else None))
+    except ValueError as e:
+        raise HttpError(400, str(e))
+    payload = {
+        "platform": platform_name,
+        "config": request["config"],
+        "skip_errors": bool(request.get("skip_errors", False)),
+        "preview": bool(request.get("preview", False)),
+        "priority": priority,
+        "tenant": str(request.get("tenant") or tenant_header or "default"),
+    }
+    if request.get("webapp_assets"):
+        payload["webapp_assets"] = request["webapp_assets"] # Asset upload id; the worker materializes it
+    return payload
+
+def multipart_build_request(fields):
+    """A POST /build request from multipart form fields (the client sends the config as a JSON string)."""
+    request = {key: fields[key] for key in ("platform", "priority", "tenant") if fields.get(key)}
+    for key in ("skip_errors", "preview"):
+        request[key] = fields.get(key, "false").lower() == "true"
+    try:
+        request["config"] = json.loads(fields.get("config") or "null")
+    except json.JSONDecodeError as e:
+        raise HttpError(400, f"Invalid JSON in the 'config' field: {e}")
+    return request
+
+
+class JobEventHub:
+    """
+    Fans job events from the queue out to stream subscribers. A single poller thread fetches new events
+    for all watched jobs; each watched job keeps a ring buffer of its recent events that subscribers,
+    including reconnecting ones resuming from Last-Event-ID, read without touching the queue.
+    """
+
+    def __init__(self, queue, ring_size=EVENT_RING_SIZE, poll_seconds=EVENT_POLL_SECONDS):
+        self.queue = queue
+        self.ring_size = ring_size
+        self.poll_seconds = poll_seconds
+        self._rings = {}
+        self._watchers = collections.Counter()
+        self._changed = threading.Condition()
+        _, self._last_id = queue.events_after(0, [])
+        threading.Thread(target=self._poll, name="job-events", daemon=True).start()
+
+    def subscribe(self, job_id):
+        with self._changed:
+            if job_id not in self._rings:
+                # History up to the poller's position; the poller appends everything after it.
+                self._rings[job_id] = collections.deque(self.queue.events_since(job_id, until_id=self._last_id), self.ring_size)
+            self._watchers[job_id] += 1
+
+    def unsubscribe(self, job_id):
+        with self._changed:
+            self._watchers[job_id] -= 1
+            if self._watchers[job_id] <= 0:
+                del self._watchers[job_id]
+                del self._rings[job_id]
+
+    def wait(self, job_id, after_id, timeout):
+        """Events of a subscribed job with id > after_id, waiting up to `timeout` seconds for one. [] on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                ring = self._rings[job_id]
+                if ring and ring[-1]["id"] > after_id:
+                    return [event for event in ring if event["id"] > after_id]
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                self._changed.wait(remaining)
+
+    def _poll(self):
+        while True:
+            time.sleep(self.poll_seconds)
+            with self._changed:
+                job_ids = list(self._rings)
+            try:
+                events, last_id = self.queue.events_after(self._last_id, job_ids)
+            except Exception as e:
+                print(f"  [build_server] ⚠️ Reading job events failed: {e}")
+                continue
+            with self._changed:
+                for event in events:
+                    if event["job_id"] in self._rings:
+                        self._rings[event["job_id"]].append(event)
+                self._last_id = last_id
+                if events:
+                    self._changed.notify_all()
+
+
+class BuildRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    queue = None # Set by serve()
+    events = None # JobEventHub, set by serve()
+    assets = None # AssetStore, set by serve()
+
+    ROUTES = [
+        ("GET", re.compile(r"^/health$"), "health"),
+        ("POST", re.compile(r"^/build$"), "start_build"),
+        ("POST", re.compile(r"^/upload$"), "upload_assets"),
+        ("GET", re.compile(r"^/build/([0-9a-f]{32})/status$"), "get_status"),
+        ("GET", re.compile(r"^/build/([0-9a-f]{32})/events$"), "stream_events"),
+        ("GET", re.compile(r"^/build/([0-9a-f]{32})/download/([a-z]+)$"), "download"),
+    ]
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self._send_cors_headers()
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _send_cors_headers(self):
+        # The client UI runs on its own origin (Next.js dev server or static hosting).
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Last-Event-ID, X-Appizer-Tenant")
+        self.send_header("Access-Control-Allow-Methods", "GET, HEAD, POST, OPTIONS")
+        self.send_header("Access-Control-Expose-Headers", "Content-Disposition, Content-Range, ETag, X-Checksum-SHA256")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_JSON_BODY_BYTES:
+            raise HttpError(413, f"Request body over {MAX_JSON_BODY_BYTES} bytes.")
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("application/json"):
+            raise HttpError(415, "Send the build request as application/json.")
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError as e:
+            raise HttpError(400, f"Invalid JSON: {e}")
+
+    def _upload(self):
+        """Streams a multipart or archive body into the asset store. Returns (upload id, summary, form fields)."""
+        if self.headers.get("Content-Length") is None:
+            raise HttpError(411, "Uploads need a Content-Length.")
+        length = int(self.headers["Content-Length"])
+        if length > MAX_UPLOAD_BYTES:
+            raise HttpError(413, f"Upload over {MAX_UPLOAD_BYTES} bytes.")
+        self.close_connection = True # A rejected upload leaves the rest of the body unread
+        try:
+            return ingest_upload(self.assets, self.rfile, self.headers.get("Content-Type", ""), length)
+        except AssetUploadError as e:
+            raise HttpError(400, str(e))
+
+    def _dispatch(self, method):
+        path = self.path.split("?")[0]
+        try:
+            for route_method, pattern, handler_name in self.ROUTES:
+                match = pattern.match(path)
+                if match and (route_method == method or (method == "HEAD" and route_method == "GET")):
+                    return getattr(self, handler_name)(*match.groups())
+            raise HttpError(404, f"No route for {method} {path}.")
+        except HttpError as e:
+            self._send_json(e.status, {"success": False, "error": str(e)}, getattr(e, "headers", None))
+        except Exception as e:
+            print(f"  [build_server] ❌ {method} {path} failed: {e}")
+            self._send_json(500, {"success": False, "error": "Internal server error."})
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._send_cors_headers()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def health(self):
+        self._send_json(200, {"status": "ok", "version": SERVER_VERSION, "queue": self.queue.counts()})
+
+    def start_build(self):
+        if self.headers.get("Content-Type", "").startswith("multipart/form-data"):
+            upload_id, summary, fields = self._upload()
+            request = multipart_build_request(fields)
+            request["webapp_assets"] = upload_id
+            print(f"  [build_server] 📂 Webapp assets {upload_id[:12]}: {summary['files']} file(s), "
+                  f"{summary['stored_bytes']} new byte(s), {summary['deduped_files']} already stored.")
+        else:
+            request = self._read_json()
+            if request.get("webapp_assets"):
+                try:
+                    self.assets.load_manifest(request["webapp_assets"])
+                except AssetUploadError as e:
+                    raise HttpError(400, str(e))
+        payload = build_payload(request, self.headers.get("X-Appizer-Tenant"))
+        build_id = self.queue.enqueue(payload)
+        print(f"  [build_server] Queued build {build_id} ({payload['platform']}, priority {payload['priority']}, tenant {payload['tenant']}).")
+        self._send_json(202, {"success": True, "message": "Build queued.", "build_id": build_id})
+
+    def upload_assets(self):
+        """
+        POST /upload: webapp assets as multipart files, or one zip/tar(.gz) body, streamed into the asset store.
+        A JSON body {"files": [{"path", "sha256"}]} instead asks which files are missing: when none are,
+        the upload is complete without sending any content.
+        """
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            entries = self._read_json().get("files") or []
+            try:
+                missing = self.assets.missing(entries)
+                upload_id = None if missing else self.assets.save_manifest({safe_relpath(str(entry["path"])): entry["sha256"]
+                                                                             for entry in entries})
+            except (AssetUploadError, KeyError, TypeError) as e:
+                raise HttpError(400, f"Invalid file list: {e}")
+            return self._send_json(200, {"success": True, "sessionId": upload_id, "missing": missing})
+        upload_id, summary, _ = self._upload()
+        print(f"  [build_server] 📂 Upload {upload_id[:12]}: {summary['files']} file(s), {summary['stored_bytes']} new byte(s), "
+              f"{summary['deduped_files']} already stored.")
+        self._send_json(201, {"success": True, "sessionId": upload_id, **summary})
+
+    def get_status(self, build_id):
+        job = self.queue.describe(build_id)
+        if job is None:
+            raise HttpError(404, f"Unknown build {build_id}.")
+        self._send_json(200, build_status(job))
+
+    def download(self, build_id, platform_name):
+        """
+        GET/HEAD /build/{id}/download/{platform}: the platform's artifact, or a zip of all of them when there
+        are several (e.g. Wails' bin dir) or ?format=zip is given; ?file=<path> picks one file.
+        Served from disk with sendfile, with Range/If-Range for resuming, ETag/If-None-Match, and the SHA-256.
+        """
+        job = self.queue.get(build_id)
+        if job is None:
+            raise HttpError(404, f"Unknown build {build_id}.")
+        if job["status"] != SUCCEEDED:
+            raise HttpError(409, f"Build {build_id} is {CLIENT_STATUSES[job['status']]}; there is nothing to download yet.")
+        query = parse_qs(urlsplit(self.path).query)
+        output_dir = job["result"]["output_dir"]
+        records = [record for record in load_manifest(output_dir) if platform_name == "all" or record["platform"] == platform_name]
+        if "file" in query:
+            records = [record for record in records if record["path"] == query["file"][0]]
+        if not records:
+            raise HttpError(404, f"Build {build_id} has no {platform_name} artifacts.")
+
+        if len(records) == 1 and query.get("format", [""])[0] != "zip":
+            record = records[0]
+            segments = [("file", os.path.join(output_dir, *record["path"].split("/")), record["size"])]
+            total, etag, sha256 = record["size"], record["sha256"], record["sha256"]
+            filename = os.path.basename(record["path"])
+            content_type = ARTIFACT_CONTENT_TYPES.get(os.path.splitext(filename)[1].lower(), "application/octet-stream")
+        else:
+            try:
+                segments, total = zip_bundle(output_dir, records)
+            except ArtifactError as e:
+                raise HttpError(413, str(e))
+            etag, sha256 = bundle_etag(records), None
+            app_name = re.sub(r"[^A-Za-z0-9._-]+", "-", records[0]["metadata"].get("app_name") or build_id).strip("-")
+            filename, content_type = f"{app_name}-{platform_name}.zip", "application/zip"
+        self._send_segments(segments, total, etag, filename, content_type, max(record["mtime"] for record in records), sha256)
+
+    def _send_segments(self, segments, total, etag, filename, content_type, mtime, sha256=None):
+        etag_header = f'"{etag}"'
+        if etag_header in [tag.strip().removeprefix("W/") for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag_header)
+            self._send_cors_headers()
+            self.end_headers()
+            return
+        byte_range = None
+        if self.headers.get("If-Range") in (None, etag_header): # A changed artifact is re-sent whole
+            try:
+                byte_range = parse_range(self.headers.get("Range"), total)
+            except HttpError as e:
+                e.headers = {"Content-Range": f"bytes */{total}"}
+                raise
+        start, end = byte_range or (0, total - 1)
+        self.send_response(206 if byte_range else 200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(end - start + 1))
+        if byte_range:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag_header)
+        self.send_header("Last-Modified", formatdate(mtime, usegmt=True))
+        self.send_header("Cache-Control", "no-cache") # Revalidate with the ETag; unchanged artifacts answer 304
+        self.send_header("Content-Disposition", f'attachment; filename="{filename}"')
+        if sha256:
+            self.send_header("X-Checksum-SHA256", sha256)
+            self.send_header("Repr-Digest", f"sha-256=:{base64.b64encode(bytes.fromhex(sha256)).decode('ascii')}:")
+        self._send_cors_headers()
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+
+        offset = 0
+        for segment in segments:
+            size = len(segment[1]) if segment[0] == "bytes" else segment[2]
+            lo, hi = max(start, offset), min(end + 1, offset + size)
+            if lo < hi:
+                if segment[0] == "bytes":
+                    self.wfile.write(segment[1][lo - offset:hi - offset])
+                else:
+                    with open(segment[1], "rb") as f:
+                        self.wfile.flush()
+                        # Zero-copy (os.sendfile) where the socket allows it, plain sends otherwise.
+                        self.connection.sendfile(f, lo - offset, hi - lo)
+            offset += size
+
+    def stream_events(self, build_id):
+        """
+        Streams a build's events until it finishes: Server-Sent Events, or WebSocket text frames
+        (JSON {"id", "event", "data"}) when the request asks for an upgrade.
+
+        Events: "status" (queued/building/completed/failed), "progress" (percent and stage), "log" (one line),
+        and a final "done" with the full /status body. Reconnects resume after Last-Event-ID
+        (header, or ?last_event_id= where a client cannot set headers, e.g. a WebSocket).
+        """
+        if self.queue.get(build_id) is None:
+            raise HttpError(404, f"Unknown build {build_id}.")
+        query = parse_qs(urlsplit(self.path).query)
+        last_id = self.headers.get("Last-Event-ID") or query.get("last_event_id", ["0"])[0]
+        try:
+            last_id = int(last_id)
+        except ValueError:
+            raise HttpError(400, f"Invalid Last-Event-ID '{last_id}'.")
+
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            send = self._start_websocket()
+        else:
+            send = self._start_event_stream()
+        self.close_connection = True
+        self.events.subscribe(build_id)
+        try:
+            while True:
+                events = self.events.wait(build_id, last_id, EVENT_KEEPALIVE_SECONDS)
+                for event in events:
+                    send(event["id"], *stream_event(event))
+                    last_id = event["id"]
+                finished = any(is_final_event(event) for event in events)
+                if not events:
+                    # Also covers jobs that finished before their final event was retained.
+                    finished = self.queue.get(build_id)["status"] in (SUCCEEDED, FAILED)
+                    if not finished:
+                        send(None, None, None) # Keepalive
+                if finished:
+                    send(last_id, "done", build_status(self.queue.describe(build_id)))
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            pass # The client went away
+        finally:
+            self.events.unsubscribe(build_id)
+
+    def _start_event_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.send_header("X-Accel-Buffering", "no") # Stop reverse proxies from buffering the stream
+        self._send_cors_headers()
+        self.end_headers()
+        self.wfile.write(f"retry: {SSE_RETRY_MS}\n\n".encode("utf-8"))
+
+        def send(event_id, name, data):
+            if name is None:
+                message = ": keepalive\n\n"
+            else:
+                message = f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+            self.wfile.write(message.encode("utf-8"))
+            self.wfile.flush()
+        return send
+
+    def _start_websocket(self):
+        key = self.headers.get("Sec-WebSocket-Key")
+        if not key:
+            raise HttpError(400, "Missing Sec-WebSocket-Key.")
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+
+        def send(event_id, name, data):
+            if name is None:
+                frame, payload = 0x89, b"" # Ping
+            else:
+                frame, payload = 0x81, json.dumps({"id": event_id, "event": name, "data": data}).encode("utf-8")
+            if len(payload) < 126:
+                header = struct.pack("!BB", frame, len(payload))
+            elif len(payload) < 65536:
+                header = struct.pack("!BBH", frame, 126, len(payload))
+            else:
+                header = struct.pack("!BBQ", frame, 127, len(payload))
+            self.wfile.write(header + payload)
+            self.wfile.flush()
+        return send
+
+    def log_message(self, format, *args):
+        print(f"  [build_server] {self.address_string()} {format % args}")
+
+
+def serve(queue, host="0.0.0.0", port=DEFAULT_PORT):
+    BuildRequestHandler.queue = queue
+    BuildRequestHandler.events = JobEventHub(queue)
+    BuildRequestHandler.assets = AssetStore(os.environ.get(ASSET_STORE_ENV, DEFAULT_ASSET_STORE))
+    server = ThreadingHTTPServer((host, port), BuildRequestHandler)
+    print(f"  [build_server] 🌐 Build API on http://{host}:{server.server_address[1]} (queue: {queue.path})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    # Usage: python3 build_server.py [queue] [port] [host]
+    # <queue> defaults to $APPIZER_BUILD_QUEUE or /cache/build-queue.db; run build_worker.py against the same queue.
+    # Uploaded webapp assets go to $APPIZER_ASSET_STORE (default /cache/assets), which workers must share too.
+    queue_location = sys.argv[1] if len(sys.argv) > 1 else os.environ.get(BUILD_QUEUE_ENV, DEFAULT_BUILD_QUEUE)
+    serve(open_build_queue(queue_location),
+          sys.argv[3] if len(sys.argv) > 3 else "0.0.0.0",
+          int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT)
@@ -0,0 +1,344 @@
+# generator/build_worker.py
+import os
+import sys
+import json
+import time
+import yaml
+import random
+import shutil
+import signal
+import socket
+import threading
+import subprocess
+
+from utils.build_queue import open_build_queue, QUEUED, RUNNING, SUCCEEDED, FAILED
+from utils.asset_store import AssetStore, ASSET_STORE_ENV, DEFAULT_ASSET_STORE
+from utils.artifact_store import load_manifest
+from utils.template_store import TemplateStore, TEMPLATE_STORE_ENV, DEFAULT_TEMPLATE_STORE
+from utils.scratch import ScratchSpace, SCRATCH_DIR_ENV
+from utils.android.gradle_properties import BUILD_CONCURRENCY_ENV, detect_cpu_limit, detect_memory_limit_mb
+from utils.metrics import (REGISTRY, METRICS_PORT_ENV, METRICS_TEXTFILE_ENV, QUEUE_JOBS, QUEUE_WAIT_SECONDS, BUILD_SECONDS,
+                           WORKER_CAPACITY, WORKER_BUSY_SLOTS, WORKER_RESERVED, serve_metrics)
+
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Full builds run through the same entrypoint as `docker run`, with per-job paths (see entrypoint.sh).
+ENTRYPOINT_PATH = os.environ.get("APPIZER_ENTRYPOINT", "/entrypoint.sh")
+TEMPLATE_STORE_ROOT = os.environ.get(TEMPLATE_STORE_ENV, DEFAULT_TEMPLATE_STORE)
+ASSET_STORE_ROOT = os.environ.get(ASSET_STORE_ENV, DEFAULT_ASSET_STORE)
+
+IDLE_POLL_SECONDS = 2.0
+
+# How often new build log lines are published as job events (see build_server.py /build/{id}/events).
+LOG_EVENT_SECONDS = 1.0
+MAX_LOG_LINE_CHARS = 2000
+
+# Log lines marking the stage a build reached, reported as stage events and job progress.
+PROGRESS_MARKERS = [
+    ("Running Python generator", "generate", 0.1),
+    ("Python generator finished", "generated", 0.25),
+    ("Starting actual Gradle build", "gradle", 0.3),
+    ("Reusing cached Android APKs", "cached_artifacts", 0.8),
+    ("Running Wails build command", "wails", 0.3),
+    ("Exporting", "export", 0.9),
+]
+
+def node_resources(cgroup_root="/sys/fs/cgroup"):
+    """{"cpus", "memory_mb"} this node offers to builds, from its cgroup limits."""
+    return {"cpus": detect_cpu_limit(cgroup_root), "memory_mb": detect_memory_limit_mb(cgroup_root)}
+
+def node_template_store(work_root):
+    """
+    The template store job workspaces materialize from. Hardlinks cannot cross filesystems, so when
+    `work_root` is on another one than the image's store, the store is mirrored into it once per node.
+    """
+    os.makedirs(work_root, exist_ok=True)
+    if os.stat(TEMPLATE_STORE_ROOT).st_dev == os.stat(work_root).st_dev:
+        return TEMPLATE_STORE_ROOT
+    return TemplateStore(TEMPLATE_STORE_ROOT).mirror(os.path.join(work_root, ".templates")).root
+
+def attempt_name(job):
+    """
+    Unique name of one run of a job. A preempted run gives its attempt back (see SqliteBuildQueue.claim),
+    so the preemption count tells it apart from the re-run while the stopped build may still be shutting down.
+    """
+    name = f"{job['id']}-{job['attempts']}"
+    return f"{name}-p{job['preemptions']}" if job.get("preemptions") else name
+
+def prepare_job_dir(job, work_root):
+    """
+    Creates an isolated workspace for one attempt: an empty project root (the generator materializes
+    only the job's platforms into it, see utils/template_store.py), the job's config, its uploaded
+    webapp assets (hardlinked from the asset store) and an output dir.
+
+    Job payload:
+        {"platform": "android", "config": {...user config...}, "webapp_assets": "<upload id>"
+         (or "webapp_assets_dir": "/shared/webapp"), "skip_errors": false, "offline": false}
+
+    Returns:
+        dict: Paths for the job ("root", "app", "config", "output", "log").
+    """
+    job_root = os.path.join(work_root, attempt_name(job))
+    shutil.rmtree(job_root, ignore_errors=True)
+    paths = {
+        "root": job_root,
+        "app": os.path.join(job_root, "app"),
+        "config": os.path.join(job_root, "config.yaml"),
+        "active_config": os.path.join(job_root, "active-config.yaml"),
+        "output": os.path.join(job_root, "output"),
+        "log": os.path.join(job_root, "build.log"),
+        "metrics": os.path.join(job_root, "metrics.prom"),
+        "webapp": os.path.join(job_root, "webapp"),
+    }
+    os.makedirs(paths["app"])
+    os.makedirs(paths["output"])
+    if job["payload"].get("webapp_assets"):
+        AssetStore(ASSET_STORE_ROOT).materialize(job["payload"]["webapp_assets"], paths["webapp"])
+    with open(paths["config"], "w", encoding="utf-8") as f:
+        yaml.safe_dump(job["payload"].get("config") or {}, f, default_flow_style=False)
+    return paths
+
+def build_command(payload):
+    command = ["bash", ENTRYPOINT_PATH, "-p", payload.get("platform", "android")]
+    if payload.get("preview"):
+        command.append("-g") # Generator only
+    if payload.get("skip_errors"):
+        command.append("-s")
+    if payload.get("offline"):
+        command.append("-o")
+    return command
+
+def build_env(payload, paths, concurrency, template_store=TEMPLATE_STORE_ROOT):
+    env = dict(os.environ)
+    env.update({
+        TEMPLATE_STORE_ENV: template_store,
+        "CONFIG_FILE": paths["config"],
+        "ACTIVE_CONFIG_FILE": paths["active_config"],
+        "CONTAINER_MULTI_PLATFORM_ROOT": paths["app"],
+        "OUTPUT_DIR": paths["output"],
+        "GENERATOR_DIR": GENERATOR_DIR,
+        # Gradle sizes its heap and workers for this node's share (see gradle_properties.py).
+        BUILD_CONCURRENCY_ENV: str(concurrency),
+        # Generator and cache processes of the build add their samples here; the worker merges them afterwards.
+        METRICS_TEXTFILE_ENV: paths["metrics"],
+        SCRATCH_DIR_ENV: paths["scratch"],
+    })
+    if payload.get("webapp_assets"):
+        env["WEBAPP_ASSETS_DIR"] = paths["webapp"]
+    elif payload.get("webapp_assets_dir"):
+        env["WEBAPP_ASSETS_DIR"] = payload["webapp_assets_dir"]
+    return env
+
+class LogFollower:
+    """Reads the lines a build appended to its log since the last call, and the stage they reached."""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.offset = 0
+        self.partial = b""
+        self.progress = 0.0
+        self.stage = None
+        self.last_line = ""
+
+    def read_events(self, final=False):
+        """
+        Returns:
+            list: ("log", {"line"}) events, each followed by a ("progress", {"progress", "stage"}) event if it starts a new stage.
+                With `final`, an unterminated last line is included too.
+        """
+        try:
+            with open(self.log_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except OSError:
+            return []
+        self.offset += len(data)
+        chunks = (self.partial + data).split(b"\n")
+        self.partial = b"" if final else chunks.pop()
+        events = []
+        for chunk in chunks:
+            line = chunk.decode("utf-8", "replace").rstrip("\r")
+            if not line.strip():
+                continue
+            self.last_line = line.strip()
+            events.append(("log", {"line": line[:MAX_LOG_LINE_CHARS]}))
+            for marker, stage, value in PROGRESS_MARKERS:
+                if marker in line and value > self.progress:
+                    self.progress, self.stage = value, stage
+                    events.append(("progress", {"progress": value, "stage": stage}))
+        return events
+
+
+class BuildWorker:
+    """
+    Claims jobs from the shared queue and runs them, each in its own workspace, while their CPU and
+    memory budgets (see utils/scheduler.py) fit the node; `capacity` caps the number of concurrent builds.
+    Nodes never talk to each other: adding one just adds claimers on the same queue.
+    """
+
+    def __init__(self, queue, work_root, capacity=None, worker_id=None, keep_workspaces=False, resources=None):
+        self.queue = queue
+        self.work_root = work_root
+        self.resources = resources or node_resources()
+        self.capacity = capacity or max(1, int(self.resources["cpus"]))
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.keep_workspaces = keep_workspaces
+        self.template_store = TEMPLATE_STORE_ROOT
+        self.stopping = threading.Event()
+        self._reserved = {"cpus": 0.0, "memory_mb": 0}
+        self._claim_lock = threading.Lock()
+
+    def _claim(self):
+        # One claim at a time per node, so two slots never both spend the same free budget.
+        with self._claim_lock:
+            free = {key: self.resources[key] - self._reserved[key] for key in self._reserved}
+            job = self.queue.claim(self.worker_id, free)
+            if job is not None:
+                self._reserve(job, 1)
+            return job
+
+    def _reserve(self, job, sign):
+        self._reserved["cpus"] += sign * job["cpus"]
+        self._reserved["memory_mb"] += sign * job["memory_mb"]
+        for resource, value in self._reserved.items():
+            WORKER_RESERVED.labels(resource=resource).set(value)
+
+    def run_job(self, job):
+        """Runs one claimed job to completion, renewing its lease until the build exits."""
+        payload = job["payload"]
+        platform_name = payload.get("platform", "android")
+        if job.get("first_start"): # Not again after a preemption or an expired lease
+            QUEUE_WAIT_SECONDS.observe(max(0.0, job["started_at"] - job["created_at"]))
+        paths = prepare_job_dir(job, self.work_root)
+        # Downloads and intermediate files of the build go to a scratch dir of its own (tmpfs when memory allows);
+        # it is removed even when the build is killed, which leaves the entrypoint no chance to clean up.
+        with ScratchSpace.create(f"job-{attempt_name(job)}") as scratch:
+            paths["scratch"] = scratch.path
+            print(f"  [build_worker] ▶️ {self.worker_id}: job {job['id']} attempt {job['attempts']} ({payload.get('platform', 'android')}).")
+            started = time.monotonic()
+            with open(paths["log"], "wb") as log:
+                # Gradle sizes its heap and workers for the job's share of the node's memory.
+                concurrency = max(1, int(self.resources["memory_mb"] // max(1, job["memory_mb"])))
+                process = subprocess.Popen(build_command(payload), cwd=paths["root"], env=build_env(payload, paths, concurrency, self.template_store),
+                                           stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+                follower = LogFollower(paths["log"])
+                lease_lost = False
+                next_heartbeat = time.monotonic() + self.queue.lease_seconds / 3
+                while process.poll() is None:
+                    try:
+                        process.wait(timeout=LOG_EVENT_SECONDS)
+                    except subprocess.TimeoutExpired:
+                        pass
+                    events = follower.read_events(final=process.poll() is not None)
+                    alive = self.queue.add_events(job["id"], self.worker_id, events) if events else True
+                    if alive and time.monotonic() >= next_heartbeat:
+                        next_heartbeat = time.monotonic() + self.queue.lease_seconds / 3
+                        alive = self.queue.heartbeat(job["id"], self.worker_id, follower.progress, follower.last_line)
+                    if not alive:
+                        lease_lost = True
+                        os.killpg(process.pid, signal.SIGKILL) # Preempted, or another worker owns the job now
+                        process.wait()
+                if not lease_lost:
+                    events = follower.read_events(final=True)
+                    if events:
+                        self.queue.add_events(job["id"], self.worker_id, events)
+
+            duration_s = round(time.monotonic() - started, 1)
+            outcome = "lease_lost" if lease_lost else ("succeeded" if process.returncode == 0 else "failed")
+            BUILD_SECONDS.labels(platform=platform_name, status=outcome).observe(time.monotonic() - started)
+            if os.path.exists(paths["metrics"]):
+                with open(paths["metrics"], "r", encoding="utf-8") as f:
+                    REGISTRY.merge_text(f.read())
+            if lease_lost:
+                print(f"  [build_worker] ⚠️ Job {job['id']} was preempted or its lease lost; stopped it after {duration_s}s.")
+            elif process.returncode == 0:
+                artifacts = sorted(record["path"] for record in load_manifest(paths["output"]))
+                self.queue.complete(job["id"], self.worker_id, {
+                    "output_dir": paths["output"], "artifacts": artifacts, "log": paths["log"],
+                    "worker": self.worker_id, "duration_s": duration_s,
+                })
+                print(f"  [build_worker] ✅ Job {job['id']} succeeded in {duration_s}s ({len(artifacts)} artifact(s)).")
+            else:
+                status = self.queue.fail(job["id"], self.worker_id, f"Build exited with code {process.returncode}: {follower.last_line}")
+                retry_note = {QUEUED: "will be retried", None: "lease already lost"}.get(status, "no attempts left")
+                print(f"  [build_worker] ❌ Job {job['id']} failed after {duration_s}s ({retry_note}). Log: {paths['log']}")
+
+            if not self.keep_workspaces:
+                # Outputs are what the job result points at; the materialized templates and asset links are only scratch.
+                shutil.rmtree(paths["app"], ignore_errors=True)
+                shutil.rmtree(paths["webapp"], ignore_errors=True)
+
+    def _slot(self):
+        while not self.stopping.is_set():
+            job = self._claim()
+            if job is None:
+                # Jitter keeps idle workers on many nodes from polling in lockstep.
+                self.stopping.wait(IDLE_POLL_SECONDS * random.uniform(0.5, 1.5))
+                continue
+            WORKER_BUSY_SLOTS.labels().inc()
+            try:
+                self.run_job(job)
+            except Exception as e:
+                self.queue.fail(job["id"], self.worker_id, f"Worker error: {e}")
+                print(f"  [build_worker] ❌ Worker error on job {job['id']}: {e}")
+            finally:
+                WORKER_BUSY_SLOTS.labels().dec()
+                with self._claim_lock:
+                    self._reserve(job, -1)
+
+    def serve(self):
+        """Runs `capacity` claim loops until SIGTERM/SIGINT; running builds are allowed to finish."""
+        self.template_store = node_template_store(self.work_root)
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: self.stopping.set())
+        WORKER_CAPACITY.set(self.capacity)
+        for status in (QUEUED, RUNNING, SUCCEEDED, FAILED):
+            # Read at scrape time, so every worker reports the shared queue's current depth.
+            QUEUE_JOBS.labels(status=status).set_function(lambda status=status: self.queue.counts()[status])
+        if os.environ.get(METRICS_PORT_ENV):
+            serve_metrics(int(os.environ[METRICS_PORT_ENV]))
+        print(f"  [build_worker] 🚀 {self.worker_id} serving up to {self.capacity} build(s) within {self.resources['cpus']} CPU(s) "
+              f"and {self.resources['memory_mb']} MB (workspaces in {self.work_root}).")
+        slots = [threading.Thread(target=self._slot, name=f"slot-{i}", daemon=True) for i in range(self.capacity)]
+        for slot in slots:
+            slot.start()
+        while any(slot.is_alive() for slot in slots):
+            for slot in slots:
+                slot.join(timeout=1)
+        print(f"  [build_worker] {self.worker_id} stopped.")
+
+
+if __name__ == "__main__":
+    # Usage:
+    #   python3 build_worker.py work <queue> <work_root> [capacity]
+    #       Claim and run builds until stopped. Start one per node (e.g. docker run --entrypoint python3
+    #       appizer /generator/build_worker.py work /shared/queue.db /work) against the same queue.
+    #   python3 build_worker.py submit <queue> <config_file> <platform> [webapp_assets_dir]
+    #   python3 build_worker.py status <queue> [job_id]
+    # Set APPIZER_METRICS_PORT to serve Prometheus metrics (queue depth, waits, build times) from each worker.
+    # <queue> is a path or URL for utils/build_queue.open_build_queue (e.g. sqlite:///shared/queue.db).
+    if len(sys.argv) < 3 or sys.argv[1] not in ("work", "submit", "status"):
+        print("Usage: python3 build_worker.py work <queue> <work_root> [capacity] | "
+              "submit <queue> <config_file> <platform> [webapp_assets_dir] | status <queue> [job_id]")
+        sys.exit(1)
+
+    build_queue = open_build_queue(sys.argv[2])
+    if sys.argv[1] == "work":
+        if len(sys.argv) < 4:
+            print("Usage: python3 build_worker.py work <queue> <work_root> [capacity]")
+            sys.exit(1)
+        BuildWorker(build_queue, os.path.abspath(sys.argv[3]), int(sys.argv[4]) if len(sys.argv) > 4 else None).serve()
+    elif sys.argv[1] == "submit":
+        if len(sys.argv) < 5:
+            print("Usage: python3 build_worker.py submit <queue> <config_file> <platform> [webapp_assets_dir]")
+            sys.exit(1)
+        with open(sys.argv[3], "r", encoding="utf-8") as f:
+            user_config = yaml.safe_load(f) or {}
+        job_payload = {"platform": sys.argv[4], "config": user_config}
+        if len(sys.argv) > 5:
+            job_payload["webapp_assets_dir"] = os.path.abspath(sys.argv[5])
+        print(build_queue.enqueue(job_payload))
+    elif len(sys.argv) > 3:
+        print(json.dumps(build_queue.get(sys.argv[3]), indent=2))
+    else:
+        print(json.dumps(build_queue.counts()))
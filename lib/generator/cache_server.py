@@ -0,0 +1,99 @@
+# generator/cache_server.py
+import os
+import sys
+import shutil
+import tempfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.remote_cache import CACHE_KEY_PATTERN, COPY_CHUNK_SIZE
+
+# Reference server for utils/remote_cache.HttpCache: a local stand-in for a shared cache service.
+# Blobs are stored exactly as uploaded (gzip) and served back with Content-Encoding: gzip.
+DEFAULT_PORT = 8090
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    storage_dir = None # Set by serve()
+
+    def _blob_path(self):
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "cas" or not CACHE_KEY_PATTERN.match(parts[1]):
+            return None
+        return os.path.join(self.storage_dir, parts[1][:2], parts[1] + ".gz")
+
+    def _reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        blob_path = self._blob_path()
+        if blob_path is None:
+            return self._reply(400, b"Expected /cas/<sha256>\n")
+        try:
+            blob = open(blob_path, "rb")
+        except FileNotFoundError:
+            return self._reply(404)
+        with blob:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(os.fstat(blob.fileno()).st_size))
+            self.end_headers()
+            if self.command != "HEAD":
+                shutil.copyfileobj(blob, self.wfile, COPY_CHUNK_SIZE)
+
+    do_HEAD = do_GET
+
+    def do_PUT(self):
+        blob_path = self._blob_path()
+        if blob_path is None:
+            return self._reply(400, b"Expected /cas/<sha256>\n")
+        if self.headers.get("Content-Encoding") != "gzip" or "Content-Length" not in self.headers:
+            return self._reply(400, b"Expected a gzip body with Content-Length\n")
+        remaining = int(self.headers["Content-Length"])
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while remaining > 0:
+                    chunk = self.rfile.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ConnectionError("Upload ended early")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            os.replace(temp_path, blob_path) # Concurrent PUTs of one key store equivalent outputs; last one wins
+        except ConnectionError:
+            os.remove(temp_path)
+            self.close_connection = True
+            return
+        self._reply(201)
+
+    def log_message(self, format, *args):
+        print(f"  [cache_server] {self.address_string()} {format % args}")
+
+
+def serve(storage_dir, host="127.0.0.1", port=DEFAULT_PORT):
+    os.makedirs(storage_dir, exist_ok=True)
+    CacheRequestHandler.storage_dir = storage_dir
+    server = ThreadingHTTPServer((host, port), CacheRequestHandler)
+    print(f"  [cache_server] 🌐 Serving {storage_dir} on http://{host}:{server.server_address[1]}/cas/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    # Usage: python3 cache_server.py <storage_dir> [port] [host]
+    # Point builders at it with APPIZER_REMOTE_CACHE_URL=http://<host>:<port>
+    if len(sys.argv) < 2:
+        print("Usage: python3 cache_server.py <storage_dir> [port] [host]")
+        sys.exit(1)
+    serve(os.path.abspath(sys.argv[1]),
+          sys.argv[3] if len(sys.argv) > 3 else "127.0.0.1",
+          int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT)
@@ -0,0 +1,104 @@
+# generator/check_build_workers.py
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+
+# Stands in for entrypoint.sh: records which job ran (its per-attempt config path) and exits like a quick build.
+STUB_ENTRYPOINT = """#!/bin/bash
+echo "Running Python generator"
+echo "$CONFIG_FILE" >> "$APPIZER_CHECK_RUNS_LOG"
+sleep 0.3
+echo "Exporting"
+"""
+RUNS_LOG_ENV = "APPIZER_CHECK_RUNS_LOG"
+
+WORKER_COUNT = 3
+JOB_COUNT = 12
+LEASE_SECONDS = 3
+TIMEOUT_SECONDS = 60
+NODE_RESOURCES = {"cpus": 2, "memory_mb": 4096}
+JOB_PAYLOAD = {"platform": "android", "config": {}, "cpus": 1, "memory_mb": 256}
+
+def check_build_workers(work_dir, worker_count=WORKER_COUNT, job_count=JOB_COUNT):
+    """
+    Runs `worker_count` BuildWorkers (one SQLite queue, a workspace root each, the stub entrypoint) until
+    `job_count` jobs are done. One more job is claimed by a worker that dies without renewing its lease,
+    so the live workers have to retry it once the lease expires.
+
+    Returns:
+        list: Problems found, as human-readable lines (empty when every job completed exactly once).
+    """
+    stub_path = os.path.join(work_dir, "entrypoint.sh")
+    with open(stub_path, "w", encoding="utf-8") as f:
+        f.write(STUB_ENTRYPOINT)
+    runs_log = os.path.join(work_dir, "runs.log")
+    open(runs_log, "w").close()
+    os.environ["APPIZER_ENTRYPOINT"] = stub_path
+    os.environ[RUNS_LOG_ENV] = runs_log
+    # Read at import time, so only imported once the stub is in place
+    from build_worker import BuildWorker
+    from utils.build_queue import SqliteBuildQueue, SUCCEEDED
+
+    queue = SqliteBuildQueue(os.path.join(work_dir, "queue.db"), lease_seconds=LEASE_SECONDS)
+    lost_job = queue.enqueue(dict(JOB_PAYLOAD))
+    if queue.claim("lost-worker", dict(NODE_RESOURCES)) is None:
+        return ["the lost worker could not claim its job"]
+    job_ids = [lost_job] + [queue.enqueue(dict(JOB_PAYLOAD)) for _ in range(job_count)]
+
+    workers = [BuildWorker(queue, os.path.join(work_dir, f"node-{i}"), capacity=2, worker_id=f"node-{i}",
+                           resources=dict(NODE_RESOURCES)) for i in range(worker_count)]
+    slots = [threading.Thread(target=worker._slot, daemon=True) for worker in workers for _ in range(worker.capacity)]
+    for slot in slots:
+        slot.start()
+    deadline = time.monotonic() + TIMEOUT_SECONDS
+    while time.monotonic() < deadline and any(queue.get(job_id)["status"] != SUCCEEDED for job_id in job_ids):
+        time.sleep(0.5)
+    for worker in workers:
+        worker.stopping.set()
+    for slot in slots:
+        slot.join(timeout=10)
+
+    problems = []
+    with open(runs_log, "r", encoding="utf-8") as f:
+        run_dirs = [os.path.basename(os.path.dirname(line.strip())) for line in f if line.strip()]
+    for job_id in job_ids:
+        job = queue.get(job_id)
+        runs = sum(1 for name in run_dirs if name.startswith(f"{job_id}-"))
+        if job["status"] != SUCCEEDED:
+            problems.append(f"job {job_id} ended as {job['status']}: {job.get('error') or job.get('message')}")
+        elif runs != 1:
+            problems.append(f"job {job_id} ran {runs} time(s)")
+    lost = queue.get(lost_job)
+    if lost["status"] == SUCCEEDED and (lost["attempts"] != 2 or (lost["result"] or {}).get("worker") == "lost-worker"):
+        problems.append(f"the job with the expired lease finished on attempt {lost['attempts']} by {(lost['result'] or {}).get('worker')}")
+    used = {(queue.get(job_id)["result"] or {}).get("worker") for job_id in job_ids}
+    if len(used) < 2:
+        problems.append(f"only {', '.join(sorted(filter(None, used)))} ran jobs; the workers did not share the queue")
+    return problems
+
+
+if __name__ == "__main__":
+    # Usage: python3 check_build_workers.py
+    # Runs several build workers against one temporary SQLite queue with a stub entrypoint and fails unless
+    # every job completes exactly once and a job whose worker died is retried after its lease expires.
+    if len(sys.argv) > 1:
+        print("Usage: python3 check_build_workers.py")
+        sys.exit(1)
+
+    work_dir = tempfile.mkdtemp(prefix="appizer-workers-check-")
+    try:
+        problems = check_build_workers(work_dir)
+    except Exception as e:
+        print(f"❌ [workers] Check failed: {e}")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for problem in problems:
+        print(f"  [workers] ❌ {problem}")
+    if problems:
+        print(f"❌ [workers] {len(problems)} problem(s) with the build workers.")
+        sys.exit(1)
+    print(f"✅ [workers] {WORKER_COUNT} workers completed {JOB_COUNT + 1} jobs exactly once, including one whose lease expired.")
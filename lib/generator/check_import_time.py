@@ -0,0 +1,87 @@
+# generator/check_import_time.py
+import os
+import sys
+import subprocess
+
+# What a config-only rebuild imports before any work starts: the entrypoint and the platform modifiers it loads.
+DEFAULT_MODULES = ("main", "modifiers.android", "modifiers.windows")
+DEFAULT_BUDGET_MS = 100
+# Heavy dependencies that must only be imported inside the functions that need them (see modifiers/loader.py).
+LAZY_ONLY_MODULES = ("PIL", "requests", "urllib.request", "http.client", "ssl")
+RUNS = 3
+
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def measure_imports(modules):
+    """
+    Imports `modules` in a fresh interpreter under `python -X importtime`.
+
+    Returns:
+        dict: {module: (self_us, cumulative_us, depth)} for every module the import loaded.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+                            cwd=GENERATOR_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {', '.join(modules)} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit(): # The header line
+            continue
+        name = fields[2].rstrip()
+        timings[name.strip()] = (int(fields[0]), int(fields[1]), (len(name) - len(name.lstrip())) // 2)
+    return timings
+
+def check_import_time(modules, budget_ms, runs=RUNS):
+    """
+    Measures how long importing `modules` takes (best of `runs`, after one run that writes the bytecode
+    caches the image ships) and checks it against `budget_ms` and LAZY_ONLY_MODULES.
+
+    Returns:
+        tuple: (import time in ms, list of problems as human-readable lines, the run's timings)
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    measure_imports(modules)
+    best_ms, best_timings = None, None
+    for _ in range(runs):
+        timings = measure_imports(modules)
+        # Top-level entries only: a requested module imported by another one is already in that one's cumulative time
+        total_ms = sum(timings[name][1] for name in modules if name in timings and timings[name][2] == 0) / 1000
+        if best_ms is None or total_ms < best_ms:
+            best_ms, best_timings = total_ms, timings
+    problems = [f"{name} is imported at startup; import it where it is used" for name in LAZY_ONLY_MODULES if name in best_timings]
+    if best_ms > budget_ms:
+        problems.append(f"imports take {best_ms:.1f} ms, over the {budget_ms} ms budget")
+    return best_ms, problems, best_timings
+
+
+if __name__ == "__main__":
+    # Usage: python3 check_import_time.py [budget_ms] [module...]
+    # Fails if importing the generator's startup modules (DEFAULT_MODULES) takes longer than budget_ms
+    # or pulls in one of LAZY_ONLY_MODULES.
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print("Usage: python3 check_import_time.py [budget_ms] [module...]")
+        sys.exit(1)
+
+    budget_ms = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS
+    modules = sys.argv[2:] or list(DEFAULT_MODULES)
+    try:
+        import_ms, problems, timings = check_import_time(modules, budget_ms)
+    except RuntimeError as e:
+        print(f"❌ [imports] {e}")
+        sys.exit(1)
+    for name, (self_us, _cumulative_us, _depth) in sorted(timings.items(), key=lambda item: -item[1][0])[:10]:
+        print(f"  [imports] {self_us / 1000:6.1f} ms  {name}")
+    for problem in problems:
+        print(f"  [imports] ❌ {problem}")
+    if problems:
+        print(f"❌ [imports] Importing {', '.join(modules)} fails the import budget.")
+        sys.exit(1)
+    print(f"✅ [imports] {', '.join(modules)} import in {import_ms:.1f} ms (budget {budget_ms} ms).")
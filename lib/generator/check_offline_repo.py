@@ -0,0 +1,113 @@
+# generator/check_offline_repo.py
+import os
+import sys
+import shutil
+import tempfile
+import urllib.parse
+
+from utils.template_store import default_template_store
+from utils.android.offline_repo import (convert_gradle_cache, write_offline_init_script, point_wrapper_at_offline_distribution,
+                                        GRADLE_CACHE_FILES_DIR, GRADLE_WRAPPER_DISTS_DIR, WRAPPER_DISTRIBUTIONS_DIR,
+                                        WRAPPER_PROPERTIES_PATH, OFFLINE_INIT_SCRIPT_NAME)
+
+# Module every seeded repo must hold: the Android Gradle plugin the template applies.
+ANDROID_GRADLE_PLUGIN_DIR = os.path.join("com", "android", "tools", "build", "gradle")
+
+def wrapper_distribution(android_project_root):
+    """(distributionUrl value with escapes removed, distribution file name) of an Android project's wrapper."""
+    with open(os.path.join(android_project_root, WRAPPER_PROPERTIES_PATH), "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("distributionUrl="):
+                url = line.split("=", 1)[1].strip().replace("\\:", ":")
+                return url, url.rstrip("/").rsplit("/", 1)[-1]
+    raise ValueError(f"No distributionUrl in {WRAPPER_PROPERTIES_PATH}.")
+
+def _write(path, content=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(content)
+
+def check_fake_repo(work_dir):
+    """
+    Converts a fake Gradle user home (one module, a downloaded wrapper distribution) into a repo, then
+    points a freshly materialized Android template at it the way an offline render does.
+
+    Returns:
+        list: Problems found, as human-readable lines (empty when everything resolves locally).
+    """
+    problems = []
+    android_project_root = os.path.join(work_dir, "android")
+    default_template_store().materialize("android", android_project_root)
+    _url, distribution_name = wrapper_distribution(android_project_root)
+
+    gradle_user_home = os.path.join(work_dir, "gradle-home")
+    module_dir = os.path.join(gradle_user_home, GRADLE_CACHE_FILES_DIR, "com.example.lib", "widget", "1.0")
+    _write(os.path.join(module_dir, "0a1b", "widget-1.0.jar"))
+    _write(os.path.join(module_dir, "2c3d", "widget-1.0.pom"))
+    dist_dir = os.path.join(gradle_user_home, GRADLE_WRAPPER_DISTS_DIR, distribution_name[:-len(".zip")], "hash")
+    _write(os.path.join(dist_dir, distribution_name))
+    _write(os.path.join(dist_dir, "gradle", "lib", "plugins", "unpacked.zip")) # Part of the unpacked distribution
+
+    repo_dir = os.path.join(work_dir, "repo")
+    if convert_gradle_cache(gradle_user_home, repo_dir) != 3:
+        problems.append("converting the fake Gradle home did not add exactly 2 module files and 1 distribution")
+    for rel_path in (os.path.join("com", "example", "lib", "widget", "1.0", "widget-1.0.jar"),
+                     os.path.join("com", "example", "lib", "widget", "1.0", "widget-1.0.pom"),
+                     os.path.join(WRAPPER_DISTRIBUTIONS_DIR, distribution_name)):
+        if not os.path.isfile(os.path.join(repo_dir, rel_path)):
+            problems.append(f"{rel_path} is missing from the converted repo")
+    if os.path.exists(os.path.join(repo_dir, WRAPPER_DISTRIBUTIONS_DIR, "unpacked.zip")):
+        problems.append("a file of the unpacked distribution was taken for a downloaded distribution")
+    if convert_gradle_cache(gradle_user_home, repo_dir) != 0:
+        problems.append("converting the same Gradle home twice added files again")
+
+    init_script = write_offline_init_script(android_project_root, repo_dir)
+    with open(init_script, "r", encoding="utf-8") as f:
+        if repo_dir not in f.read():
+            problems.append(f"{OFFLINE_INIT_SCRIPT_NAME} does not point at the repo")
+    if not point_wrapper_at_offline_distribution(android_project_root, repo_dir):
+        problems.append("the Gradle wrapper was not pointed at the repo's distribution")
+    url, _name = wrapper_distribution(android_project_root)
+    local_path = urllib.parse.unquote(urllib.parse.urlparse(url).path) if url.startswith("file:") else None
+    if local_path != os.path.join(repo_dir, WRAPPER_DISTRIBUTIONS_DIR, distribution_name):
+        problems.append(f"the wrapper still installs Gradle from {url}")
+    return problems
+
+def check_seeded_repo(repo_dir, work_dir):
+    """
+    Problems that would make an offline build of the template go online with the seeded `repo_dir`.
+
+    Returns:
+        list: Problems found, as human-readable lines.
+    """
+    android_project_root = os.path.join(work_dir, "seeded-android")
+    default_template_store().materialize("android", android_project_root)
+    _url, distribution_name = wrapper_distribution(android_project_root)
+    problems = []
+    if not os.path.isfile(os.path.join(repo_dir, WRAPPER_DISTRIBUTIONS_DIR, distribution_name)):
+        problems.append(f"{repo_dir} has no {distribution_name}; the wrapper would download it")
+    if not os.path.isdir(os.path.join(repo_dir, ANDROID_GRADLE_PLUGIN_DIR)):
+        problems.append(f"{repo_dir} has no Android Gradle plugin ({ANDROID_GRADLE_PLUGIN_DIR})")
+    return problems
+
+
+if __name__ == "__main__":
+    # Usage: python3 check_offline_repo.py [repo_dir]
+    # Checks the offline repo tooling against a fake Gradle cache and, given a seeded repo (e.g., /opt/maven-offline),
+    # that it holds what an offline build of the template needs (wrapper distribution, Android Gradle plugin).
+    work_dir = tempfile.mkdtemp(prefix="appizer-offline-check-")
+    try:
+        problems = check_fake_repo(work_dir)
+        if len(sys.argv) > 1:
+            problems += check_seeded_repo(os.path.abspath(sys.argv[1]), work_dir)
+    except Exception as e:
+        print(f"❌ [offline] Check failed: {e}")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for problem in problems:
+        print(f"  [offline] ❌ {problem}")
+    if problems:
+        print(f"❌ [offline] {len(problems)} problem(s) with the offline Maven repo.")
+        sys.exit(1)
+    print("✅ [offline] Offline builds resolve dependencies and the Gradle distribution locally.")
@@ -0,0 +1,118 @@
+# generator/check_remote_cache.py
+import os
+import re
+import sys
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+
+from utils.remote_cache import BuildCache, LocalCache, HttpCache
+
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVING_PATTERN = re.compile(r"on http://([^/]+)/cas/")
+
+def start_cache_server(storage_dir):
+    """
+    Starts cache_server.py on an ephemeral port.
+
+    Returns:
+        tuple: (process, base URL)
+    """
+    process = subprocess.Popen([sys.executable, "-u", os.path.join(GENERATOR_DIR, "cache_server.py"), storage_dir, "0"],
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in process.stdout:
+        match = SERVING_PATTERN.search(line)
+        if match:
+            # Keep reading its request log, so a full pipe never blocks the server
+            threading.Thread(target=process.stdout.read, daemon=True).start()
+            return process, f"http://{match.group(1)}"
+    process.wait()
+    raise RuntimeError(f"cache_server.py exited with code {process.returncode} before serving.")
+
+def _blob(work_dir, name, content):
+    path = os.path.join(work_dir, name)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path, hashlib.sha256(content).hexdigest()
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def check_remote_cache(work_dir):
+    """
+    Round-trips blobs and a directory through cache_server.py with HttpCache, then checks that a cache whose
+    server is gone falls back to its LocalCache instead of failing.
+
+    Returns:
+        list: Problems found, as human-readable lines.
+    """
+    problems = []
+    content = os.urandom(64 * 1024) + b"appizer" * 1000
+    src_path, key = _blob(work_dir, "blob.bin", content)
+    dest_path = os.path.join(work_dir, "fetched.bin")
+    process, url = start_cache_server(os.path.join(work_dir, "server"))
+    try:
+        uploader = BuildCache(LocalCache(os.path.join(work_dir, "local-a")), HttpCache(url))
+        uploader.put_file(key, src_path)
+        if uploader.stats["uploads"] != 1:
+            problems.append(f"PUT to {url} failed")
+
+        # Another node: empty local cache, so the blob must come from the server and then stay local
+        fetcher = BuildCache(LocalCache(os.path.join(work_dir, "local-b")), HttpCache(url))
+        if not fetcher.get_file(key, dest_path) or fetcher.stats["remote_hits"] != 1 or _read(dest_path) != content:
+            problems.append("GET did not return the uploaded blob from the server")
+        if not fetcher.get_file(key, dest_path) or fetcher.stats["local_hits"] != 1:
+            problems.append("a remote hit was not kept in the local cache")
+        if fetcher.get_file(hashlib.sha256(b"missing").hexdigest(), dest_path) or fetcher.stats["remote_errors"]:
+            problems.append("a key the server does not have was not a clean miss")
+
+        tree = os.path.join(work_dir, "tree")
+        os.makedirs(os.path.join(tree, "res"))
+        shutil.copyfile(src_path, os.path.join(tree, "res", "icon.png"))
+        dir_key = hashlib.sha256(b"tree").hexdigest()
+        uploader.put_dir(dir_key, tree)
+        restored = os.path.join(work_dir, "restored")
+        if not fetcher.get_dir(dir_key, restored) or _read(os.path.join(restored, "res", "icon.png")) != content:
+            problems.append("a directory did not round-trip through the server")
+    finally:
+        process.terminate()
+        process.wait()
+
+    # The server is gone: uploads and lookups degrade to the local cache for the rest of the run
+    offline = BuildCache(LocalCache(os.path.join(work_dir, "local-c")), HttpCache(url, timeout=2))
+    offline.put_file(key, src_path)
+    if offline.remote is not None or offline.stats["remote_errors"] != 1:
+        problems.append("an unreachable server did not switch the cache to local-only")
+    if not offline.get_file(key, dest_path) or offline.stats["local_hits"] != 1 or _read(dest_path) != content:
+        problems.append("the local cache did not serve the blob once the server was down")
+    fresh = BuildCache(LocalCache(os.path.join(work_dir, "local-d")), HttpCache(url, timeout=2))
+    if fresh.get_file(key, dest_path) or fresh.stats["remote_errors"] != 1:
+        problems.append("a lookup against an unreachable server was not a miss")
+    return problems
+
+
+if __name__ == "__main__":
+    # Usage: python3 check_remote_cache.py
+    # Starts cache_server.py on an ephemeral port, round-trips PUT/GET through HttpCache and checks the
+    # fallback to LocalCache once the server is down.
+    if len(sys.argv) > 1:
+        print("Usage: python3 check_remote_cache.py")
+        sys.exit(1)
+
+    work_dir = tempfile.mkdtemp(prefix="appizer-cache-check-")
+    try:
+        problems = check_remote_cache(work_dir)
+    except Exception as e:
+        print(f"❌ [cache] Check failed: {e}")
+        sys.exit(1)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    for problem in problems:
+        print(f"  [cache] ❌ {problem}")
+    if problems:
+        print(f"❌ [cache] {len(problems)} problem(s) with the remote cache.")
+        sys.exit(1)
+    print("✅ [cache] Blobs round-trip through cache_server.py, and the local cache takes over when it is down.")
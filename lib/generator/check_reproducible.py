@@ -0,0 +1,94 @@
+# generator/check_reproducible.py
+import os
+import sys
+import stat
+import shutil
+import filecmp
+import tempfile
+
+from api import generate
+from utils.config_loader import load_merged_config
+from utils.reproducible import SOURCE_DATE_EPOCH_ENV
+
+# Used when SOURCE_DATE_EPOCH is not set already (1980-01-01, the earliest date zip files can hold).
+DEFAULT_SOURCE_DATE_EPOCH = "315532800"
+
+def snapshot(root):
+    """{relative path: (kind, mode, mtime_ns)} for everything under `root`."""
+    entries = {}
+    for current_root, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files) + dirs:
+            path = os.path.join(current_root, name)
+            path_stat = os.lstat(path)
+            kind = "link" if stat.S_ISLNK(path_stat.st_mode) else ("dir" if stat.S_ISDIR(path_stat.st_mode) else "file")
+            entries[os.path.relpath(path, root)] = (kind, stat.S_IMODE(path_stat.st_mode), path_stat.st_mtime_ns)
+    return entries
+
+def compare_workspaces(first_root, second_root):
+    """Differences between two rendered workspaces, as human-readable lines (empty when byte-for-byte identical)."""
+    first, second = snapshot(first_root), snapshot(second_root)
+    differences = [f"only in one run: {path}" for path in sorted(set(first) ^ set(second))]
+    for path in sorted(set(first) & set(second)):
+        (kind, mode, mtime_ns), (other_kind, other_mode, other_mtime_ns) = first[path], second[path]
+        if (kind, mode) != (other_kind, other_mode):
+            differences.append(f"type or mode differs: {path} ({kind} {mode:o} vs {other_kind} {other_mode:o})")
+        elif kind == "file" and not filecmp.cmp(os.path.join(first_root, path), os.path.join(second_root, path), shallow=False):
+            differences.append(f"content differs: {path}")
+        elif kind == "link" and os.readlink(os.path.join(first_root, path)) != os.readlink(os.path.join(second_root, path)):
+            differences.append(f"link target differs: {path}")
+        elif mtime_ns != other_mtime_ns:
+            differences.append(f"mtime differs: {path}")
+    return differences
+
+def check_reproducible(config, platforms, webapp_assets_dir=""):
+    """
+    Renders `config` twice into fresh workspaces in reproducible mode and compares them byte-for-byte,
+    modes and mtimes included.
+
+    Returns:
+        list: The differences found (see compare_workspaces).
+
+    Raises:
+        RuntimeError: If a render fails.
+    """
+    os.environ.setdefault(SOURCE_DATE_EPOCH_ENV, DEFAULT_SOURCE_DATE_EPOCH)
+    work_dir = tempfile.mkdtemp(prefix="appizer-repro-")
+    try:
+        # Same workspace path for both runs, so paths written into generated files match too
+        workspace = os.path.join(work_dir, "workspace")
+        renders = []
+        for run in ("first", "second"):
+            os.makedirs(workspace)
+            result = generate(config, workspace, platforms, webapp_assets_dir)
+            if not result["success"]:
+                raise RuntimeError(f"The {run} render failed: {result['platforms']}")
+            renders.append(os.path.join(work_dir, run))
+            os.rename(workspace, renders[-1])
+        return compare_workspaces(*renders)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Usage: python3 check_reproducible.py <config_file> <platform> [webapp_assets_dir]
+    # Renders the config twice with SOURCE_DATE_EPOCH set and fails if the two projects differ in any byte.
+    if len(sys.argv) < 3:
+        print("Usage: python3 check_reproducible.py <config_file> <platform> [webapp_assets_dir]")
+        sys.exit(1)
+
+    default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_config.yaml")
+    full_config = load_merged_config(default_config_path, os.path.abspath(sys.argv[1]))
+    if full_config is None:
+        sys.exit(1)
+    try:
+        differences = check_reproducible(full_config, sys.argv[2], os.path.abspath(sys.argv[3]) if len(sys.argv) > 3 else "")
+    except RuntimeError as e:
+        print(f"❌ [repro] {e}")
+        sys.exit(1)
+    for difference in differences:
+        print(f"  [repro] ❌ {difference}")
+    if differences:
+        print(f"❌ [repro] Renders differ in {len(differences)} place(s).")
+        sys.exit(1)
+    print("✅ [repro] Both renders are byte-for-byte identical.")
@@ -0,0 +1,42 @@
+# generator/export_artifacts.py
+import os
+import sys
+import time
+import socket
+
+from utils.config_loader import load_yaml_file, resolve_platform_config
+from utils.artifact_store import export_artifacts, ArtifactError
+
+# Build settings recorded with every artifact, when the platform's `build` section has them.
+METADATA_BUILD_KEYS = ("version_name", "version_code", "build_type", "version", "version_string", "build_number", "architecture")
+
+def build_metadata(config, platform_name):
+    """App identity and version of the build, as recorded in artifacts.json."""
+    platform_config = resolve_platform_config(config, platform_name)
+    build_config = platform_config.get("build") or {}
+    metadata = {
+        "app_name": platform_config.get("app_name", ""),
+        "package_name": platform_config.get("package_name", ""),
+        "built_at": int(time.time()),
+        "builder": socket.gethostname(),
+    }
+    metadata.update({key: build_config[key] for key in METADATA_BUILD_KEYS if key in build_config})
+    return metadata
+
+
+if __name__ == "__main__":
+    # Usage: python3 export_artifacts.py <active_config_file> <platform> <output_dir> <file_or_dir>...
+    # Called by entrypoint.sh after a native build; copies the outputs and records size, SHA-256 and build metadata.
+    if len(sys.argv) < 5:
+        print("Usage: python3 export_artifacts.py <active_config_file> <platform> <output_dir> <file_or_dir>...")
+        sys.exit(1)
+
+    config_file, platform_name, output_dir = sys.argv[1], sys.argv[2], sys.argv[3]
+    try:
+        records = export_artifacts(platform_name, output_dir, sys.argv[4:],
+                                   build_metadata(load_yaml_file(config_file, "active config file"), platform_name))
+    except (ArtifactError, OSError) as e:
+        print(f"  [artifacts] ❌ Export failed: {e}")
+        sys.exit(1)
+    for record in records:
+        print(f"  [artifacts] ✅ {os.path.join(output_dir, record['path'])} ({record['size']} bytes, sha256 {record['sha256'][:16]}…)")
@@ -1,15 +1,11 @@
 # generator/main.py
 import os
-import yaml
 import sys
 
-# Import functions from your src package
-from modifiers.android import inject_into_android_files
-from utils.config_loader import load_yaml_file, merge_configs
-from modifiers.ios import inject_into_ios_files
-from modifiers.linux import inject_into_linux_files
-from modifiers.windows import inject_into_windows_files
-from modifiers.macos import inject_into_macos_files
+# Platform modifiers are imported lazily (see modifiers/loader.py): only the requested ones are loaded.
+from api import generate
+from utils.config_loader import load_yaml_file
+from utils.metrics import write_textfile_from_env
 
 
 if __name__ == "__main__":
@@ -39,7 +35,9 @@ if __name__ == "__main__":
     platform = sys.argv[8]
 
     generator_dir = os.path.dirname(os.path.abspath(__file__))
-    active_config_path = os.path.join(generator_dir, "config.yaml") # This is what entrypoint.sh copied/merged
+    # This is what entrypoint.sh merged, into the run's scratch dir (see utils/scratch.py);
+    # the generator dir fallback is only for running main.py by hand.
+    active_config_path = os.environ.get("ACTIVE_CONFIG_FILE") or os.path.join(generator_dir, "config.yaml")
 
     full_config = load_yaml_file(active_config_path, "active config file")
     if full_config is None:
@@ -48,92 +46,26 @@ if __name__ == "__main__":
     print("✅ Configuration (from active_config_path) loaded successfully in main.py.")
     print(f"  [main.py] Target platform(s) for Python modification: {platform}")
 
-    # Extract common and platform-specific configs
-    common_app_name = full_config.get("app_name", "")
-    common_package_name = full_config.get("package_name", "") # Base package/bundle ID
-    common_url = full_config.get("url", "") # Base URL
-
-    platform_specific_configs = full_config.get("platform_config", {})
+    project_roots = {
+        "android": android_project_root_in_container,
+        "ios": ios_project_root_in_container,
+        "linux": linux_project_root_in_container,
+        "windows": windows_project_root_in_container,
+        "macos": macos_project_root_in_container,
+    }
 
     try:
-        # --- Android Modifier Call ---
-        if platform == "all" or platform == "android":
-            print("--- [main.py] Invoking Android file modification ---")
-            android_config_data = platform_specific_configs.get("android", {})
-            merged_android_config = {
-                "app_name": android_config_data.get("app_name", common_app_name),
-                "package_name": android_config_data.get("package_name", common_package_name),
-                "url": android_config_data.get("url", common_url),
-                **android_config_data
-            }
-            inject_into_android_files(merged_android_config, android_project_root_in_container, container_multi_platform_root, webapp_assets_dir)
-        else:
-            print(f"--- [main.py] Skipping Android file modification for platform: {platform} ---")
-
-        # --- iOS Modifier Call (Placeholder) ---
-        if platform == "all" or platform == "ios":
-            print("--- [main.py] Invoking iOS file modification (Placeholder) ---")
-            ios_config_data = platform_specific_configs.get("ios", {})
-            merged_ios_config = {
-                "app_name": ios_config_data.get("app_name", common_app_name),
-                "package_name": ios_config_data.get("package_name", common_package_name), # Can be overridden by ios_config_data['build']['bundle_identifier']
-                "url": ios_config_data.get("url", common_url),
-                **ios_config_data
-            }
-
-            inject_into_macos_files(merged_macos_config, macos_project_root_in_container, container_multi_platform_root, webapp_assets_dir)
-        else:
-            print(f"--- [main.py] Skipping iOS file modification for platform: {platform} ---")
-
-        # --- Linux Modifier Call ---
-        if platform == "all" or platform == "linux":
-            print("--- [main.py] Invoking Linux file modification (Placeholder) ---")
-            linux_config_data = platform_specific_configs.get("linux", {})
-            merged_linux_config = {
-                "app_name": linux_config_data.get("app_name", common_app_name),
-                "package_name": linux_config_data.get("package_name", common_package_name),
-                "url": linux_config_data.get("url", common_url),
-                **linux_config_data
-            }
-
-            inject_into_macos_files(merged_macos_config, macos_project_root_in_container, container_multi_platform_root, webapp_assets_dir)
-        else:
-            print(f"--- [main.py] Skipping Linux file modification for platform: {platform} ---")
-
-        # --- Windows Modifier Call ---
-        if platform == "all" or platform == "windows":
-            print("--- [main.py] Invoking Windows file modification ---")
-            windows_config_data = platform_specific_configs.get("windows", {})
-            merged_windows_config = {
-                "app_name": windows_config_data.get("app_name", common_app_name),
-                "package_name": windows_config_data.get("package_name", common_package_name), # Base package/bundle ID
-                "url": windows_config_data.get("url", common_url), # Base URL
-                **windows_config_data # Platform-specific overrides
-            }
-            # Pass windows_project_root_in_container and webapp_assets_dir
-            inject_into_windows_files(merged_windows_config, windows_project_root_in_container, container_multi_platform_root, webapp_assets_dir)
-        else:
-            print(f"--- [main.py] Skipping Windows file modification for platform: {platform} ---")
-
-        # --- macOS Modifier Call ---
-        if platform == "all" or platform == "macos":
-            print("--- [main.py] Invoking macOS file modification (Placeholder) ---")
-            macos_config_data = platform_specific_configs.get("macos", {})
-            merged_macos_config = {
-                "app_name": macos_config_data.get("app_name", common_app_name),
-                "package_name": macos_config_data.get("package_name", common_package_name),
-                "url": macos_config_data.get("url", common_url),
-                **macos_config_data
-            }
-
-            inject_into_macos_files(merged_macos_config, macos_project_root_in_container, container_multi_platform_root, webapp_assets_dir)
-        else:
-            print(f"--- [main.py] Skipping macOS file modification for platform: {platform} ---")
-
-
-        print("Python generator finished successfully.")
+        result = generate(full_config, container_multi_platform_root, platform, webapp_assets_dir, project_roots=project_roots)
     except Exception as e:
         print(f"❌ Python generator failed with an unhandled exception: {e}")
         import traceback
         traceback.print_exc()
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+    write_textfile_from_env()
+    for platform_name, platform_result in result["platforms"].items():
+        print(f"  [main.py] {platform_name}: {platform_result['status']} ({platform_result['duration_ms']} ms)")
+    if not result["success"]:
+        print("❌ Python generator failed. See errors above.")
+        sys.exit(1)
+    print("Python generator finished successfully.")
@@ -2,11 +2,61 @@
 import os
 import shutil
 from utils.android.file_actions import move_java_sources
-from utils.main import replace_placeholders, replace_in_file
-from utils.android.logo import generate_launcher_icons
+from utils.main import replace_placeholders, replace_in_file, sync_directory
+from utils.android.logo import generate_launcher_icons_cached
+from utils.android.image_formats import ResourceSizeReport, resource_image_options
 from utils.android.splash_screen import handle_splash_image
+from utils.app_config import APP_CONFIG_ASSET_NAMES, finalize_asset_root
+from utils.android.flavors import validate_flavors, render_product_flavors, write_flavor_resources, flavor_res_path
+from utils.android.runtime_config import RUNTIME_CONFIG_ASSET, write_runtime_config
+from utils.android.gradle_properties import generate_gradle_performance_properties
+from utils.android.offline_repo import resolve_offline_repo, write_offline_init_script, point_wrapper_at_offline_distribution
+from utils.remote_cache import create_build_cache
+from utils.metrics import StageStopwatch
 
-def inject_into_android_files(config, android_project_root, container_multi_platform_root, webapp_assets_dir):
+# Ordered modifier stages. Callers may re-apply a subset (see watch.py), but the order is always kept.
+ANDROID_STAGES = ("sources", "render", "icons", "splash", "assets")
+
+# URL prefix that makes the WebView load the bundled webapp instead of a remote site.
+ANDROID_LOCAL_ASSETS_PREFIX = "file:///android_asset/"
+
+# `webapp` config values -> Java constants rendered into WebViewPreloader.java
+WEBVIEW_CACHE_MODES = {
+    "default": "WebSettings.LOAD_DEFAULT",
+    "cache_else_network": "WebSettings.LOAD_CACHE_ELSE_NETWORK",
+    "no_cache": "WebSettings.LOAD_NO_CACHE",
+    "cache_only": "WebSettings.LOAD_CACHE_ONLY",
+}
+WEBVIEW_LAYER_TYPES = {
+    "hardware": "View.LAYER_TYPE_HARDWARE",
+    "software": "View.LAYER_TYPE_SOFTWARE",
+    "none": "View.LAYER_TYPE_NONE",
+}
+WEBVIEW_RENDERER_PRIORITIES = {
+    "important": "WebView.RENDERER_PRIORITY_IMPORTANT",
+    "bound": "WebView.RENDERER_PRIORITY_BOUND",
+    "waived": "WebView.RENDERER_PRIORITY_WAIVED",
+}
+
+# `splash` config values rendered into SplashActivity.java
+SPLASH_MODES = ("timer", "preload")
+SPLASH_DISMISS_EVENTS = ("first_paint", "page_finished")
+
+def _splash_option(options, value, default, option_name):
+    """Validates a `splash` config value, warning and falling back to `default` if unknown."""
+    if value not in options:
+        print(f"  [Modifier] ⚠️ Unknown splash.{option_name} '{value}'. Using '{default}'. Valid: {', '.join(options)}.")
+        value = default
+    return value
+
+def _java_constant(options, value, default, option_name):
+    """Maps a config value to its Java constant, warning and falling back to `default` if unknown."""
+    if value not in options:
+        print(f"  [Modifier] ⚠️ Unknown webapp.{option_name} '{value}'. Using '{default}'. Valid: {', '.join(options)}.")
+        value = default
+    return options[value]
+
+def inject_into_android_files(config, android_project_root, container_multi_platform_root, webapp_assets_dir, stages=None, scratch=None):
     """
     Injects configuration values into Android project files and handles file movements and asset copying.
     The 'config' argument contains the Android-specific configuration, potentially merged
@@ -17,7 +67,11 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
         android_project_root (str): The root path of the Android project (e.g., '/app/android').
         container_multi_platform_root (str): The overall root of the copied template-app (e.g., '/app').
         webapp_assets_dir (str): The path where user's static assets are mounted.
+        stages (iterable, optional): Subset of ANDROID_STAGES to run. Defaults to all of them.
+        scratch (ScratchSpace, optional): The job's scratch space for downloads and staged icon sets
+            (see utils/scratch.py). Defaults to the job's $APPIZER_SCRATCH_DIR, or a dir of its own.
     """
+    stages = set(ANDROID_STAGES if stages is None else stages)
     app_name = config.get("app_name", "Default App") # Safe access
     package_name = config.get("package_name", "com.default.app") # Safe access
     url = config.get("url", "https://google.com") # Safe access
@@ -29,6 +83,17 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
     logo_path_config = config.get("logo", "")
     splash_config = config.get("splash", {})
     signing_config = config.get("signing", {}) # NEW: Get signing config
+    flavors_config = config.get("flavors") or {}
+    runtime_config_enabled = config.get("runtime_config", False)
+
+    flavor_errors = validate_flavors(flavors_config)
+    if flavor_errors:
+        for error in flavor_errors:
+            print(f"  [Modifier] ❌ {error}")
+        raise ValueError("Invalid 'flavors' section in Android config.")
+    if runtime_config_enabled and flavors_config:
+        # The runtime config lives in src/main/assets and would override every flavor's URL and colors.
+        raise ValueError("'runtime_config' cannot be combined with 'flavors'. Re-skin one base APK per brand instead.")
 
     # --- Process custom Gradle build configurations ---
     custom_gradle_configs = build_config.get("gradle_custom_configs", {})
@@ -92,6 +157,14 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
         "BUILT_IN_ZOOM_CONTROLS": str(webapp_config.get("built_in_zoom_controls", False)).lower(),
         "SUPPORT_ZOOM": str(webapp_config.get("support_zoom", False)).lower(),
 
+        # WebView performance options
+        "USE_ASSET_LOADER": str(webapp_config.get("use_asset_loader", True)).lower(),
+        "WEBVIEW_CACHE_MODE": _java_constant(WEBVIEW_CACHE_MODES, webapp_config.get("cache_mode", "default"), "default", "cache_mode"),
+        "WEBVIEW_LAYER_TYPE": _java_constant(WEBVIEW_LAYER_TYPES, webapp_config.get("layer_type", "hardware"), "hardware", "layer_type"),
+        "DOM_STORAGE_ENABLED": str(webapp_config.get("dom_storage", True)).lower(),
+        "OFFSCREEN_PRE_RASTER": str(webapp_config.get("offscreen_pre_raster", True)).lower(),
+        "RENDERER_PRIORITY": _java_constant(WEBVIEW_RENDERER_PRIORITIES, webapp_config.get("renderer_priority", "important"), "important", "renderer_priority"),
+
         # Build-related properties
         "MIN_SDK_VERSION": str(build_config.get("min_sdk_version", 21)),
         "COMPILE_SDK_VERSION": str(build_config.get("compile_sdk_version", 34)),
@@ -101,7 +174,10 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
         "VERSION_NAME": build_config.get("version_name", "1.0.0"),
 
         # Splash properties
-        "SPLASH_DURATION": str(splash_config.get("duration", 3000)),
+        "SPLASH_DURATION": str(splash_config.get("duration", 3000)), # Upper bound in preload mode
+        "SPLASH_MODE": _splash_option(SPLASH_MODES, splash_config.get("mode", "preload"), "preload", "mode"),
+        "SPLASH_MIN_DURATION": str(splash_config.get("min_duration", 300)),
+        "SPLASH_DISMISS_ON": _splash_option(SPLASH_DISMISS_EVENTS, splash_config.get("dismiss_on", "first_paint"), "first_paint", "dismiss_on"),
         "SPLASH_TYPE": splash_config.get("type", "image"),
         "SPLASH_CONTENT": splash_config.get("content", ""), # Default to empty if no content
         "SPLASH_BACKGROUND_COLOR": splash_config.get("background_color", "#ffffff"),
@@ -111,6 +187,8 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
         "CUSTOM_GRADLE_BUILD_CONFIGS": custom_gradle_configs_string,
         "INJECT_ANDROID_SIGNING_CONFIGS": android_signing_config_block, # NEW
         "INJECT_RELEASE_SIGNING_CONFIG": android_release_signing_config_ref, # NEW
+        "INJECT_PRODUCT_FLAVORS": render_product_flavors(flavors_config, url),
+        "GRADLE_PERFORMANCE_PROPERTIES": generate_gradle_performance_properties(build_config),
     }
 
     print("\n--- [Android Modifier] Starting Android File Modification ---")
@@ -118,15 +196,21 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
     # --- Step 2: Determine Android paths within the new structure ---
     # The 'android_project_root' is now '/app/android'
     android_app_module_root = os.path.join(android_project_root, "app")
-    android_app_src_main_dir = os.path.join(android_app_module_root, "src", "main")
+    android_app_src_dir = os.path.join(android_app_module_root, "src")
+    android_app_src_main_dir = os.path.join(android_app_src_dir, "main")
+    android_assets_dir = os.path.join(android_app_src_main_dir, "assets")
+
+    stopwatch = StageStopwatch("android")
 
     # Move Java source files and update their package declarations
-    print("  [Modifier] Attempting to move Java sources...")
-    try:
-        # move_java_sources expects the 'src/main' path
-        move_java_sources(android_app_src_main_dir, old_package_name_template, package_name)
-    except Exception as e:
-        print(f"  [Modifier] ❌ Error during Java source movement: {e}. This might affect subsequent steps.")
+    if "sources" in stages:
+        stopwatch.start("sources")
+        print("  [Modifier] Attempting to move Java sources...")
+        try:
+            # move_java_sources expects the 'src/main' path
+            move_java_sources(android_app_src_main_dir, old_package_name_template, package_name)
+        except Exception as e:
+            print(f"  [Modifier] ❌ Error during Java source movement: {e}. This might affect subsequent steps.")
 
     # --- Step 3: Dynamically determine paths for files to update after potential moves ---
     pkg_path_in_dirs = package_name.replace(".", "/")
@@ -142,50 +226,106 @@ def inject_into_android_files(config, android_project_root, container_multi_plat
     files_to_update = [
         os.path.join(java_files_dir, "MainActivity.java"),
         os.path.join(java_files_dir, "SplashActivity.java"),
+        os.path.join(java_files_dir, "WebViewPreloader.java"),
         os.path.join(android_res_path, "values", "strings.xml"),
         os.path.join(android_app_src_main_dir, "AndroidManifest.xml"), # Manifest is directly under src/main
         os.path.join(android_res_path, "values", "colors.xml"),
         app_level_gradle_path,
         project_level_gradle_path,
         settings_gradle_path,
-        gradle_properties_path # Added gradle.properties for potential modifications if needed, though now static
+        gradle_properties_path # JVM/worker settings sized from the container's limits
     ]
 
-    # --- Step 4: Replace placeholders in relevant files ---
-    print("\n  [Modifier] Replacing placeholders in Android project files...")
-    for path in files_to_update:
+    if "render" in stages:
+        stopwatch.start("render")
+        # --- Step 4: Replace placeholders in relevant files ---
+        print("\n  [Modifier] Replacing placeholders in Android project files...")
+        for path in files_to_update:
+            try:
+                # Use android_project_root for relative path for better logging context
+                print(f"  [Modifier] Processing: {os.path.relpath(path, android_project_root)}")
+                replace_placeholders(path, replacements)
+            except Exception as e:
+                print(f"  [Modifier] ❌ Error applying placeholders to {os.path.relpath(path, android_project_root)}: {e}")
+
+        # --- Step 5: Handle app_name string resource (as a safeguard) ---
+        print("\n  [Modifier] Ensuring app_name string resource is correct...")
+        strings_xml_path = os.path.join(android_res_path, "values", "strings.xml")
         try:
-            # Use android_project_root for relative path for better logging context
-            print(f"  [Modifier] Processing: {os.path.relpath(path, android_project_root)}")
-            replace_placeholders(path, replacements)
+            if os.path.exists(strings_xml_path):
+                replace_in_file(strings_xml_path, {
+                    f"<string name=\"app_name\">{{{{APP_NAME}}}}</string>": f"<string name=\"app_name\">{app_name}</string>"
+                })
+                print(f"  [Modifier] Ensured app_name in {os.path.relpath(strings_xml_path, android_project_root)} is correct.")
+            else:
+                print(f"  [Modifier] Warning: strings.xml not found at {os.path.relpath(strings_xml_path, android_project_root)}. Skipping app_name update.")
         except Exception as e:
-            print(f"  [Modifier] ❌ Error applying placeholders to {os.path.relpath(path, android_project_root)}: {e}")
-
-    # --- Step 5: Handle app_name string resource (as a safeguard) ---
-    print("\n  [Modifier] Ensuring app_name string resource is correct...")
-    strings_xml_path = os.path.join(android_res_path, "values", "strings.xml")
-    try:
-        if os.path.exists(strings_xml_path):
-            replace_in_file(strings_xml_path, {
-                f"<string name=\"app_name\">{{{{APP_NAME}}}}</string>": f"<string name=\"app_name\">{app_name}</string>"
+            print(f"  [Modifier] ❌ Error updating app_name in strings.xml: {e}")
+
+        if flavors_config:
+            print(f"\n  [Modifier] Writing resources for {len(flavors_config)} product flavor(s)...")
+            write_flavor_resources(flavors_config, android_app_src_dir, {
+                "app_name": app_name,
+                "theme_color": webapp_config.get("theme_color", "#ffffff"),
+                "splash_background_color": splash_config.get("background_color", "#ffffff"),
+                "splash_text_color": splash_config.get("text_color", "#000000"),
             })
-            print(f"  [Modifier] Ensured app_name in {os.path.relpath(strings_xml_path, android_project_root)} is correct.")
-        else:
-            print(f"  [Modifier] Warning: strings.xml not found at {os.path.relpath(strings_xml_path, android_project_root)}. Skipping app_name update.")
-    except Exception as e:
-        print(f"  [Modifier] ❌ Error updating app_name in strings.xml: {e}")
+
+        offline_repo = resolve_offline_repo(build_config)
+        if offline_repo:
+            # entrypoint.sh -o passes this to Gradle together with --offline
+            write_offline_init_script(android_project_root, offline_repo)
+            point_wrapper_at_offline_distribution(android_project_root, offline_repo)
+
+        runtime_config_path = os.path.join(android_assets_dir, RUNTIME_CONFIG_ASSET)
+        if runtime_config_enabled:
+            write_runtime_config(android_assets_dir, config)
+        elif os.path.exists(runtime_config_path):
+            os.remove(runtime_config_path) # Left over from a previous runtime-config build
 
     # --- Step 6: Generate/Handle Resources (Icons, Splash Images) ---
-    print("\n  [Modifier] Handling resource generation (Icons, Splash Images)...")
-    
-    # ALWAYS attempt to generate launcher icons, even if no custom logo is provided.
-    # If logo_path_config is empty, generate_launcher_icons will create a default set.
-    # Pass the actual theme color for adaptive icons if needed (though not fully implemented yet)
-    generate_launcher_icons(logo_path_config, android_res_path, webapp_config.get("theme_color", "#FFFFFF"))
-    
-    if splash_config:
-        handle_splash_image(splash_config, android_res_path, webapp_assets_dir)
-    else:
-        print("  [Modifier] ℹ️ No 'splash' configuration found in Android config. Skipping splash screen image handling.")
+    image_options = resource_image_options(config)
+    size_report = ResourceSizeReport(image_options["format"])
+    if "icons" in stages:
+        stopwatch.start("icons")
+        print("\n  [Modifier] Handling resource generation (Icons)...")
+        # ALWAYS attempt to generate launcher icons, even if no custom logo is provided.
+        # If logo_path_config is empty, generate_launcher_icons will create a default (vector) set.
+        # The theme color is the adaptive icon's background (a colour resource).
+        # Icon sets are keyed by logo content, theme and output options, so builds of the same branding (on any node) reuse them.
+        build_cache = create_build_cache(config)
+        generate_launcher_icons_cached(build_cache, logo_path_config, android_res_path, webapp_config.get("theme_color", "#FFFFFF"),
+                                       image_options, size_report, scratch)
+        for flavor_name in sorted(flavors_config):
+            flavor = flavors_config[flavor_name]
+            print(f"  [Modifier] Generating launcher icons for flavor '{flavor_name}'...")
+            generate_launcher_icons_cached(build_cache, flavor.get("logo", logo_path_config), flavor_res_path(android_app_src_dir, flavor_name),
+                                           flavor.get("theme_color", webapp_config.get("theme_color", "#FFFFFF")), image_options, size_report,
+                                           scratch)
+        if build_cache:
+            build_cache.report()
+
+    if "splash" in stages:
+        stopwatch.start("splash")
+        if splash_config:
+            handle_splash_image(splash_config, android_res_path, webapp_assets_dir, image_options, size_report, scratch)
+        else:
+            print("  [Modifier] ℹ️ No 'splash' configuration found in Android config. Skipping splash screen image handling.")
+    size_report.print_report()
+
+    # --- Step 7: Sync local web assets into the APK's assets dir ---
+    if "assets" in stages:
+        stopwatch.start("assets")
+        if url.startswith(ANDROID_LOCAL_ASSETS_PREFIX):
+            if webapp_assets_dir and os.path.isdir(webapp_assets_dir) and os.listdir(webapp_assets_dir):
+                print(f"  [Modifier] 📂 Syncing static files from {webapp_assets_dir} to {android_assets_dir}...")
+                sync_directory(webapp_assets_dir, android_assets_dir, preserve={RUNTIME_CONFIG_ASSET, *APP_CONFIG_ASSET_NAMES})
+                print("  [Modifier] ✅ Static assets synced for local WebView use.")
+                finalize_asset_root(config, "android", webapp_assets_dir, android_assets_dir)
+            else:
+                print(f"  [Modifier] ⚠️ No static assets found in {webapp_assets_dir}. WebView might show a blank page.")
+        else:
+            print("  [Modifier] 🌐 App URL is external. Skipping static asset sync to Android assets.")
 
-    print("\n--- [Android Modifier] Android File Modification Complete ---")
\ No newline at end of file
+    stopwatch.stop()
+    print("\n--- [Android Modifier] Android File Modification Complete ---")
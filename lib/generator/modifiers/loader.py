@@ -0,0 +1,23 @@
+# generator/modifiers/loader.py
+import importlib
+
+# platform -> (module, entry function). Modules are imported on first use only, so a run for
+# one platform never pays for (or breaks on) the imports of the others.
+PLATFORM_MODIFIERS = {
+    "android": ("modifiers.android", "inject_into_android_files"),
+    "ios": ("modifiers.ios", "inject_into_ios_files"),
+    "linux": ("modifiers.linux", "inject_into_linux_files"),
+    "windows": ("modifiers.windows", "inject_into_windows_files"),
+    "macos": ("modifiers.macos", "inject_into_macos_files"),
+}
+
+def load_modifier(platform_name):
+    """
+    Imports and returns a platform's inject function.
+
+    Returns:
+        callable or None: None if the platform's modifier is still a placeholder.
+    """
+    module_name, function_name = PLATFORM_MODIFIERS[platform_name]
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name, None)
@@ -0,0 +1,181 @@
+# generator/reskin.py
+import os
+import sys
+import time
+import shutil
+import zipfile
+import subprocess
+
+from modifiers.android import ANDROID_LOCAL_ASSETS_PREFIX
+from utils.config_loader import load_merged_config, resolve_platform_config
+from utils.precache import build_precache_manifest, save_precache_files, PRECACHE_MANIFEST_NAME, SERVICE_WORKER_NAME
+from utils.app_config import APP_CONFIG_ASSET_NAMES, build_app_config, write_app_config_files, match_asset_globs, substitute_asset_tokens
+from utils.android.runtime_config import RUNTIME_CONFIG_ASSET, write_runtime_config
+from utils.android.apk_patch import patch_apk, align_and_sign
+from utils.remote_cache import create_build_cache
+from utils.scratch import job_scratch
+from utils.template_store import default_template_store
+
+# Same keystore the template's debug signingConfig uses; the file is taken from the template store's android bundle.
+DEBUG_KEYSTORE_TEMPLATE_PATH = "debug.keystore"
+DEFAULT_DEBUG_KEYSTORE = {"password": "android", "alias": "androiddebugkey", "key_password": "android"}
+
+def default_debug_keystore(scratch):
+    """
+    DEFAULT_DEBUG_KEYSTORE with its file extracted from the template store into the job's scratch space.
+
+    Raises:
+        TemplateStoreError: If the store has no android bundle with the keystore.
+    """
+    path = default_template_store().extract_file("android", DEBUG_KEYSTORE_TEMPLATE_PATH,
+                                                 scratch.join("keystore", DEBUG_KEYSTORE_TEMPLATE_PATH))
+    return dict(DEFAULT_DEBUG_KEYSTORE, path=path)
+
+def resolve_keystore(signing_config, scratch, debug_keystore=None):
+    """Uses the configured release keystore when it is complete, else the debug keystore."""
+    keystore = {
+        "path": signing_config.get("keystore_file_in_container"),
+        "password": signing_config.get("keystore_password"),
+        "alias": signing_config.get("key_alias"),
+        "key_password": signing_config.get("key_password"),
+    }
+    if all(keystore.values()) and os.path.isfile(keystore["path"]):
+        return keystore
+    print("  [Reskin] ⚠️ Release signing details incomplete or keystore missing. Signing with the debug keystore.")
+    return debug_keystore or default_debug_keystore(scratch)
+
+def collect_webapp_entries(webapp_assets_dir):
+    """Maps every file of the webapp bundle to its 'assets/...' entry name."""
+    entries = {}
+    for root, dirs, files in os.walk(webapp_assets_dir):
+        dirs.sort()
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            entries["assets/" + os.path.relpath(file_path, webapp_assets_dir).replace(os.sep, "/")] = file_path
+    return entries
+
+def collect_res_overrides(res_dir):
+    """
+    Maps bitmaps generated into a scratch 'res' dir to their 'type/name' resource keys. XML resources
+    (the vector default icon, adaptive icon layers, colours) are left out: the APK holds them compiled
+    by aapt2 (or in resources.arsc), so a source file cannot replace them.
+    """
+    resources = {}
+    for root, _, files in os.walk(res_dir):
+        for name in files:
+            if name.endswith(".xml"):
+                continue
+            file_path = os.path.join(root, name)
+            resources[os.path.relpath(file_path, res_dir).replace(os.sep, "/")] = file_path
+    return resources
+
+def reskin_apk(config, base_apk, output_apk, webapp_assets_dir, scratch, debug_keystore=None):
+    """
+    Re-skins a prebuilt runtime-config APK: swaps the runtime config, web assets, launcher icons and
+    splash image at the zip level, then re-aligns and re-signs. No Gradle run is involved.
+
+    Args:
+        config (dict): The Android-specific configuration dictionary.
+        base_apk (str): APK built from this template with `runtime_config: true`.
+        output_apk (str): Where the signed APK is written.
+        webapp_assets_dir (str): The path where user's static assets are mounted.
+        scratch (ScratchSpace): The job's scratch space for generated files (see utils/scratch.py).
+        debug_keystore (dict, optional): Overrides the template's debug keystore ({"path", "password", "alias", "key_password"}).
+
+    Raises:
+        ValueError: If the base APK was not built in runtime-config mode.
+    """
+    with zipfile.ZipFile(base_apk) as base:
+        if "assets/" + RUNTIME_CONFIG_ASSET not in base.namelist():
+            raise ValueError(f"{base_apk} has no assets/{RUNTIME_CONFIG_ASSET}; rebuild it once with 'runtime_config: true'.")
+
+    webapp_config = config.get("webapp", {})
+    url = config.get("url", "")
+    scratch_dir = scratch.mkdtemp(prefix="reskin-")
+    scratch_assets_dir = os.path.join(scratch_dir, "assets")
+    scratch_res_dir = os.path.join(scratch_dir, "res")
+
+    os.makedirs(scratch_assets_dir, exist_ok=True)
+    entries = {}
+    drop_prefixes = ()
+    if url.startswith(ANDROID_LOCAL_ASSETS_PREFIX) and webapp_assets_dir and os.path.isdir(webapp_assets_dir) and os.listdir(webapp_assets_dir):
+        print(f"  [Reskin] 📂 Replacing bundled web assets with {webapp_assets_dir}...")
+        entries.update(collect_webapp_entries(webapp_assets_dir))
+        drop_prefixes = ("assets/",) # Files removed from the webapp must disappear from the APK too
+
+        # Only the files token substitution applies to are copied; everything else streams from the source.
+        app_config = build_app_config(config, "android")
+        write_app_config_files(scratch_assets_dir, app_config)
+        asset_tokens_config = config.get("asset_tokens") or {}
+        if asset_tokens_config.get("enabled", False):
+            for rel_path in match_asset_globs(webapp_assets_dir, asset_tokens_config.get("globs") or []):
+                os.makedirs(os.path.dirname(os.path.join(scratch_assets_dir, rel_path)), exist_ok=True)
+                shutil.copyfile(os.path.join(webapp_assets_dir, rel_path), os.path.join(scratch_assets_dir, rel_path))
+        updated_paths = sorted(APP_CONFIG_ASSET_NAMES) + substitute_asset_tokens(scratch_assets_dir, app_config, asset_tokens_config)
+        for rel_path in updated_paths:
+            entries["assets/" + rel_path] = os.path.join(scratch_assets_dir, rel_path)
+
+        if webapp_config.get("precache_manifest", True):
+            # Assets are streamed from the source, so there is no synced copy to verify.
+            save_precache_files(scratch_assets_dir, build_precache_manifest(webapp_assets_dir),
+                                webapp_config.get("service_worker", False), updated_paths)
+            for name in (PRECACHE_MANIFEST_NAME, SERVICE_WORKER_NAME):
+                if os.path.exists(os.path.join(scratch_assets_dir, name)):
+                    entries["assets/" + name] = os.path.join(scratch_assets_dir, name)
+    entries["assets/" + RUNTIME_CONFIG_ASSET] = write_runtime_config(scratch_assets_dir, config)
+
+    # Pillow is only needed when images are regenerated, so import the resource helpers lazily.
+    from utils.android.logo import generate_launcher_icons_cached
+    from utils.android.splash_screen import handle_splash_image
+    from utils.android.image_formats import resource_image_options
+    # Same options as the base build, so the bitmaps keep their resource file names (.png or .webp)
+    image_options = resource_image_options(config)
+    generate_launcher_icons_cached(create_build_cache(config), config.get("logo", ""), scratch_res_dir,
+                                   webapp_config.get("theme_color", "#FFFFFF"), image_options, scratch=scratch)
+    if config.get("splash"):
+        handle_splash_image(config["splash"], scratch_res_dir, webapp_assets_dir, image_options, scratch=scratch)
+    resources = collect_res_overrides(scratch_res_dir)
+
+    unsigned_apk = os.path.join(scratch_dir, "unsigned.apk")
+    stats = patch_apk(base_apk, unsigned_apk, entries, resources, drop_prefixes)
+    scratch.check_quota()
+    print(f"  [Reskin] ✅ Patched APK: {stats['copied']} copied, {stats['replaced']} replaced, "
+          f"{stats['added']} added, {stats['dropped']} dropped.")
+    if stats["missing_resources"]:
+        # New drawables need an entry in resources.arsc, which only aapt2 (a full build) can add.
+        print(f"  [Reskin] ⚠️ Base APK has no res entry for {', '.join(stats['missing_resources'])}; "
+              "not applied. Rebuild to add new resources.")
+
+    align_and_sign(unsigned_apk, output_apk, resolve_keystore(config.get("signing", {}), scratch, debug_keystore),
+                   config.get("build", {}).get("build_tools_version"))
+
+
+if __name__ == "__main__":
+    # Expected arguments:
+    # 1. base_apk (e.g., /output/android/app-release.apk) - built once with `runtime_config: true`
+    # 2. output_apk (e.g., /output/android/app-reskinned.apk)
+    # 3. config_file (e.g., /config.yaml) - user's config, merged over default_config.yaml
+    # 4. webapp_assets_dir (e.g., /webapp)
+    if len(sys.argv) < 5:
+        print("Usage: python3 reskin.py <base_apk> <output_apk> <config_file> <webapp_assets_dir>")
+        sys.exit(1)
+
+    base_apk, output_apk, config_file, webapp_assets_dir = (os.path.abspath(arg) for arg in sys.argv[1:5])
+    default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_config.yaml")
+    full_config = load_merged_config(default_config_path, config_file)
+    if full_config is None:
+        sys.exit(1)
+
+    started = time.perf_counter()
+    scratch = job_scratch("reskin")
+    try:
+        reskin_apk(resolve_platform_config(full_config, "android"), base_apk, output_apk, webapp_assets_dir, scratch)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ [Reskin] {os.path.basename(e.cmd[0])} failed:\n{e.stderr or e.stdout}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ [Reskin] Re-skin failed: {e}")
+        sys.exit(1)
+    finally:
+        scratch.cleanup()
+    print(f"⏱️  [Reskin] Re-skinned {os.path.basename(base_apk)} in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,33 @@
+# generator/scratch_space.py
+import os
+import sys
+from contextlib import redirect_stdout
+
+from utils.scratch import ScratchSpace, default_scratch_root, reap_stale_scratch, scratch_quota_bytes
+
+
+if __name__ == "__main__":
+    # Usage:
+    #   python3 scratch_space.py create <owner_pid> [job_name]
+    #       Creates a job scratch dir (tmpfs when memory allows, see utils/scratch.py) and prints its path.
+    #       It counts as stale, and is reaped by the next job, once <owner_pid> has exited. The owner removes it.
+    #   python3 scratch_space.py reap [scratch_root]
+    #       Removes scratch dirs left behind by jobs that were killed.
+    if len(sys.argv) < 2 or sys.argv[1] not in ("create", "reap") or (sys.argv[1] == "create" and len(sys.argv) < 3):
+        print("Usage: python3 scratch_space.py create <owner_pid> [job_name] | reap [scratch_root]")
+        sys.exit(1)
+
+    if sys.argv[1] == "create":
+        # Only the path goes to stdout, so the shell can capture it
+        with redirect_stdout(sys.stderr):
+            try:
+                scratch = ScratchSpace.create(sys.argv[3] if len(sys.argv) > 3 else "job", owner_pid=int(sys.argv[2]))
+            except (OSError, ValueError) as e:
+                print(f"❌ [scratch] Could not create a scratch dir: {e}")
+                sys.exit(1)
+            print(f"  [scratch] ✅ Scratch dir {scratch.path} (quota {scratch_quota_bytes() // (1024 * 1024)} MB).")
+        print(scratch.path)
+    else:
+        root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else default_scratch_root()
+        reaped = reap_stale_scratch(root)
+        print(f"✅ [scratch] Reaped {reaped} stale dir(s) in {root}.")
@@ -0,0 +1,76 @@
+# generator/seed_maven_repo.py
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+
+from api import generate
+from utils.config_loader import load_merged_config
+from utils.android.offline_repo import convert_gradle_cache
+
+# Both build types, so release-only tooling (R8, signing) is part of the closure too.
+SEED_GRADLE_TASKS = ["assembleDebug", "assembleRelease"]
+
+def seed_from_template(template_root, repo_dir, config_file=None, tasks=None):
+    """
+    Resolves the Android template's full dependency closure (plugins, buildscript and app dependencies)
+    with one online Gradle build in a throwaway GRADLE_USER_HOME, then converts that cache (and the Gradle
+    distribution the wrapper downloaded) into `repo_dir`.
+
+    Args:
+        template_root (str): A pristine template-app dir (the Dockerfile materializes one from the template store).
+        repo_dir (str): The file-based Maven repository to create or extend.
+        config_file (str, optional): Config merged over default_config.yaml for the seeding build.
+        tasks (list, optional): Gradle tasks to run. Defaults to SEED_GRADLE_TASKS.
+
+    Returns:
+        int: Number of files added to the repository.
+    """
+    default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_config.yaml")
+    config = load_merged_config(default_config_path, config_file)
+    if config is None:
+        raise ValueError("Could not load the config for the seeding build.")
+
+    work_dir = tempfile.mkdtemp(prefix="appizer-seed-")
+    try:
+        workspace = os.path.join(work_dir, "workspace")
+        gradle_user_home = os.path.join(work_dir, "gradle-home")
+        os.makedirs(workspace)
+        result = generate(config, workspace, "android", template_root=template_root)
+        if not result["success"]:
+            raise RuntimeError(f"Generator failed for the seeding build: {result['platforms']['android']['error']}")
+
+        android_project_root = os.path.join(workspace, "android")
+        print(f"  [seed] 🌐 Resolving dependencies online with Gradle ({' '.join(tasks or SEED_GRADLE_TASKS)})...")
+        subprocess.run(["./gradlew", "--no-daemon", "--gradle-user-home", gradle_user_home, *(tasks or SEED_GRADLE_TASKS)],
+                       cwd=android_project_root, check=True)
+        return convert_gradle_cache(gradle_user_home, repo_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    # Usage:
+    #   python3 seed_maven_repo.py template <template_root> <repo_dir> [config_file]
+    #       Build the template once online and keep everything it resolved.
+    #   python3 seed_maven_repo.py convert <gradle_user_home> <repo_dir>
+    #       Convert an existing Gradle cache (e.g., from a CI build) into the repository.
+    if len(sys.argv) < 4 or sys.argv[1] not in ("template", "convert"):
+        print("Usage: python3 seed_maven_repo.py template <template_root> <repo_dir> [config_file] | "
+              "python3 seed_maven_repo.py convert <gradle_user_home> <repo_dir>")
+        sys.exit(1)
+
+    try:
+        if sys.argv[1] == "template":
+            seed_from_template(os.path.abspath(sys.argv[2]), os.path.abspath(sys.argv[3]),
+                               os.path.abspath(sys.argv[4]) if len(sys.argv) > 4 else None)
+        else:
+            convert_gradle_cache(os.path.abspath(sys.argv[2]), os.path.abspath(sys.argv[3]))
+    except subprocess.CalledProcessError as e:
+        print(f"❌ [seed] Gradle failed with exit code {e.returncode}.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ [seed] Seeding failed: {e}")
+        sys.exit(1)
+    print(f"✅ [seed] Offline Maven repository ready at {os.path.abspath(sys.argv[3])}")
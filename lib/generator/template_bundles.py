@@ -0,0 +1,34 @@
+# generator/template_bundles.py
+import os
+import sys
+
+from utils.template_store import TemplateStore, TemplateStoreError, build_template_store
+
+
+if __name__ == "__main__":
+    # Usage:
+    #   python3 template_bundles.py build <template_root> <store_dir>
+    #       Store each platform dir of template-app as a content-addressed bundle (done by the Dockerfile).
+    #   python3 template_bundles.py materialize <store_dir> <workspace> <platform>...
+    #       Lay out the given platforms in <workspace> (the generator does this on its own for missing projects).
+    if len(sys.argv) < 4 or sys.argv[1] not in ("build", "materialize") or (sys.argv[1] == "materialize" and len(sys.argv) < 5):
+        print("Usage: python3 template_bundles.py build <template_root> <store_dir> | "
+              "python3 template_bundles.py materialize <store_dir> <workspace> <platform>...")
+        sys.exit(1)
+
+    try:
+        if sys.argv[1] == "build":
+            for platform_name, bundle_id in build_template_store(os.path.abspath(sys.argv[2]), os.path.abspath(sys.argv[3])).items():
+                print(f"  [template] ✅ {platform_name}: bundle {bundle_id}")
+        else:
+            store = TemplateStore(os.path.abspath(sys.argv[2]))
+            for platform_name in sys.argv[4:]:
+                dest = os.path.join(os.path.abspath(sys.argv[3]), platform_name)
+                summary = store.materialize(platform_name, dest)
+                if summary is None:
+                    print(f"  [template] ℹ️ {dest} already exists; left as is.")
+                else:
+                    print(f"  [template] ✅ {platform_name}: {summary['files']} files ({summary['linked']} hardlinked) in {dest}")
+    except (TemplateStoreError, OSError) as e:
+        print(f"  [template] ❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,146 @@
+# generator/utils/android/apk_patch.py
+import os
+import re
+import shutil
+import zipfile
+import subprocess
+
+# v1 (JAR) signature files. They sign every entry, so they are dropped before re-signing.
+# The v2+ signing block sits outside the zip entries and is not carried over by a rewrite anyway.
+APK_SIGNATURE_FILE_PATTERN = re.compile(r"^META-INF/[^/]+\.(SF|RSA|DSA|EC|MF)$")
+
+# "res/mipmap-hdpi-v4/ic_launcher.png" -> "mipmap-hdpi/ic_launcher.png" (aapt2 adds the -vN qualifier).
+APK_RESOURCE_ENTRY_PATTERN = re.compile(r"^res/([^/]+?)(?:-v\d+)?/([^/]+)$")
+
+# Already-compressed or mmap'd formats stay STORED, like aapt2 packages them.
+APK_STORED_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg", ".gif", ".arsc", ".so", ".mp3", ".mp4", ".ogg", ".woff2")
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+def resource_key(entry_name):
+    """Returns the qualifier-free 'type/name' key of a res/ entry (e.g., 'drawable/splash.png'), or None."""
+    match = APK_RESOURCE_ENTRY_PATTERN.match(entry_name)
+    return f"{match.group(1)}/{match.group(2)}" if match else None
+
+def _new_entry_info(name, template_info=None):
+    """Builds the ZipInfo for a written entry, keeping the base entry's compression when there was one."""
+    info = zipfile.ZipInfo(name, date_time=template_info.date_time if template_info else (1980, 1, 1, 0, 0, 0))
+    if template_info is not None:
+        info.compress_type = template_info.compress_type
+        info.external_attr = template_info.external_attr
+    else:
+        info.compress_type = zipfile.ZIP_STORED if name.lower().endswith(APK_STORED_EXTENSIONS) else zipfile.ZIP_DEFLATED
+    return info
+
+def patch_apk(base_apk, output_apk, entries=None, resources=None, drop_prefixes=()):
+    """
+    Streams `base_apk` into `output_apk`, replacing or adding entries on the way.
+    Nothing is extracted to disk: unchanged entries are piped through in chunks.
+
+    Args:
+        base_apk (str): The prebuilt APK.
+        output_apk (str): Where the unsigned, unaligned result is written.
+        entries (dict, optional): {entry_name: source_file} to replace or add (e.g., 'assets/index.html').
+        resources (dict, optional): {'type/name': source_file} to replace existing res/ entries
+            (e.g., 'mipmap-hdpi/ic_launcher.png'). Resources cannot be added, since resources.arsc is not rewritten.
+        drop_prefixes (iterable): Base entries under these prefixes are removed unless replaced (e.g., 'assets/').
+
+    Returns:
+        dict: {"copied": int, "replaced": int, "added": int, "dropped": int, "missing_resources": [keys]}
+    """
+    entries = dict(entries or {})
+    resources = dict(resources or {})
+    stats = {"copied": 0, "replaced": 0, "added": 0, "dropped": 0, "missing_resources": []}
+    matched_resources = set()
+
+    with zipfile.ZipFile(base_apk, "r") as zin, zipfile.ZipFile(output_apk, "w") as zout:
+        for info in zin.infolist():
+            name = info.filename
+            if APK_SIGNATURE_FILE_PATTERN.match(name):
+                stats["dropped"] += 1
+                continue
+
+            source_path = entries.pop(name, None)
+            key = resource_key(name)
+            if source_path is None and key in resources:
+                source_path = resources[key]
+                matched_resources.add(key)
+
+            if source_path is not None:
+                with open(source_path, "rb") as src, zout.open(_new_entry_info(name, info), "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                stats["replaced"] += 1
+            elif any(name.startswith(prefix) for prefix in drop_prefixes):
+                stats["dropped"] += 1
+            else:
+                with zin.open(info) as src, zout.open(_new_entry_info(name, info), "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+                stats["copied"] += 1
+
+        # Entries the base APK did not have (new web assets, the runtime config on first re-skin)
+        for name in sorted(entries):
+            with open(entries[name], "rb") as src, zout.open(_new_entry_info(name), "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK_SIZE)
+            stats["added"] += 1
+
+    stats["missing_resources"] = sorted(set(resources) - matched_resources)
+    return stats
+
+def find_build_tool(tool_name, build_tools_version=None):
+    """
+    Locates an Android build-tools binary (zipalign, apksigner).
+    Looks in $ANDROID_HOME (or $ANDROID_SDK_ROOT)/build-tools/<version>, then the newest installed version, then PATH.
+
+    Raises:
+        FileNotFoundError: If the tool cannot be found.
+    """
+    sdk_root = os.environ.get("ANDROID_HOME") or os.environ.get("ANDROID_SDK_ROOT")
+    if sdk_root:
+        build_tools_dir = os.path.join(sdk_root, "build-tools")
+        versions = [build_tools_version] if build_tools_version else []
+        if os.path.isdir(build_tools_dir):
+            versions += sorted(os.listdir(build_tools_dir), reverse=True)
+        for version in versions:
+            candidate = os.path.join(build_tools_dir, version, tool_name)
+            if os.path.isfile(candidate):
+                return candidate
+    on_path = shutil.which(tool_name)
+    if on_path:
+        return on_path
+    raise FileNotFoundError(f"Android build tool '{tool_name}' not found (set ANDROID_HOME or add it to PATH).")
+
+def align_and_sign(unsigned_apk, output_apk, keystore, build_tools_version=None):
+    """
+    Runs zipalign, then apksigner (v1-v3 schemes as apksigner decides from minSdk).
+
+    Args:
+        unsigned_apk (str): Output of patch_apk.
+        output_apk (str): Final signed APK.
+        keystore (dict): {"path", "password", "alias", "key_password"}.
+        build_tools_version (str, optional): Preferred build-tools version.
+
+    Raises:
+        subprocess.CalledProcessError: If zipalign or apksigner fails.
+    """
+    aligned_apk = unsigned_apk + ".aligned"
+    try:
+        # -p page-aligns uncompressed .so files so they can be mmap'd straight from the APK.
+        subprocess.run([find_build_tool("zipalign", build_tools_version), "-p", "-f", "4", unsigned_apk, aligned_apk],
+                       check=True, capture_output=True, text=True)
+        print("  [Reskin] ✅ zipalign done.")
+
+        # Passwords go through the environment so they do not show up in the process list.
+        env = dict(os.environ, APPIZER_KS_PASS=str(keystore["password"]), APPIZER_KEY_PASS=str(keystore["key_password"]))
+        subprocess.run([
+            find_build_tool("apksigner", build_tools_version), "sign",
+            "--ks", keystore["path"],
+            "--ks-pass", "env:APPIZER_KS_PASS",
+            "--ks-key-alias", keystore["alias"],
+            "--key-pass", "env:APPIZER_KEY_PASS",
+            "--out", output_apk,
+            aligned_apk,
+        ], check=True, capture_output=True, text=True, env=env)
+        print(f"  [Reskin] ✅ Signed {output_apk}")
+    finally:
+        if os.path.exists(aligned_apk):
+            os.remove(aligned_apk)
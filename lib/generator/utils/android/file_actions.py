@@ -37,10 +37,8 @@ def move_java_sources(base_android_src_path, old_package_name, new_package_name)
         print(f"  [file_ops] Error creating target Java directory {new_java_dir}: {e}")
         raise # Re-raise if target cannot be created
 
-    java_files_to_move = [
-        "MainActivity.java",
-        "SplashActivity.java",
-    ]
+    # Every template class lives in the same package (MainActivity, SplashActivity, AppConfig, ...)
+    java_files_to_move = sorted(name for name in os.listdir(old_java_dir) if name.endswith(".java"))
 
     moved_any_file = False
     for file_name in java_files_to_move:
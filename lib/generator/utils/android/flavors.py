@@ -0,0 +1,99 @@
+# generator/utils/android/flavors.py
+import os
+import re
+from html import escape
+
+# Gradle flavor names become source-set dirs and task names (assembleAcmeRelease), so keep them identifier-like.
+FLAVOR_NAME_PATTERN = re.compile(r"^[a-z][a-zA-Z0-9_]*$")
+FLAVOR_DIMENSION = "brand"
+
+def validate_flavors(flavors):
+    """
+    Checks the `flavors` config section.
+
+    Returns:
+        list: Error messages. Empty if the section is valid.
+    """
+    errors = []
+    if not isinstance(flavors, dict):
+        return ["'flavors' must be a mapping of flavor name -> settings."]
+    for name, settings in flavors.items():
+        if not FLAVOR_NAME_PATTERN.match(str(name)):
+            errors.append(f"Flavor name '{name}' must start with a lowercase letter and contain only letters, digits or '_'.")
+        if not isinstance(settings, dict):
+            errors.append(f"Flavor '{name}' must be a mapping.")
+        elif not settings.get("package_name"):
+            errors.append(f"Flavor '{name}' needs a package_name (its applicationId).")
+    return errors
+
+def _groovy_string(value):
+    """Single-quoted Groovy literal (no ${} interpolation)."""
+    return "'" + str(value).replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+def render_product_flavors(flavors, default_url):
+    """
+    Renders the `flavorDimensions` + `productFlavors` block for app/build.gradle.
+
+    Args:
+        flavors (dict): {flavor_name: {"package_name": ..., "url": ..., ...}}
+        default_url (str): URL used by flavors that do not set their own.
+
+    Returns:
+        str: Groovy code, or an empty string when there are no flavors.
+    """
+    if not flavors:
+        return ""
+    lines = [f"flavorDimensions {_groovy_string(FLAVOR_DIMENSION)}", "    productFlavors {"]
+    for name in sorted(flavors):
+        settings = flavors[name]
+        start_url_literal = _groovy_string('"' + settings.get("url", default_url) + '"')
+        lines.append(f"        {name} {{")
+        lines.append(f"            dimension {_groovy_string(FLAVOR_DIMENSION)}")
+        lines.append(f"            applicationId {_groovy_string(settings['package_name'])}")
+        lines.append(f"            buildConfigField 'String', 'START_URL', {start_url_literal}")
+        if settings.get("version_name_suffix"):
+            lines.append(f"            versionNameSuffix {_groovy_string(settings['version_name_suffix'])}")
+        lines.append("        }")
+    lines.append("    }")
+    return "\n".join(lines)
+
+def _android_string(value):
+    """Escapes a value for use inside a <string> resource."""
+    return escape(str(value), quote=False).replace("'", "\\'").replace('"', '\\"')
+
+def write_flavor_resources(flavors, android_app_src_dir, defaults):
+    """
+    Writes per-flavor value resources (app name and colors) into app/src/<flavor>/res/values.
+    Gradle merges these over src/main, so each variant gets its own branding from one build.
+
+    Args:
+        flavors (dict): The `flavors` config section.
+        android_app_src_dir (str): Path to the app module's 'src' directory.
+        defaults (dict): Fallbacks for app_name, theme_color, splash_background_color, splash_text_color.
+    """
+    for name in sorted(flavors):
+        settings = flavors[name]
+        values_dir = os.path.join(android_app_src_dir, name, "res", "values")
+        os.makedirs(values_dir, exist_ok=True)
+
+        app_name = settings.get("app_name", defaults["app_name"])
+        with open(os.path.join(values_dir, "strings.xml"), "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n<resources>\n')
+            f.write(f'    <string name="app_name">{_android_string(app_name)}</string>\n')
+            f.write("</resources>\n")
+
+        colors = {
+            "app_theme_color": settings.get("theme_color", defaults["theme_color"]),
+            "splash_background": settings.get("splash_background_color", defaults["splash_background_color"]),
+            "splash_text_color": settings.get("splash_text_color", defaults["splash_text_color"]),
+        }
+        with open(os.path.join(values_dir, "colors.xml"), "w", encoding="utf-8") as f:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n<resources>\n')
+            for color_name, color_value in colors.items():
+                f.write(f'    <color name="{color_name}">{escape(str(color_value), quote=False)}</color>\n')
+            f.write("</resources>\n")
+        print(f"  [Flavors] ✅ Wrote resources for flavor '{name}' ({settings['package_name']}).")
+
+def flavor_res_path(android_app_src_dir, flavor_name):
+    """Path to a flavor's 'res' dir (e.g., app/src/acme/res)."""
+    return os.path.join(android_app_src_dir, flavor_name, "res")
@@ -0,0 +1,133 @@
+# generator/utils/android/gradle_properties.py
+import os
+
+# Env var set by whatever runs several builds side by side (e.g., a build farm worker); wins over the config.
+BUILD_CONCURRENCY_ENV = "APPIZER_BUILD_CONCURRENCY"
+
+# cgroup v1 reports "no limit" as a huge page-aligned number instead of "max".
+CGROUP_V1_UNLIMITED_BYTES = 1 << 60
+
+# Below this much memory per build a separate Kotlin daemon costs more than it saves.
+KOTLIN_DAEMON_MIN_MEMORY_MB = 3072
+
+def _read_text(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def detect_cpu_limit(cgroup_root="/sys/fs/cgroup"):
+    """
+    Returns the CPUs this container may use: the cgroup CFS quota if one is set,
+    else the CPUs in this process's affinity mask.
+
+    Returns:
+        tuple: (cpus (float), source (str))
+    """
+    cpu_max = _read_text(os.path.join(cgroup_root, "cpu.max")) # cgroup v2: "<quota> <period>" or "max <period>"
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period), "cgroup v2"
+    quota = _read_text(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) # cgroup v1, -1 = unlimited
+    period = _read_text(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us"))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period), "cgroup v1"
+    try:
+        return float(len(os.sched_getaffinity(0))), "affinity"
+    except AttributeError:
+        return float(os.cpu_count() or 1), "cpu_count"
+
+def detect_memory_limit_mb(cgroup_root="/sys/fs/cgroup"):
+    """
+    Returns the memory this container may use: the cgroup limit if one is set, else physical RAM.
+
+    Returns:
+        tuple: (memory_mb (int), source (str))
+    """
+    memory_max = _read_text(os.path.join(cgroup_root, "memory.max")) # cgroup v2
+    if memory_max and memory_max != "max":
+        return int(memory_max) // (1024 * 1024), "cgroup v2"
+    limit = _read_text(os.path.join(cgroup_root, "memory", "memory.limit_in_bytes")) # cgroup v1
+    if limit and int(limit) < CGROUP_V1_UNLIMITED_BYTES:
+        return int(limit) // (1024 * 1024), "cgroup v1"
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024), "physical"
+
+def resolve_concurrency(build_config):
+    """Number of builds sharing this container's limits: $APPIZER_BUILD_CONCURRENCY, else build.concurrency."""
+    value = os.environ.get(BUILD_CONCURRENCY_ENV) or build_config.get("concurrency", 1)
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        print(f"  [GradleProps] ⚠️ Invalid build concurrency '{value}'. Using 1.")
+        return 1
+
+def compute_gradle_properties(cpus, memory_mb, concurrency=1, configuration_cache=True, overrides=None):
+    """
+    Sizes Gradle for one build's share of the container.
+
+    Memory split per build: ~50% Gradle daemon heap, ~25% Kotlin daemon (when there is room for one),
+    the rest for metaspace, aapt2/worker processes and the OS page cache.
+
+    Args:
+        cpus (float): CPUs available to the container.
+        memory_mb (int): Memory available to the container.
+        concurrency (int): Builds expected to run at the same time.
+        configuration_cache (bool): Enable Gradle's configuration cache.
+        overrides (dict, optional): Properties that replace computed ones (the per-build `gradle_properties`).
+
+    Returns:
+        dict: {property: value} in file order.
+    """
+    build_cpus = max(1, int(cpus // concurrency))
+    build_memory_mb = max(1024, memory_mb // concurrency)
+    heap_mb = min(8192, max(512, build_memory_mb // 2))
+    metaspace_mb = 384 if build_memory_mb < 2048 else 512
+
+    properties = {
+        "org.gradle.jvmargs": f"-Xmx{heap_mb}m -XX:MaxMetaspaceSize={metaspace_mb}m -XX:+UseParallelGC -Dfile.encoding=UTF-8",
+        "org.gradle.workers.max": build_cpus,
+        "org.gradle.parallel": build_cpus > 1,
+        "org.gradle.caching": True,
+        "org.gradle.configuration-cache": bool(configuration_cache),
+    }
+    if build_memory_mb >= KOTLIN_DAEMON_MIN_MEMORY_MB:
+        properties["kotlin.daemon.jvmargs"] = f"-Xmx{min(4096, build_memory_mb // 4)}m"
+    else:
+        properties["kotlin.compiler.execution.strategy"] = "in-process" # Compile inside the Gradle daemon's heap
+    properties.update(overrides or {})
+    return properties
+
+def render_gradle_properties(properties):
+    """Formats properties as 'key=value' lines (booleans lowercased)."""
+    lines = []
+    for key, value in properties.items():
+        if isinstance(value, bool):
+            value = str(value).lower()
+        lines.append(f"{key}={value}")
+    return "\n".join(lines)
+
+def generate_gradle_performance_properties(build_config, cgroup_root="/sys/fs/cgroup"):
+    """
+    Detects this container's limits and renders the Gradle performance block for gradle.properties.
+
+    Args:
+        build_config (dict): The Android `build` config section.
+        cgroup_root (str): Where cgroup files are mounted.
+
+    Returns:
+        str: The rendered 'key=value' lines.
+    """
+    cpus, cpu_source = detect_cpu_limit(cgroup_root)
+    memory_mb, memory_source = detect_memory_limit_mb(cgroup_root)
+    concurrency = resolve_concurrency(build_config)
+    properties = compute_gradle_properties(
+        cpus, memory_mb, concurrency,
+        build_config.get("configuration_cache", True),
+        build_config.get("gradle_properties") or {},
+    )
+    print(f"  [GradleProps] Detected {cpus:g} CPU(s) ({cpu_source}) and {memory_mb} MB ({memory_source}); "
+          f"sizing for {concurrency} concurrent build(s): workers={properties['org.gradle.workers.max']}, "
+          f"jvmargs='{properties['org.gradle.jvmargs']}'.")
+    return render_gradle_properties(properties)
@@ -0,0 +1,104 @@
+# generator/utils/android/image_formats.py
+import io
+import os
+
+from utils.reproducible import PNG_COMPRESS_LEVEL
+
+IMAGE_FORMATS = ("png", "webp", "webp_lossless")
+IMAGE_EXTENSIONS = (".png", ".webp", ".jpg", ".jpeg")
+
+# WebP with transparency (launcher icons, most splash images) decodes on API 18+; below that PNG is kept.
+WEBP_MIN_SDK = 18
+# From API 26 the launcher always uses the adaptive icon, so per-density legacy bitmaps are dead weight.
+ADAPTIVE_ICON_MIN_SDK = 26
+DEFAULT_WEBP_QUALITY = 90
+
+def resource_image_options(config):
+    """
+    Image output settings for the generated Android resources, from `resources` and `build.min_sdk_version`.
+
+    Returns:
+        dict: {"format": "png"|"webp"|"webp_lossless", "quality": int, "adaptive_icon": bool, "min_sdk": int}
+    """
+    resources_config = config.get("resources") or {}
+    min_sdk = int((config.get("build") or {}).get("min_sdk_version", 21))
+    image_format = resources_config.get("image_format", "png")
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unknown resources.image_format '{image_format}'. Use one of {', '.join(IMAGE_FORMATS)}.")
+    if image_format != "png" and min_sdk < WEBP_MIN_SDK:
+        print(f"  [Resource Gen] ⚠️ WebP resources need min_sdk_version >= {WEBP_MIN_SDK} (is {min_sdk}); writing PNG instead.")
+        image_format = "png"
+    return {
+        "format": image_format,
+        "quality": int(resources_config.get("webp_quality", DEFAULT_WEBP_QUALITY)),
+        "adaptive_icon": bool(resources_config.get("adaptive_icon", True)),
+        "min_sdk": min_sdk,
+    }
+
+def encode_image(image, image_format, quality=DEFAULT_WEBP_QUALITY):
+    """
+    Encodes `image` with fixed settings and no metadata from the source file (same pixels, same bytes).
+
+    Returns:
+        bytes: The encoded image.
+    """
+    image = image.copy()
+    image.info = {}
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, format="PNG", optimize=False, compress_level=PNG_COMPRESS_LEVEL)
+    elif image_format == "webp_lossless":
+        image.save(buffer, format="WEBP", lossless=True, quality=100, method=6)
+    else:
+        image.save(buffer, format="WEBP", quality=quality, method=6)
+    return buffer.getvalue()
+
+def remove_image_variants(path_stem):
+    """Removes `<path_stem>.png/.webp/.jpg`: aapt2 rejects two files for one resource name."""
+    for extension in IMAGE_EXTENSIONS:
+        if os.path.exists(path_stem + extension):
+            os.remove(path_stem + extension)
+
+class ResourceSizeReport:
+    """Bytes per generated image as PNG and in the configured format, printed once the resources are written."""
+
+    def __init__(self, image_format):
+        self.image_format = image_format
+        self.rows = []
+
+    def add(self, name, png_bytes, written_format, written_bytes):
+        self.rows.append((name, png_bytes, written_format, written_bytes))
+
+    def print_report(self):
+        if not self.rows:
+            return
+        png_total = sum(row[1] for row in self.rows)
+        written_total = sum(row[3] for row in self.rows)
+        print(f"  [Resource Gen] Image size report ({self.image_format}):")
+        for name, png_bytes, written_format, written_bytes in self.rows:
+            print(f"  [Resource Gen]   {name}: {png_bytes} B as PNG -> {written_bytes} B as {written_format}")
+        saved = png_total - written_total
+        print(f"  [Resource Gen] {len(self.rows)} image(s): {png_total} B as PNG, {written_total} B written "
+              f"({saved} B, {saved * 100 // max(1, png_total)}% saved).")
+
+def write_image(image, path_stem, options, report=None, report_name=None):
+    """
+    Writes `image` as `<path_stem>.png` or `.webp` per `options` (see resource_image_options), replacing
+    any other format of the same resource. A WebP that comes out larger than the PNG is not used.
+
+    Returns:
+        str: The path written.
+    """
+    png_data = encode_image(image, "png")
+    written_format, data = "png", png_data
+    if options["format"] != "png":
+        webp_data = encode_image(image, options["format"], options["quality"])
+        if len(webp_data) < len(png_data):
+            written_format, data = options["format"], webp_data
+    remove_image_variants(path_stem)
+    path = path_stem + (".png" if written_format == "png" else ".webp")
+    with open(path, "wb") as f:
+        f.write(data)
+    if report is not None:
+        report.add(report_name or os.path.basename(path_stem), len(png_data), written_format, len(data))
+    return path
@@ -1,9 +1,14 @@
 # android/utils/logo.py
 import os
-from PIL import Image, ImageDraw, ImageFont # Pillow for image generation
-import requests
-from io import BytesIO
+import glob
 import math
+import shutil
+from contextlib import nullcontext
+
+from utils.scratch import job_scratch
+from utils.remote_cache import fingerprint
+from utils.metrics import ICON_GENERATION_SECONDS
+from utils.android.image_formats import ADAPTIVE_ICON_MIN_SDK, ResourceSizeReport, write_image
 
 # Define Android mipmap densities and their corresponding sizes for a 48dp icon
 ANDROID_ICON_DENSITIES = {
@@ -14,24 +19,111 @@ ANDROID_ICON_DENSITIES = {
     "xxxhdpi": 192 # 4x
 }
 
-def generate_launcher_icons(image_path, android_res_path, theme_color="#FFFFFF"):
+# Adaptive icon layers are 108dp; the launcher mask always shows the inner 66dp, so logos are fitted into that.
+ADAPTIVE_ICON_DP = 108
+ADAPTIVE_SAFE_ZONE_DP = 66
+
+# Without a logo: a flat colour background and a vector glyph (a browser window), no bitmaps at all.
+DEFAULT_ICON_BACKGROUND = "#607D8B" # Material Grey 500
+DEFAULT_ICON_FOREGROUND = """<?xml version="1.0" encoding="utf-8"?>
+<vector xmlns:android="http://schemas.android.com/apk/res/android"
+    android:width="108dp"
+    android:height="108dp"
+    android:viewportWidth="108"
+    android:viewportHeight="108">
+    <path
+        android:fillColor="#FFFFFFFF"
+        android:fillType="evenOdd"
+        android:pathData="M34,38 H74 V70 H34 Z M37,47 H71 V67 H37 Z" />
+</vector>
+"""
+
+ADAPTIVE_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@color/ic_launcher_background" />
+    <foreground android:drawable="{foreground}" />
+</adaptive-icon>
+"""
+
+# API 21-25 launchers get the same two layers as one drawable (square, and a circle for the round icon).
+LEGACY_LAYERED_ICON_XML = """<?xml version="1.0" encoding="utf-8"?>
+<layer-list xmlns:android="http://schemas.android.com/apk/res/android">
+    <item>
+        <shape android:shape="{shape}">
+            <solid android:color="@color/ic_launcher_background" />
+        </shape>
+    </item>
+    <item android:drawable="@drawable/ic_launcher_foreground" />
+</layer-list>
+"""
+
+ICON_BACKGROUND_XML = """<?xml version="1.0" encoding="utf-8"?>
+<resources>
+    <color name="ic_launcher_background">{color}</color>
+</resources>
+"""
+
+def _write_text(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def remove_launcher_icons(android_res_path):
+    """
+    Removes launcher icon resources written by an earlier run (any format), so switching between a logo
+    and the default icon, or between PNG and WebP, never leaves a stale or duplicate resource behind.
+    """
+    patterns = ("mipmap*/ic_launcher*", "drawable/ic_launcher_foreground.*", "values/ic_launcher_background.xml")
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(android_res_path, pattern)):
+            os.remove(path)
+
+def _write_default_icons(android_res_path, options):
+    """The logo-less icon as colour and vector drawables: a few hundred bytes instead of ten bitmaps."""
+    _write_text(os.path.join(android_res_path, "values", "ic_launcher_background.xml"), ICON_BACKGROUND_XML.format(color=DEFAULT_ICON_BACKGROUND))
+    _write_text(os.path.join(android_res_path, "drawable", "ic_launcher_foreground.xml"), DEFAULT_ICON_FOREGROUND)
+    for name in ("ic_launcher", "ic_launcher_round"):
+        _write_text(os.path.join(android_res_path, "mipmap-anydpi-v26", f"{name}.xml"),
+                    ADAPTIVE_ICON_XML.format(foreground="@drawable/ic_launcher_foreground"))
+        if options["min_sdk"] < ADAPTIVE_ICON_MIN_SDK:
+            _write_text(os.path.join(android_res_path, "mipmap", f"{name}.xml"),
+                        LEGACY_LAYERED_ICON_XML.format(shape="oval" if name == "ic_launcher_round" else "rectangle"))
+    print("  [Resource Gen] Created default launcher icon as colour + vector drawables (no bitmaps).")
+
+def generate_launcher_icons(image_path, android_res_path, theme_color="#FFFFFF", options=None, report=None, scratch=None):
     """
     Generates Android launcher icons from a source image or creates defaults.
 
     Args:
         image_path (str): Path to the source image (local file or URL), or empty string to generate default.
         android_res_path (str): Path to the Android project's 'res' directory.
-        theme_color (str): The theme color for adaptive icons background (if applicable).
+        theme_color (str): Background colour of the adaptive icon (a colour resource, not a bitmap).
+        options (dict, optional): Output settings from image_formats.resource_image_options (PNG, adaptive icon, min SDK 21 by default).
+        report (ResourceSizeReport, optional): Collects PNG vs. written sizes of every bitmap.
+        scratch (ScratchSpace, optional): The job's scratch space for a remote logo (see utils/scratch.py).
     """
+    options = options or {"format": "png", "quality": 90, "adaptive_icon": True, "min_sdk": 21}
     print(f"  [Resource Gen] Generating launcher icons from: '{image_path}'...")
+    remove_launcher_icons(android_res_path)
+    if not image_path and options["adaptive_icon"]:
+        _write_default_icons(android_res_path, options)
+        return
+
+    # Pillow is imported here rather than at module load, so runs that skip the icons stage do not pay for it.
+    from PIL import Image, ImageDraw, ImageFont
 
     base_image = None
     if image_path:
+        owned_scratch = None
+        downloaded_path = None
         try:
             if image_path.startswith("http"):
-                response = requests.get(image_path)
-                response.raise_for_status()
-                base_image = Image.open(BytesIO(response.content)).convert("RGBA")
+                # Downloaded into the job's own scratch dir, within its quota, like remote splash images
+                if scratch is None:
+                    scratch = owned_scratch = job_scratch("logo")
+                downloaded_path = scratch.download(image_path, "downloaded_logo")
+                with Image.open(downloaded_path) as downloaded:
+                    base_image = downloaded.convert("RGBA")
                 print(f"  [Resource Gen] Downloaded image from URL: {image_path}")
             else:
                 base_image = Image.open(image_path).convert("RGBA")
@@ -39,6 +131,15 @@ def generate_launcher_icons(image_path, android_res_path, theme_color="#FFFFFF")
         except Exception as e:
             print(f"  [Resource Gen] ⚠️ Warning: Could not load image from '{image_path}': {e}. Generating default icons instead.")
             base_image = None # Fallback to default generation
+        finally:
+            if downloaded_path and os.path.exists(downloaded_path):
+                os.remove(downloaded_path)
+            if owned_scratch is not None:
+                owned_scratch.cleanup()
+
+    if base_image is None and options["adaptive_icon"]:
+        _write_default_icons(android_res_path, options)
+        return
 
     if base_image is None:
         print("  [Resource Gen] Creating default square launcher icons.")
@@ -49,7 +150,7 @@ def generate_launcher_icons(image_path, android_res_path, theme_color="#FFFFFF")
         draw = ImageDraw.Draw(base_image)
         # Draw a simple shape or text
         # Dark grey background with white text
-        draw.rectangle([0, 0, default_size, default_size], fill="#607D8B") # Material Grey 500
+        draw.rectangle([0, 0, default_size, default_size], fill=DEFAULT_ICON_BACKGROUND)
         try:
             # Try to load a default font, fall back if not found
             font_path = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" # Common Linux path
@@ -68,27 +169,91 @@ def generate_launcher_icons(image_path, android_res_path, theme_color="#FFFFFF")
         text_y = (default_size - text_height) / 2
         draw.text((text_x, text_y), text, fill=(255, 255, 255), font=font) # White text
 
+    legacy_icons = not options["adaptive_icon"] or options["min_sdk"] < ADAPTIVE_ICON_MIN_SDK
     # Generate icons for each density
     for density, size_dp in ANDROID_ICON_DENSITIES.items():
         mipmap_dir = os.path.join(android_res_path, f"mipmap-{density}")
         os.makedirs(mipmap_dir, exist_ok=True)
 
-        # Scale for square icon (ic_launcher.png)
-        square_icon = base_image.resize((size_dp, size_dp), Image.Resampling.LANCZOS)
-        square_icon.save(os.path.join(mipmap_dir, "ic_launcher.png"))
-        print(f"  [Resource Gen] Created {density}/ic_launcher.png ({size_dp}x{size_dp}).")
-
-        # Scale for round icon (ic_launcher_round.png)
-        # Create a circle mask
-        round_icon = Image.new("RGBA", (size_dp, size_dp), (0, 0, 0, 0))
-        mask = Image.new("L", (size_dp, size_dp), 0)
-        mask_draw = ImageDraw.Draw(mask)
-        mask_draw.ellipse((0, 0, size_dp, size_dp), fill=255)
-        
-        # Apply the mask
-        round_icon.paste(square_icon, (0, 0), mask)
-        round_icon.save(os.path.join(mipmap_dir, "ic_launcher_round.png"))
-        print(f"  [Resource Gen] Created {density}/ic_launcher_round.png ({size_dp}x{size_dp}, round).")
+        if legacy_icons:
+            # Scale for square icon (ic_launcher)
+            square_icon = base_image.resize((size_dp, size_dp), Image.Resampling.LANCZOS)
+            written = write_image(square_icon, os.path.join(mipmap_dir, "ic_launcher"), options, report, f"mipmap-{density}/ic_launcher")
+            print(f"  [Resource Gen] Created {density}/{os.path.basename(written)} ({size_dp}x{size_dp}).")
+
+            # Scale for round icon (ic_launcher_round)
+            # Create a circle mask
+            round_icon = Image.new("RGBA", (size_dp, size_dp), (0, 0, 0, 0))
+            mask = Image.new("L", (size_dp, size_dp), 0)
+            mask_draw = ImageDraw.Draw(mask)
+            mask_draw.ellipse((0, 0, size_dp, size_dp), fill=255)
+
+            # Apply the mask
+            round_icon.paste(square_icon, (0, 0), mask)
+            written = write_image(round_icon, os.path.join(mipmap_dir, "ic_launcher_round"), options, report, f"mipmap-{density}/ic_launcher_round")
+            print(f"  [Resource Gen] Created {density}/{os.path.basename(written)} ({size_dp}x{size_dp}, round).")
+
+        if options["adaptive_icon"]:
+            # Foreground layer: the logo centred in the safe zone of a transparent 108dp canvas
+            canvas_px = size_dp * ADAPTIVE_ICON_DP // 48
+            logo_px = size_dp * ADAPTIVE_SAFE_ZONE_DP // 48
+            logo = base_image.copy()
+            logo.thumbnail((logo_px, logo_px), Image.Resampling.LANCZOS)
+            foreground = Image.new("RGBA", (canvas_px, canvas_px), (0, 0, 0, 0))
+            foreground.paste(logo, ((canvas_px - logo.width) // 2, (canvas_px - logo.height) // 2), logo)
+            written = write_image(foreground, os.path.join(mipmap_dir, "ic_launcher_foreground"), options, report,
+                                  f"mipmap-{density}/ic_launcher_foreground")
+            print(f"  [Resource Gen] Created {density}/{os.path.basename(written)} ({canvas_px}x{canvas_px}, adaptive foreground).")
+
+    if options["adaptive_icon"]:
+        _write_text(os.path.join(android_res_path, "values", "ic_launcher_background.xml"), ICON_BACKGROUND_XML.format(color=theme_color))
+        for name in ("ic_launcher", "ic_launcher_round"):
+            _write_text(os.path.join(android_res_path, "mipmap-anydpi-v26", f"{name}.xml"),
+                        ADAPTIVE_ICON_XML.format(foreground="@mipmap/ic_launcher_foreground"))
+        print(f"  [Resource Gen] Created adaptive icon (background {theme_color}){'' if legacy_icons else '; no legacy bitmaps needed for min SDK ' + str(options['min_sdk'])}.")
 
     print("  [Resource Gen] Launcher icon generation complete.")
 
+
+def launcher_icons_cache_key(image_path, theme_color, options=None):
+    """
+    Cache key for one icon set: the logo's content, the theme color, the output options, the densities
+    and this module itself (so changes to the drawing code invalidate old sets). None for remote logos,
+    whose content is only known after downloading them.
+    """
+    if image_path.startswith("http"):
+        return None
+    logo_part = ("path", image_path) if image_path else "default"
+    return fingerprint("android-launcher-icons", logo_part, theme_color, options or {}, ANDROID_ICON_DENSITIES,
+                       ("path", os.path.abspath(__file__)))
+
+def generate_launcher_icons_cached(build_cache, image_path, android_res_path, theme_color="#FFFFFF", options=None, report=None,
+                                   scratch=None):
+    """
+    Same as generate_launcher_icons, but restores the icon set from `build_cache`
+    (see utils/remote_cache.create_build_cache) when another build already produced it.
+    The set is staged in the job's scratch space (`scratch`, see utils/scratch.py).
+
+    Returns:
+        bool: True if the icons came from the cache.
+    """
+    key = launcher_icons_cache_key(image_path, theme_color, options) if build_cache else None
+    if key is None:
+        with ICON_GENERATION_SECONDS.labels(source="generated").time():
+            generate_launcher_icons(image_path, android_res_path, theme_color, options, report, scratch)
+        return False
+    with (job_scratch("icons") if scratch is None else nullcontext(scratch)) as job_space:
+        icons_dir = job_space.mkdtemp(prefix="icons-")
+        with ICON_GENERATION_SECONDS.labels(source="cache").time():
+            restored = build_cache.get_dir(key, icons_dir)
+        if restored:
+            print(f"  [Resource Gen] ✅ Restored launcher icons from the build cache ({key[:12]}).")
+        else:
+            with ICON_GENERATION_SECONDS.labels(source="generated").time():
+                generate_launcher_icons(image_path, icons_dir, theme_color, options, report, job_space)
+            build_cache.put_dir(key, icons_dir)
+        job_space.check_quota()
+        remove_launcher_icons(android_res_path)
+        shutil.copytree(icons_dir, android_res_path, dirs_exist_ok=True)
+        shutil.rmtree(icons_dir, ignore_errors=True)
+    return restored
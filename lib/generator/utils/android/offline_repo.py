@@ -0,0 +1,148 @@
+# generator/utils/android/offline_repo.py
+import os
+import shutil
+import pathlib
+
+# Set by entrypoint.sh -o (or the environment) to the pre-seeded file-based Maven repository.
+OFFLINE_REPO_ENV = "APPIZER_OFFLINE_MAVEN_REPO"
+OFFLINE_INIT_SCRIPT_NAME = "appizer-offline.init.gradle"
+
+# Gradle's dependency cache layout: files-2.1/<group>/<module>/<version>/<sha1>/<file>
+GRADLE_CACHE_FILES_DIR = os.path.join("caches", "modules-2", "files-2.1")
+
+# The Gradle wrapper's own distribution (gradle-x.y-bin.zip) is kept next to the modules, so an offline build
+# does not download it from services.gradle.org either.
+WRAPPER_DISTRIBUTIONS_DIR = "gradle-distributions"
+WRAPPER_PROPERTIES_PATH = os.path.join("gradle", "wrapper", "gradle-wrapper.properties")
+GRADLE_WRAPPER_DISTS_DIR = os.path.join("wrapper", "dists")
+
+# The repo is added before the template's own repositories, so every module resolves from it first;
+# together with --offline, remote repositories are never contacted.
+OFFLINE_INIT_SCRIPT_TEMPLATE = """// Generated by the appizer generator. Used with: ./gradlew --offline --init-script {script_name}
+def appizerOfflineRepo = {repo_literal}
+
+def addAppizerOfflineRepo = {{ handler ->
+    handler.maven {{
+        name = 'appizerOffline'
+        url = new File(appizerOfflineRepo).toURI()
+    }}
+}}
+
+gradle.beforeSettings {{ settings ->
+    addAppizerOfflineRepo(settings.pluginManagement.repositories)
+    addAppizerOfflineRepo(settings.dependencyResolutionManagement.repositories)
+}}
+
+gradle.allprojects {{ project ->
+    addAppizerOfflineRepo(project.buildscript.repositories)
+}}
+"""
+
+def resolve_offline_repo(build_config):
+    """The offline repo path from $APPIZER_OFFLINE_MAVEN_REPO or build.offline_maven_repo, or None."""
+    return os.environ.get(OFFLINE_REPO_ENV) or build_config.get("offline_maven_repo") or None
+
+def write_offline_init_script(android_project_root, repo_dir):
+    """
+    Writes the Gradle init script that points plugin, buildscript and dependency resolution at `repo_dir`.
+
+    Returns:
+        str: Path of the written init script.
+    """
+    if not os.path.isdir(repo_dir):
+        print(f"  [OfflineRepo] ⚠️ Offline Maven repo {repo_dir} does not exist yet; seed it with seed_maven_repo.py.")
+    script_path = os.path.join(android_project_root, OFFLINE_INIT_SCRIPT_NAME)
+    repo_literal = "'" + repo_dir.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    with open(script_path, "w", encoding="utf-8") as f:
+        f.write(OFFLINE_INIT_SCRIPT_TEMPLATE.format(script_name=OFFLINE_INIT_SCRIPT_NAME, repo_literal=repo_literal))
+    print(f"  [OfflineRepo] ✅ Wrote {OFFLINE_INIT_SCRIPT_NAME} (repository: {repo_dir})")
+    return script_path
+
+def point_wrapper_at_offline_distribution(android_project_root, repo_dir):
+    """
+    Rewrites the wrapper's distributionUrl to the copy of the same distribution in `repo_dir`, if there is one.
+
+    Returns:
+        bool: True if the wrapper now installs Gradle from `repo_dir`.
+    """
+    properties_path = os.path.join(android_project_root, WRAPPER_PROPERTIES_PATH)
+    if not os.path.exists(properties_path):
+        return False
+    with open(properties_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    for index, line in enumerate(lines):
+        if not line.startswith("distributionUrl="):
+            continue
+        distribution_name = line.split("=", 1)[1].replace("\\:", ":").rstrip("/").rsplit("/", 1)[-1]
+        local_path = os.path.join(repo_dir, WRAPPER_DISTRIBUTIONS_DIR, distribution_name)
+        if not os.path.isfile(local_path):
+            print(f"  [OfflineRepo] ⚠️ {distribution_name} is not in {repo_dir}; the wrapper will try to download it.")
+            return False
+        lines[index] = "distributionUrl=" + pathlib.Path(os.path.abspath(local_path)).as_uri().replace(":", "\\:")
+        with open(properties_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"  [OfflineRepo] ✅ Gradle wrapper installs {distribution_name} from {repo_dir}")
+        return True
+    return False
+
+def save_wrapper_distributions(gradle_user_home, repo_dir):
+    """
+    Copies the wrapper distributions a build downloaded (wrapper/dists/<name>/<hash>/<name>.zip) into `repo_dir`.
+
+    Returns:
+        int: Number of distributions added.
+    """
+    dists_dir = os.path.join(gradle_user_home, GRADLE_WRAPPER_DISTS_DIR)
+    added = 0
+    for root, _dirs, files in os.walk(dists_dir):
+        if len(os.path.relpath(root, dists_dir).split(os.sep)) != 2:
+            continue # Only <name>/<hash>/ holds the downloaded zip; the unpacked distribution sits next to it
+        for name in files:
+            dst_path = os.path.join(repo_dir, WRAPPER_DISTRIBUTIONS_DIR, name)
+            if name.endswith(".zip") and not os.path.exists(dst_path):
+                os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+                _link_or_copy(os.path.join(root, name), dst_path)
+                added += 1
+    return added
+
+def _link_or_copy(src_path, dst_path):
+    try:
+        os.link(src_path, dst_path)
+    except OSError:
+        shutil.copy2(src_path, dst_path) # Different filesystem (e.g., repo on a shared volume)
+
+def convert_gradle_cache(gradle_user_home, repo_dir):
+    """
+    Re-lays Gradle's module cache out as a file-based Maven repository
+    (<group/as/path>/<module>/<version>/<file>), including .pom and .module metadata, and keeps
+    the wrapper distributions the build downloaded (see save_wrapper_distributions).
+
+    Args:
+        gradle_user_home (str): GRADLE_USER_HOME of a build that resolved everything online.
+        repo_dir (str): Target repository directory (created if missing, merged into if present).
+
+    Returns:
+        int: Number of files added to the repository.
+    """
+    cache_dir = os.path.join(gradle_user_home, GRADLE_CACHE_FILES_DIR)
+    if not os.path.isdir(cache_dir):
+        raise FileNotFoundError(f"No Gradle module cache at {cache_dir}.")
+
+    added = 0
+    for group in sorted(os.listdir(cache_dir)):
+        group_dir = os.path.join(cache_dir, group)
+        for module in sorted(os.listdir(group_dir)):
+            module_dir = os.path.join(group_dir, module)
+            for version in sorted(os.listdir(module_dir)):
+                target_dir = os.path.join(repo_dir, *group.split("."), module, version)
+                os.makedirs(target_dir, exist_ok=True)
+                version_dir = os.path.join(module_dir, version)
+                for checksum_dir in os.listdir(version_dir):
+                    for name in os.listdir(os.path.join(version_dir, checksum_dir)):
+                        dst_path = os.path.join(target_dir, name)
+                        if not os.path.exists(dst_path):
+                            _link_or_copy(os.path.join(version_dir, checksum_dir, name), dst_path)
+                            added += 1
+    distributions = save_wrapper_distributions(gradle_user_home, repo_dir)
+    print(f"  [OfflineRepo] ✅ Added {added} file(s) and {distributions} Gradle distribution(s) from {gradle_user_home} to {repo_dir}")
+    return added + distributions
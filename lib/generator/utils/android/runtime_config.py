@@ -0,0 +1,58 @@
+# generator/utils/android/runtime_config.py
+import os
+import json
+
+# Read by AppConfig.java at startup; must match AppConfig.ASSET_NAME.
+RUNTIME_CONFIG_ASSET = "appizer-config.json"
+
+def build_runtime_config(config):
+    """
+    Collects the values AppConfig.java can override at runtime from the Android config.
+    Anything compiled into resources or the manifest (package name, app name, icons' names,
+    SDK levels, signing) is not included: changing those still needs a full Gradle build.
+
+    Args:
+        config (dict): The Android-specific configuration dictionary.
+
+    Returns:
+        dict: Flat {key: value} mapping, keys as read by AppConfig.get*().
+    """
+    webapp_config = config.get("webapp", {})
+    splash_config = config.get("splash", {})
+    return {
+        "url": config.get("url", "https://google.com"),
+        "enable_javascript": bool(webapp_config.get("enable_javascript", True)),
+        "allow_file_access": bool(webapp_config.get("allow_file_access", False)),
+        "fullscreen": bool(webapp_config.get("fullscreen", True)),
+        "user_agent": webapp_config.get("user_agent", ""),
+        "built_in_zoom_controls": bool(webapp_config.get("built_in_zoom_controls", False)),
+        "support_zoom": bool(webapp_config.get("support_zoom", False)),
+        "dom_storage": bool(webapp_config.get("dom_storage", True)),
+        "use_asset_loader": bool(webapp_config.get("use_asset_loader", True)),
+        "splash_type": splash_config.get("type", "image"),
+        "splash_content": splash_config.get("content", ""),
+        "splash_duration": int(splash_config.get("duration", 3000)),
+        "splash_mode": splash_config.get("mode", "preload"),
+        "splash_min_duration": int(splash_config.get("min_duration", 300)),
+        "splash_dismiss_on": splash_config.get("dismiss_on", "first_paint"),
+        "splash_background_color": splash_config.get("background_color", "#ffffff"),
+        "splash_text_color": splash_config.get("text_color", "#000000"),
+    }
+
+def write_runtime_config(assets_dir, config):
+    """
+    Writes the runtime config asset into an Android assets dir.
+
+    Args:
+        assets_dir (str): Target directory (e.g., 'app/src/main/assets' or a re-skin scratch dir).
+        config (dict): The Android-specific configuration dictionary.
+
+    Returns:
+        str: Path of the written file.
+    """
+    os.makedirs(assets_dir, exist_ok=True)
+    output_path = os.path.join(assets_dir, RUNTIME_CONFIG_ASSET)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(build_runtime_config(config), f, indent=2, sort_keys=True)
+    print(f"  [RuntimeConfig] ✅ Wrote {RUNTIME_CONFIG_ASSET} to {assets_dir}")
+    return output_path
@@ -0,0 +1,116 @@
+# generator/utils/app_config.py
+import os
+import json
+import fnmatch
+
+from utils.main import stream_replace_in_file
+from utils.precache import verify_synced_bundle, save_precache_files
+
+APP_CONFIG_JSON_NAME = "app-config.json"
+APP_CONFIG_JS_NAME = "app-config.js"
+
+# Written into the asset root by the generator; sync_directory must not delete them.
+APP_CONFIG_ASSET_NAMES = {APP_CONFIG_JSON_NAME, APP_CONFIG_JS_NAME}
+
+APP_CONFIG_JS_TEMPLATE = """// Generated by the appizer generator. Load before your bundle: <script src="{js_name}"></script>
+window.APP_CONFIG = Object.freeze({values});
+"""
+
+def build_app_config(config, platform_name):
+    """
+    Collects the values the webapp can read at runtime: a few build facts plus the user's `app_config` section.
+
+    Args:
+        config (dict): The platform-resolved config (see resolve_platform_config).
+        platform_name (str): e.g., "android" or "windows".
+
+    Returns:
+        dict: The runtime config; `app_config` keys win over the built-in ones.
+    """
+    values = {
+        "platform": platform_name,
+        "app_name": config.get("app_name", ""),
+        "theme_color": config.get("webapp", {}).get("theme_color", ""),
+    }
+    values.update(config.get("app_config") or {})
+    return values
+
+def write_app_config_files(assets_dir, app_config):
+    """Writes app-config.json and app-config.js (sets window.APP_CONFIG) into `assets_dir`."""
+    os.makedirs(assets_dir, exist_ok=True)
+    with open(os.path.join(assets_dir, APP_CONFIG_JSON_NAME), "w", encoding="utf-8") as f:
+        json.dump(app_config, f, indent=2, sort_keys=True)
+    with open(os.path.join(assets_dir, APP_CONFIG_JS_NAME), "w", encoding="utf-8") as f:
+        f.write(APP_CONFIG_JS_TEMPLATE.format(js_name=APP_CONFIG_JS_NAME, values=json.dumps(app_config, indent=2, sort_keys=True)))
+    print(f"  [app_config] ✅ Wrote {APP_CONFIG_JSON_NAME} and {APP_CONFIG_JS_NAME} ({len(app_config)} key(s)) to {assets_dir}")
+
+def asset_token_replacements(app_config, token_format="__{key}__"):
+    """
+    Maps each app_config key to its token, e.g. api_base_url -> b"__API_BASE_URL__".
+    Strings are inserted as-is (tokens usually sit inside string literals); other values as JSON.
+    """
+    replacements = {}
+    for key, value in app_config.items():
+        token = token_format.format(key=str(key).upper()).encode("utf-8")
+        text = value if isinstance(value, str) else json.dumps(value)
+        replacements[token] = text.encode("utf-8")
+    return replacements
+
+def match_asset_globs(assets_dir, globs):
+    """Returns the relative paths (with '/') under `assets_dir` matching any of `globs`, sorted."""
+    matched = []
+    for root, dirs, files in os.walk(assets_dir):
+        dirs.sort()
+        for name in sorted(files):
+            rel_path = os.path.relpath(os.path.join(root, name), assets_dir).replace(os.sep, "/")
+            if rel_path not in APP_CONFIG_ASSET_NAMES and any(fnmatch.fnmatch(rel_path, pattern) for pattern in globs):
+                matched.append(rel_path)
+    return matched
+
+def substitute_asset_tokens(assets_dir, app_config, asset_tokens_config):
+    """
+    Streams app_config values into the asset files listed by `asset_tokens.globs` (opt-in).
+
+    Args:
+        assets_dir (str): The platform asset root holding the synced webapp.
+        app_config (dict): Output of build_app_config.
+        asset_tokens_config (dict): {"enabled": bool, "globs": [...], "token_format": "__{key}__"}.
+
+    Returns:
+        list: Relative paths of the files that changed.
+    """
+    if not asset_tokens_config.get("enabled", False):
+        return []
+    replacements = asset_token_replacements(app_config, asset_tokens_config.get("token_format", "__{key}__"))
+    changed = []
+    for rel_path in match_asset_globs(assets_dir, asset_tokens_config.get("globs") or []):
+        if stream_replace_in_file(os.path.join(assets_dir, rel_path), replacements):
+            changed.append(rel_path)
+    print(f"  [app_config] Token substitution updated {len(changed)} asset file(s).")
+    return changed
+
+def finalize_asset_root(config, platform_name, webapp_assets_dir, assets_dir):
+    """
+    Runs after the webapp was synced into a platform asset root: verifies the copy, writes the
+    runtime config files, applies opt-in token substitution, then writes the precache manifest
+    so it describes the files that actually ship.
+
+    Args:
+        config (dict): The platform-resolved config.
+        platform_name (str): e.g., "android" or "windows".
+        webapp_assets_dir (str): The user's webapp assets (source of truth).
+        assets_dir (str): The platform asset root the bundle was synced into.
+    """
+    webapp_config = config.get("webapp", {})
+    precache_enabled = webapp_config.get("precache_manifest", True)
+    # Verify before anything is rewritten, so the check compares against the untouched copy.
+    manifest = verify_synced_bundle(webapp_assets_dir, assets_dir) if precache_enabled else None
+
+    app_config = build_app_config(config, platform_name)
+    write_app_config_files(assets_dir, app_config)
+    changed = substitute_asset_tokens(assets_dir, app_config, config.get("asset_tokens") or {})
+
+    if precache_enabled:
+        # Files rewritten above get new hashes, so the manifest version (and the cache sw.js keeps) changes with them.
+        save_precache_files(assets_dir, manifest, webapp_config.get("service_worker", False),
+                            sorted(APP_CONFIG_ASSET_NAMES) + changed)
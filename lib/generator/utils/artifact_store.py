@@ -0,0 +1,151 @@
+# generator/utils/artifact_store.py
+import os
+import json
+import stat
+import time
+import zlib
+import struct
+import hashlib
+import tempfile
+
+# Written next to the artifacts in the output dir; build_server.py serves downloads from it.
+MANIFEST_NAME = "artifacts.json"
+CHUNK_SIZE = 1024 * 1024
+
+ZIP_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+ZIP_CENTRAL_HEADER = struct.Struct("<4sHHHHHHIIIHHHHHII")
+ZIP_END_RECORD = struct.Struct("<4sHHHHIIH")
+ZIP_MAX_OFFSET = 0xFFFFFFFF # Bundles stay below zip64 sizes
+
+class ArtifactError(Exception):
+    """An artifact could not be exported or bundled."""
+
+
+def _export_file(src_path, dest_path):
+    """
+    Copies `src_path` to `dest_path` and returns (sha256, crc32), computed in the same pass.
+    Never a hardlink: the next build in the same workspace may rewrite its outputs in place.
+    """
+    digest = hashlib.sha256()
+    crc = 0
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    if os.path.exists(dest_path) and os.path.samefile(src_path, dest_path):
+        # Already written into the output dir (e.g., by reskin.py): only record it
+        with open(src_path, "rb") as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+        return digest.hexdigest(), crc
+    with open(src_path, "rb") as src, open(dest_path, "wb") as dst:
+        for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            dst.write(chunk)
+    os.chmod(dest_path, stat.S_IMODE(os.stat(src_path).st_mode))
+    return digest.hexdigest(), crc
+
+def load_manifest(output_dir):
+    """The artifact records in `output_dir`, or [] when nothing was exported there."""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)["artifacts"]
+    except FileNotFoundError:
+        return []
+
+def export_artifacts(platform_name, output_dir, sources, metadata=None):
+    """
+    Exports build outputs into `output_dir` and records them in its manifest: per file the
+    relative path, size, SHA-256, CRC-32, mode and mtime, plus build metadata (app, version, ...).
+    A directory source (e.g., Wails' build/bin) is exported under its own name.
+
+    Args:
+        platform_name (str): Platform the artifacts belong to ('android', 'windows', ...).
+        output_dir (str): Destination; records of other platforms already there are kept.
+        sources (list): Files or directories to export.
+        metadata (dict, optional): Build metadata stored with each artifact.
+
+    Returns:
+        list: The new artifact records.
+
+    Raises:
+        ArtifactError: If a source does not exist.
+    """
+    files = []
+    for source in sources:
+        source = source.rstrip(os.sep)
+        if os.path.isfile(source):
+            files.append((source, os.path.basename(source)))
+        elif os.path.isdir(source):
+            parent = os.path.dirname(source)
+            for root, dirs, names in os.walk(source):
+                dirs.sort()
+                files.extend((os.path.join(root, name), os.path.relpath(os.path.join(root, name), parent).replace(os.sep, "/"))
+                             for name in sorted(names))
+        else:
+            raise ArtifactError(f"Artifact source {source} does not exist.")
+
+    records = []
+    for src_path, rel_path in files:
+        sha256, crc32 = _export_file(src_path, os.path.join(output_dir, *rel_path.split("/")))
+        file_stat = os.stat(src_path)
+        records.append({
+            "platform": platform_name,
+            "path": rel_path,
+            "size": file_stat.st_size,
+            "sha256": sha256,
+            "crc32": crc32,
+            "mode": stat.S_IMODE(file_stat.st_mode),
+            "mtime": int(file_stat.st_mtime),
+            "metadata": metadata or {},
+        })
+
+    new_paths = {record["path"] for record in records}
+    manifest = [record for record in load_manifest(output_dir) if record["path"] not in new_paths] + records
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, prefix=".artifacts-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"artifacts": manifest}, f, indent=2, sort_keys=True)
+    os.replace(temp_path, os.path.join(output_dir, MANIFEST_NAME))
+    return records
+
+
+def _dos_datetime(timestamp):
+    t = time.gmtime(max(timestamp, 315532800)) # DOS dates start in 1980
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+def zip_bundle(output_dir, records):
+    """
+    Lays out a STORED (uncompressed) zip of the given artifacts without writing it anywhere: the
+    headers come from the manifest (size, CRC-32, mode, mtime), so the bundle is byte-for-byte
+    deterministic and any byte range of it can be served again, with file data sent straight from disk.
+
+    Returns:
+        tuple: (segments, total size) where each segment is ("bytes", data) or ("file", path, size).
+
+    Raises:
+        ArtifactError: If the bundle would need zip64 (over 4 GB).
+    """
+    segments = []
+    central = []
+    offset = 0
+    for record in sorted(records, key=lambda record: record["path"]):
+        name = record["path"].encode("utf-8")
+        dos_time, dos_date = _dos_datetime(record["mtime"])
+        local = ZIP_LOCAL_HEADER.pack(b"PK\x03\x04", 20, 0x800, 0, dos_time, dos_date, record["crc32"],
+                                      record["size"], record["size"], len(name), 0) + name
+        central.append(ZIP_CENTRAL_HEADER.pack(b"PK\x01\x02", (3 << 8) | 20, 20, 0x800, 0, dos_time, dos_date, record["crc32"],
+                                               record["size"], record["size"], len(name), 0, 0, 0, 0,
+                                               (stat.S_IFREG | record["mode"]) << 16, offset) + name)
+        segments.append(("bytes", local))
+        segments.append(("file", os.path.join(output_dir, *record["path"].split("/")), record["size"]))
+        offset += len(local) + record["size"]
+        if offset > ZIP_MAX_OFFSET:
+            raise ArtifactError("Artifacts are too large to bundle (over 4 GB); download them one by one.")
+    directory = b"".join(central)
+    segments.append(("bytes", directory + ZIP_END_RECORD.pack(b"PK\x05\x06", 0, 0, len(central), len(central),
+                                                               len(directory), offset, 0)))
+    return segments, offset + len(directory) + ZIP_END_RECORD.size
+
+def bundle_etag(records):
+    """Strong ETag for a bundle: changes whenever any member's content or name does."""
+    return hashlib.sha256(json.dumps(sorted((record["path"], record["sha256"], record["mode"], record["mtime"])
+                                            for record in records)).encode("utf-8")).hexdigest()
@@ -0,0 +1,493 @@
+# generator/utils/asset_store.py
+import os
+import re
+import json
+import zlib
+import struct
+import shutil
+import hashlib
+import tarfile
+import tempfile
+from email.message import Message
+
+# Shared by build_server.py (ingests uploads) and build_worker.py (materializes them per job).
+ASSET_STORE_ENV = "APPIZER_ASSET_STORE"
+DEFAULT_ASSET_STORE = "/cache/assets"
+
+# Upload limits, enforced while streaming so a zip bomb is stopped before it fills the disk.
+MAX_UPLOAD_FILES = 20000
+MAX_UPLOAD_BYTES = 2 * 1024 ** 3 # Uncompressed, per upload
+MAX_FILE_BYTES = 512 * 1024 ** 2
+MAX_COMPRESSION_RATIO = 100 # Uncompressed bytes per compressed byte read, checked past RATIO_CHECK_MIN_BYTES
+RATIO_CHECK_MIN_BYTES = 16 * 1024 ** 2
+MAX_FIELD_BYTES = 1024 * 1024
+MAX_PART_HEADER_BYTES = 16 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+MANIFEST_ID_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+ZIP_LOCAL_FILE = b"PK\x03\x04"
+ZIP_DATA_DESCRIPTOR = b"PK\x07\x08"
+ZIP_TRAILERS = (b"PK\x01\x02", b"PK\x05\x06", b"PK\x06\x06") # Central directory, end records
+ZIP_LOCAL_HEADER = struct.Struct("<HHHHHIIIHH") # version, flags, method, time, date, crc, csize, usize, name_len, extra_len
+
+class AssetUploadError(Exception):
+    """An upload was rejected: unsafe path, limits exceeded, or a malformed archive."""
+
+
+def safe_relpath(name):
+    """
+    Normalizes an upload or archive member path to a relative POSIX path.
+
+    Raises:
+        AssetUploadError: For absolute paths, drive letters, '..' components or NUL bytes.
+    """
+    normalized = name.replace("\\", "/")
+    if "\0" in normalized or normalized.startswith("/") or re.match(r"^[A-Za-z]:", normalized):
+        raise AssetUploadError(f"Unsafe path in upload: {name!r}")
+    parts = [part for part in normalized.split("/") if part not in ("", ".")]
+    if not parts or ".." in parts:
+        raise AssetUploadError(f"Unsafe path in upload: {name!r}")
+    return "/".join(parts)
+
+
+class CountingReader:
+    """Wraps the request body: counts bytes read (for the compression ratio check) and never reads past `limit`."""
+
+    def __init__(self, raw, limit=None):
+        self.raw = raw
+        self.limit = limit
+        self.count = 0
+
+    def read(self, size=-1):
+        if self.limit is not None:
+            remaining = self.limit - self.count
+            size = remaining if size is None or size < 0 else min(size, remaining)
+            if size <= 0:
+                return b""
+        data = self.raw.read(size)
+        self.count += len(data)
+        return data
+
+
+class UploadBudget:
+    """Running totals for one upload, checked against the MAX_* limits as bytes arrive."""
+
+    def __init__(self, source=None):
+        self.source = source
+        self.files = 0
+        self.bytes = 0
+        self.stored_bytes = 0
+        self.deduped_files = 0
+
+    def add_file(self):
+        self.files += 1
+        if self.files > MAX_UPLOAD_FILES:
+            raise AssetUploadError(f"Upload has more than {MAX_UPLOAD_FILES} files.")
+
+    def add_bytes(self, count):
+        self.bytes += count
+        if self.bytes > MAX_UPLOAD_BYTES:
+            raise AssetUploadError(f"Upload expands to more than {MAX_UPLOAD_BYTES} bytes.")
+        if self.source is not None and self.bytes > RATIO_CHECK_MIN_BYTES and self.bytes > MAX_COMPRESSION_RATIO * max(1, self.source.count):
+            raise AssetUploadError(f"Upload expands more than {MAX_COMPRESSION_RATIO}x; refusing a likely zip bomb.")
+
+    def summary(self):
+        return {"files": self.files, "bytes": self.bytes, "stored_bytes": self.stored_bytes, "deduped_files": self.deduped_files}
+
+
+class AssetStore:
+    """
+    Content-addressed store for uploaded webapp assets, on a filesystem shared by the build server and workers:
+        objects/<sha[:2]>/<sha>   file content, read-only, stored once however many uploads contain it
+        manifests/<id>.json       {relative path: sha256}; the id is the SHA-256 of the manifest itself
+    An unchanged site therefore re-uploads to the same manifest id without writing any new objects.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.tmp_dir = os.path.join(root, "tmp") # Same filesystem as objects/, so publishing is a rename
+        for name in ("objects", "manifests", "tmp"):
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+
+    def object_path(self, sha):
+        return os.path.join(self.root, "objects", sha[:2], sha)
+
+    def has_object(self, sha):
+        return bool(MANIFEST_ID_PATTERN.match(sha)) and os.path.exists(self.object_path(sha))
+
+    def ingest_chunks(self, chunks, budget):
+        """
+        Streams chunks into the store, hashing while writing; content already stored is dropped.
+
+        Returns:
+            str: The content's SHA-256.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir, prefix="upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > MAX_FILE_BYTES:
+                        raise AssetUploadError(f"A file in the upload is larger than {MAX_FILE_BYTES} bytes.")
+                    budget.add_bytes(len(chunk))
+                    digest.update(chunk)
+                    f.write(chunk)
+            sha = digest.hexdigest()
+            object_path = self.object_path(sha)
+            if os.path.exists(object_path):
+                budget.deduped_files += 1
+            else:
+                os.chmod(temp_path, 0o444) # Objects are hardlinked into job workspaces; nobody may write through them
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                os.replace(temp_path, object_path)
+                budget.stored_bytes += size
+            return sha
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def save_manifest(self, files):
+        """Stores {relative path: sha256} and returns its id."""
+        data = json.dumps(files, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        manifest_id = hashlib.sha256(data).hexdigest()
+        manifest_path = os.path.join(self.root, "manifests", f"{manifest_id}.json")
+        if not os.path.exists(manifest_path):
+            fd, temp_path = tempfile.mkstemp(dir=self.tmp_dir, prefix="manifest-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, manifest_path)
+        return manifest_id
+
+    def load_manifest(self, manifest_id):
+        """
+        Raises:
+            AssetUploadError: For an unknown or malformed manifest id.
+        """
+        if not MANIFEST_ID_PATTERN.match(manifest_id or ""):
+            raise AssetUploadError(f"Invalid asset upload id '{manifest_id}'.")
+        try:
+            with open(os.path.join(self.root, "manifests", f"{manifest_id}.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise AssetUploadError(f"Unknown asset upload id '{manifest_id}'.")
+
+    def missing(self, entries):
+        """Paths of {"path", "sha256"} entries whose content is not stored yet (the client uploads only these)."""
+        return [entry["path"] for entry in entries if not self.has_object(str(entry.get("sha256", "")))]
+
+    def materialize(self, manifest_id, dest_dir):
+        """
+        Lays out an upload in `dest_dir` as hardlinks to the stored objects (copies across filesystems).
+
+        Returns:
+            int: Number of files.
+        """
+        files = self.load_manifest(manifest_id)
+        for rel_path, sha in files.items():
+            dest_path = os.path.join(dest_dir, *safe_relpath(rel_path).split("/"))
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            try:
+                os.link(self.object_path(sha), dest_path)
+            except OSError:
+                shutil.copyfile(self.object_path(sha), dest_path)
+        return len(files)
+
+
+class _PushbackReader:
+    """Exact reads with push-back over a non-seekable stream."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.pending = b""
+
+    def read(self, size):
+        if self.pending:
+            data, self.pending = self.pending[:size], self.pending[size:]
+            return data
+        return self.raw.read(size)
+
+    def read_exact(self, size, what="upload"):
+        data = b""
+        while len(data) < size:
+            chunk = self.read(size - len(data))
+            if not chunk:
+                raise AssetUploadError(f"Truncated {what}.")
+            data += chunk
+        return data
+
+    def unread(self, data):
+        self.pending = data + self.pending
+
+    def drain(self):
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+class _ChunkReader:
+    """File-like view of a chunk iterator, for reading an archive that arrives as one multipart field."""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = b""
+
+    def read(self, size=-1):
+        while size is None or size < 0 or len(self.buffer) < size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                break
+            self.buffer += chunk
+        if size is None or size < 0:
+            size = len(self.buffer)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+def _add_file(files, path, sha):
+    if path in files and files[path] != sha:
+        raise AssetUploadError(f"Upload contains '{path}' more than once.")
+    files[path] = sha
+
+def _stored_chunks(reader, size):
+    while size > 0:
+        chunk = reader.read(min(CHUNK_SIZE, size))
+        if not chunk:
+            raise AssetUploadError("Truncated zip archive.")
+        size -= len(chunk)
+        yield chunk
+
+def _inflated_chunks(reader):
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    while not decompressor.eof:
+        data = reader.read(CHUNK_SIZE)
+        if not data:
+            raise AssetUploadError("Truncated zip archive.")
+        # Bounded output per step, so a bomb is caught by the budget before it is inflated in memory.
+        yield decompressor.decompress(data, CHUNK_SIZE)
+        while decompressor.unconsumed_tail and not decompressor.eof:
+            yield decompressor.decompress(decompressor.unconsumed_tail, CHUNK_SIZE)
+    reader.unread(decompressor.unused_data) # The next entry's header
+
+def ingest_zip(store, stream, budget, files):
+    """
+    Ingests a zip from a non-seekable stream by walking its local file headers
+    (the central directory at the end is never needed, so nothing is staged first).
+    """
+    reader = _PushbackReader(stream)
+    while True:
+        signature = reader.read_exact(4, "zip archive")
+        if signature in ZIP_TRAILERS:
+            reader.drain()
+            return
+        if signature != ZIP_LOCAL_FILE:
+            raise AssetUploadError("Not a zip archive, or a corrupt one.")
+        _, flags, method, _, _, crc, compressed_size, _, name_len, extra_len = ZIP_LOCAL_HEADER.unpack(
+            reader.read_exact(ZIP_LOCAL_HEADER.size, "zip archive"))
+        name = reader.read_exact(name_len, "zip archive").decode("utf-8" if flags & 0x800 else "cp437")
+        extra = reader.read_exact(extra_len, "zip archive")
+        zip64 = False
+        offset = 0
+        while offset + 4 <= len(extra):
+            header_id, data_size = struct.unpack_from("<HH", extra, offset)
+            if header_id == 0x0001: # Zip64 sizes (data descriptors then carry 8-byte sizes too)
+                zip64 = True
+                if compressed_size == 0xFFFFFFFF and data_size >= 16:
+                    compressed_size = struct.unpack_from("<Q", extra, offset + 12)[0]
+            offset += 4 + data_size
+        if flags & 0x1:
+            raise AssetUploadError(f"'{name}' is encrypted.")
+        has_descriptor = bool(flags & 0x8)
+        if method == 0:
+            if has_descriptor:
+                raise AssetUploadError(f"'{name}' is stored without sizes and cannot be streamed; re-create the zip with compression.")
+            chunks = _stored_chunks(reader, compressed_size)
+        elif method == 8:
+            chunks = _inflated_chunks(reader)
+        else:
+            raise AssetUploadError(f"'{name}' uses unsupported zip compression method {method}.")
+
+        actual_crc = 0
+        if name.endswith("/"):
+            for _ in chunks: # Directory entry
+                pass
+        else:
+            path = safe_relpath(name)
+            budget.add_file()
+            def checked(chunks=chunks):
+                nonlocal actual_crc
+                for chunk in chunks:
+                    actual_crc = zlib.crc32(chunk, actual_crc)
+                    yield chunk
+            _add_file(files, path, store.ingest_chunks(checked(), budget))
+        if has_descriptor:
+            descriptor = reader.read_exact(4, "zip archive")
+            if descriptor == ZIP_DATA_DESCRIPTOR:
+                descriptor = reader.read_exact(4, "zip archive")
+            crc = struct.unpack("<I", descriptor)[0]
+            reader.read_exact(16 if zip64 else 8, "zip archive") # Sizes
+        if not name.endswith("/") and actual_crc != crc:
+            raise AssetUploadError(f"'{name}' is corrupt (CRC mismatch).")
+
+def ingest_tar(store, stream, budget, files):
+    """Ingests a tar (plain, gz, bz2 or xz) from a non-seekable stream. Links and devices are rejected."""
+    try:
+        with tarfile.open(fileobj=stream, mode="r|*") as tar:
+            for member in tar:
+                if member.isdir():
+                    continue
+                if not member.isfile():
+                    raise AssetUploadError(f"'{member.name}' is a link or special file; only regular files are allowed.")
+                path = safe_relpath(member.name)
+                budget.add_file()
+                f = tar.extractfile(member)
+                _add_file(files, path, store.ingest_chunks(iter(lambda: f.read(CHUNK_SIZE), b""), budget))
+    except (tarfile.TarError, EOFError, zlib.error, OSError) as e:
+        raise AssetUploadError(f"Not a readable tar archive: {e}")
+
+def strip_common_root(files):
+    """Drops a single top-level folder shared by every file (archives of 'site/...')."""
+    roots = {path.split("/", 1)[0] for path in files}
+    if len(roots) != 1 or any("/" not in path for path in files):
+        return files
+    return {path.split("/", 1)[1]: sha for path, sha in files.items()}
+
+def ingest_archive(store, stream, budget, files):
+    """Ingests a zip or tar archive, detected from its first bytes, into the upload's root."""
+    reader = _PushbackReader(stream)
+    magic = reader.read(4)
+    reader.unread(magic)
+    archive_files = {}
+    if magic[:2] == b"PK":
+        ingest_zip(store, reader, budget, archive_files)
+    else:
+        ingest_tar(store, reader, budget, archive_files)
+    for path, sha in strip_common_root(archive_files).items():
+        _add_file(files, path, sha)
+
+def _read_part_headers(reader):
+    data = b""
+    while b"\r\n\r\n" not in data:
+        chunk = reader.read(1024)
+        if not chunk:
+            raise AssetUploadError("Truncated multipart body.")
+        data += chunk
+        if len(data) > MAX_PART_HEADER_BYTES:
+            raise AssetUploadError("Multipart part headers are too large.")
+    head, _, rest = data.partition(b"\r\n\r\n")
+    reader.unread(rest)
+    disposition = Message()
+    for line in head.decode("utf-8", "replace").split("\r\n"):
+        key, _, value = line.partition(":")
+        if key.strip().lower() == "content-disposition":
+            disposition["Content-Disposition"] = value.strip()
+    return disposition.get_param("name", header="content-disposition"), disposition.get_filename()
+
+def _part_chunks(reader, delimiter):
+    """Yields a part's body up to (not including) the next delimiter, which is consumed."""
+    buffer = b""
+    keep = len(delimiter) - 1
+    while True:
+        index = buffer.find(delimiter)
+        if index >= 0:
+            if index:
+                yield buffer[:index]
+            reader.unread(buffer[index + len(delimiter):])
+            return
+        if len(buffer) > keep:
+            yield buffer[:-keep]
+            buffer = buffer[-keep:]
+        data = reader.read(CHUNK_SIZE)
+        if not data:
+            raise AssetUploadError("Truncated multipart body.")
+        buffer += data
+
+def ingest_multipart(store, stream, boundary, budget, files, fields):
+    """
+    Ingests multipart/form-data: file parts are stored under their file name (an archive is expanded
+    in place), other parts are collected into `fields`. A "manifest" field lists files already in the
+    store ([{"path", "sha256"}]), so a client re-sends only what changed.
+    """
+    reader = _PushbackReader(stream)
+    delimiter = b"\r\n--" + boundary.encode("latin-1")
+    reader.unread(b"\r\n")
+    for _ in _part_chunks(reader, delimiter): # Preamble
+        pass
+    while True:
+        if reader.read_exact(2, "multipart body") == b"--":
+            reader.drain()
+            return
+        name, filename = _read_part_headers(reader)
+        chunks = _part_chunks(reader, delimiter)
+        if filename is None:
+            value = b""
+            for chunk in chunks:
+                value += chunk
+                if len(value) > MAX_FIELD_BYTES:
+                    raise AssetUploadError(f"Form field '{name}' is larger than {MAX_FIELD_BYTES} bytes.")
+            try:
+                fields[name] = value.decode("utf-8")
+            except UnicodeDecodeError:
+                raise AssetUploadError(f"Form field '{name}' is not valid UTF-8.")
+            if name == "manifest":
+                _add_manifest_entries(store, fields[name], budget, files)
+        elif filename.lower().endswith(ARCHIVE_SUFFIXES):
+            ingest_archive(store, _ChunkReader(chunks), budget, files)
+        else:
+            path = safe_relpath(filename)
+            budget.add_file()
+            _add_file(files, path, store.ingest_chunks(chunks, budget))
+
+def _add_manifest_entries(store, manifest, budget, files):
+    """
+    Raises:
+        AssetUploadError: If `manifest` is not a JSON list of {"path", "sha256"} objects, or lists unstored content.
+    """
+    try:
+        entries = json.loads(manifest)
+    except ValueError as e:
+        raise AssetUploadError(f"The 'manifest' field is not valid JSON: {e}")
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise AssetUploadError("The 'manifest' field must be a JSON list of objects with 'path' and 'sha256'.")
+    for entry in entries:
+        path = safe_relpath(str(entry.get("path", "")))
+        sha = str(entry.get("sha256", ""))
+        if not store.has_object(sha):
+            raise AssetUploadError(f"'{path}' is listed by hash but not stored; upload its content.")
+        budget.add_file()
+        budget.deduped_files += 1
+        _add_file(files, path, sha)
+
+def ingest_upload(store, stream, content_type, content_length=None):
+    """
+    Streams an upload body into the store: multipart/form-data, or a zip/tar archive as the whole body.
+
+    Args:
+        store (AssetStore): Destination store.
+        stream: The request body (read with .read(n)).
+        content_type (str): The request's Content-Type.
+        content_length (int, optional): Body size; reads never go past it.
+
+    Returns:
+        tuple: (manifest id, summary dict, multipart form fields).
+
+    Raises:
+        AssetUploadError: For unsafe paths, exceeded limits or malformed bodies.
+    """
+    source = CountingReader(stream, content_length)
+    budget = UploadBudget(source)
+    files, fields = {}, {}
+    media_type = content_type.split(";")[0].strip().lower()
+    if media_type == "multipart/form-data":
+        match = re.search(r'boundary="?([^";]+)"?', content_type)
+        if not match:
+            raise AssetUploadError("multipart/form-data without a boundary.")
+        ingest_multipart(store, source, match.group(1), budget, files, fields)
+    else:
+        ingest_archive(store, source, budget, files)
+    if not files:
+        raise AssetUploadError("The upload contains no files.")
+    manifest_id = store.save_manifest(files)
+    return manifest_id, budget.summary(), fields
@@ -0,0 +1,375 @@
+# generator/utils/build_queue.py
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import contextlib
+
+from utils.scheduler import (job_type, job_budget, priority_value, pick_job, pick_preemption_victims, scheduling_order,
+                             average_durations, estimate_wait)
+
+# Job states. A job is "running" only while its lease is live; an expired lease makes it claimable again.
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+DEFAULT_LEASE_SECONDS = 60
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_BACKOFF_BASE_SECONDS = 10
+RETRY_BACKOFF_MAX_SECONDS = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (status, available_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS job_events_by_job ON job_events (job_id, id);
+"""
+
+# Scheduling columns (see utils/scheduler.py), added to queues created before they existed.
+SCHEDULING_COLUMNS = {
+    "job_type": "TEXT NOT NULL DEFAULT 'android'",
+    "priority": "INTEGER NOT NULL DEFAULT 50",
+    "tenant": "TEXT NOT NULL DEFAULT 'default'",
+    "cpus": "REAL NOT NULL DEFAULT 4",
+    "memory_mb": "INTEGER NOT NULL DEFAULT 6144",
+    "preemptions": "INTEGER NOT NULL DEFAULT 0",
+}
+
+# Finished jobs used for ETA estimates.
+ETA_HISTORY_JOBS = 200
+
+# Events (status changes, progress, log lines) kept per job; older ones are dropped as new ones arrive.
+EVENT_RING_SIZE = 2000
+
+def retry_delay(attempts):
+    """Exponential backoff with full jitter after the given number of failed attempts."""
+    ceiling = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * 2 ** max(0, attempts - 1))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class SqliteBuildQueue:
+    """
+    Durable job queue in one SQLite file. Workers on any number of nodes claim jobs straight from it
+    (no orchestrator in between); the file must live on a filesystem with working POSIX locks.
+
+    Every claim takes a lease that the worker renews with heartbeat(). A worker that dies simply stops
+    renewing, and the job is handed to the next claimer once the lease expires.
+
+    Which job a claim gets is decided by utils/scheduler.py (priority, fair share, the node's free budget),
+    inside the claim transaction, so the policy holds across nodes without a central scheduler.
+    """
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL") # Readers (status polls) never block claimers
+            db.executescript(SCHEMA)
+            existing = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            for column, definition in SCHEDULING_COLUMNS.items():
+                if column not in existing:
+                    db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per operation, so the queue is safe to share between threads.
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        with self._connect() as db:
+            db.execute("BEGIN IMMEDIATE") # Take the write lock up front: claims never race
+            try:
+                yield db
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    @staticmethod
+    def _job(row):
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    @staticmethod
+    def _event(row):
+        event = dict(row)
+        event["data"] = json.loads(event["data"])
+        return event
+
+    @staticmethod
+    def _add_events(db, job_id, events):
+        """Appends (type, data) events for a job inside the caller's transaction and trims its ring."""
+        now = time.time()
+        db.executemany("INSERT INTO job_events (job_id, type, data, created_at) VALUES (?, ?, ?, ?)",
+                       [(job_id, event_type, json.dumps(data), now) for event_type, data in events])
+        db.execute("DELETE FROM job_events WHERE job_id = ? AND id <= "
+                   "(SELECT id FROM job_events WHERE job_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                   (job_id, job_id, EVENT_RING_SIZE))
+
+    def enqueue(self, payload, job_id=None, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Adds a job and returns its id. Scheduling inputs come from the payload: "priority"
+        ('interactive'/'default'/'batch' or a number), "tenant", and optional "cpus"/"memory_mb".
+
+        Raises:
+            ValueError: For an unknown priority name.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        priority = priority_value(payload.get("priority"))
+        budget = job_budget(payload)
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT INTO jobs (id, payload, status, max_attempts, available_at, created_at, "
+                       "job_type, priority, tenant, cpus, memory_mb) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       (job_id, json.dumps(payload), QUEUED, max_attempts, now, now, job_type(payload), priority,
+                        str(payload.get("tenant") or "default"), budget["cpus"], budget["memory_mb"]))
+            self._add_events(db, job_id, [("status", {"status": QUEUED, "message": "Queued"})])
+        return job_id
+
+    def _expire_leases(self, db, now):
+        """Re-queues running jobs whose worker stopped renewing; fails them if no attempts are left."""
+        for row in db.execute("SELECT id, attempts, max_attempts, lease_owner FROM jobs WHERE status = ? AND lease_expires_at < ?",
+                              (RUNNING, now)).fetchall():
+            message = f"Lease expired on attempt {row['attempts']} (worker {row['lease_owner']} lost)."
+            if row["attempts"] >= row["max_attempts"]:
+                db.execute("UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, finished_at = ? WHERE id = ?",
+                           (FAILED, message, now, row["id"]))
+                self._add_events(db, row["id"], [("status", {"status": FAILED, "message": message})])
+            else:
+                db.execute("UPDATE jobs SET status = ?, lease_owner = NULL, available_at = ? WHERE id = ?", (QUEUED, now, row["id"]))
+                self._add_events(db, row["id"], [("status", {"status": QUEUED, "message": message})])
+
+    def _scheduling_rows(self, db, now):
+        queued = [dict(row) for row in db.execute("SELECT * FROM jobs WHERE status = ? AND available_at <= ?", (QUEUED, now))]
+        running = [dict(row) for row in db.execute("SELECT * FROM jobs WHERE status = ?", (RUNNING,))]
+        return queued, running
+
+    def claim(self, worker_id, free=None):
+        """
+        Leases the next job for `worker_id` as chosen by the scheduler.
+
+        When nothing fits but the most urgent queued job would fit after stopping this worker's own
+        less urgent jobs (e.g. batch builds while an interactive preview waits), those jobs are preempted:
+        re-queued without using up an attempt; their heartbeat() then returns False and the worker stops them.
+        The freed capacity is claimed on a later call, once the stopped builds are gone.
+
+        Args:
+            worker_id (str): The claiming worker.
+            free (dict, optional): {"cpus": float, "memory_mb": int} the worker has left. Defaults to unlimited.
+
+        Returns:
+            dict|None: The job (with "attempts" already counting this one, and "first_start" True unless it ran
+                before, e.g. until preempted), or None if nothing is due or fits.
+        """
+        now = time.time()
+        free = free or {"cpus": float("inf"), "memory_mb": float("inf")}
+        with self._transaction() as db:
+            self._expire_leases(db, now)
+            queued, running = self._scheduling_rows(db, now)
+            if not queued:
+                return None
+            job = pick_job(queued, running, free, now)
+            if job is None:
+                most_urgent = scheduling_order(queued, running, now)[0]
+                own_running = [other for other in running if other["lease_owner"] == worker_id]
+                for victim in pick_preemption_victims(most_urgent, own_running, free):
+                    message = f"Preempted by job {most_urgent['id']}"
+                    db.execute("UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, available_at = ?, "
+                               "preemptions = preemptions + 1, message = ? WHERE id = ?",
+                               (QUEUED, now, message, victim["id"]))
+                    self._add_events(db, victim["id"], [("status", {"status": QUEUED, "message": message})])
+                return None
+            db.execute("UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, "
+                       "progress = 0, message = '', started_at = COALESCE(started_at, ?) WHERE id = ?",
+                       (RUNNING, worker_id, now + self.lease_seconds, now, job["id"]))
+            self._add_events(db, job["id"], [("status", {"status": RUNNING, "attempt": job["attempts"] + 1, "worker": worker_id})])
+            claimed = self._job(db.execute("SELECT * FROM jobs WHERE id = ?", (job["id"],)).fetchone())
+            claimed["first_start"] = job["started_at"] is None
+            return claimed
+
+    def heartbeat(self, job_id, worker_id, progress=None, message=None):
+        """
+        Renews the lease and records progress (0..1) and a status message.
+
+        Returns:
+            bool: False if the job was preempted or its lease lost (expired and reclaimed); the worker must stop it.
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_expires_at = ?, progress = COALESCE(?, progress), message = COALESCE(?, message) "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + self.lease_seconds, progress, message, job_id, RUNNING, worker_id))
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result=None):
+        """Marks a leased job as succeeded. Returns False if the lease was lost."""
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = ?, progress = 1, result = ?, lease_owner = NULL, finished_at = ? "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (SUCCEEDED, json.dumps(result), time.time(), job_id, RUNNING, worker_id))
+            if cursor.rowcount != 1:
+                return False
+            self._add_events(db, job_id, [("status", {"status": SUCCEEDED})])
+            return True
+
+    def fail(self, job_id, worker_id, error, retryable=True):
+        """
+        Records a failed attempt: the job is re-queued with backoff while attempts remain, otherwise failed.
+
+        Returns:
+            str|None: The job's new status, or None if the lease was lost.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                             (job_id, RUNNING, worker_id)).fetchone()
+            if row is None:
+                return None
+            if retryable and row["attempts"] < row["max_attempts"]:
+                retry_at = now + retry_delay(row["attempts"])
+                db.execute("UPDATE jobs SET status = ?, available_at = ?, error = ?, lease_owner = NULL WHERE id = ?",
+                           (QUEUED, retry_at, error, job_id))
+                self._add_events(db, job_id, [("status", {"status": QUEUED, "error": error, "retry_at": retry_at})])
+                return QUEUED
+            db.execute("UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, finished_at = ? WHERE id = ?",
+                       (FAILED, error, now, job_id))
+            self._add_events(db, job_id, [("status", {"status": FAILED, "error": error})])
+            return FAILED
+
+    def add_events(self, job_id, worker_id, events):
+        """
+        Appends progress/log events for a leased job, e.g. [("log", {"line": "..."}), ("progress", {...})].
+
+        Returns:
+            bool: False if the worker no longer holds the job (nothing is recorded).
+        """
+        with self._transaction() as db:
+            if db.execute("SELECT 1 FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                          (job_id, RUNNING, worker_id)).fetchone() is None:
+                return False
+            self._add_events(db, job_id, events)
+            return True
+
+    def events_since(self, job_id, after_id=0, until_id=None):
+        """A job's retained events with after_id < id (<= until_id), oldest first."""
+        with self._connect() as db:
+            rows = db.execute("SELECT * FROM job_events WHERE job_id = ? AND id > ? AND id <= ? ORDER BY id",
+                              (job_id, after_id, until_id if until_id is not None else 2 ** 63 - 1))
+            return [self._event(row) for row in rows]
+
+    def events_after(self, after_id, job_ids):
+        """
+        New events for any of `job_ids` since `after_id`, for one poller serving many streams.
+
+        Returns:
+            tuple: (events oldest first, the highest event id committed so far; pass it as the next after_id).
+        """
+        with self._connect() as db:
+            # Writers serialize on the database lock, so every id up to the current maximum is committed.
+            last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM job_events").fetchone()[0]
+            if not job_ids or last_id <= after_id:
+                return [], max(after_id, last_id)
+            placeholders = ", ".join("?" * len(job_ids))
+            rows = db.execute(f"SELECT * FROM job_events WHERE id > ? AND id <= ? AND job_id IN ({placeholders}) ORDER BY id",
+                              (after_id, last_id, *job_ids))
+            return [self._event(row) for row in rows], last_id
+
+    def get(self, job_id):
+        with self._connect() as db:
+            return self._job(db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def list_jobs(self, status=None, limit=100):
+        """Most recently created jobs first, optionally filtered by status."""
+        with self._connect() as db:
+            if status:
+                rows = db.execute("SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?", (status, limit))
+            else:
+                rows = db.execute("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+            return [self._job(row) for row in rows]
+
+    def describe(self, job_id):
+        """
+        The job plus scheduling details for status endpoints: "queue_position" (1 = next; 0 while running)
+        and "eta_seconds" (until it finishes, from recent run times; None without history).
+
+        Returns:
+            dict|None: None for an unknown job id.
+        """
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            job = self._job(row)
+            job["queue_position"], job["eta_seconds"] = None, None
+            if job["status"] in (QUEUED, RUNNING):
+                queued = [dict(other) for other in db.execute("SELECT * FROM jobs WHERE status = ?", (QUEUED,))]
+                running = [dict(other) for other in db.execute("SELECT * FROM jobs WHERE status = ?", (RUNNING,))]
+                finished = db.execute("SELECT job_type, finished_at - started_at FROM jobs WHERE status = ? AND started_at IS NOT NULL "
+                                      "ORDER BY finished_at DESC LIMIT ?", (SUCCEEDED, ETA_HISTORY_JOBS)).fetchall()
+                job["queue_position"], job["eta_seconds"] = estimate_wait(
+                    dict(row), queued, running, average_durations((name, seconds) for name, seconds in finished), now)
+            return job
+
+    def counts(self):
+        """Number of jobs per status, e.g. {"queued": 3, "running": 2, "succeeded": 40, "failed": 1}."""
+        counts = dict.fromkeys((QUEUED, RUNNING, SUCCEEDED, FAILED), 0)
+        with self._connect() as db:
+            for status, count in db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+                counts[status] = count
+        return counts
+
+
+# Queue backends by URL scheme; a bare path means sqlite.
+QUEUE_BACKENDS = {
+    "sqlite": SqliteBuildQueue,
+}
+
+def open_build_queue(location, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Opens a build queue from a location such as '/shared/queue.db' or 'sqlite:///shared/queue.db'.
+
+    Raises:
+        ValueError: If the scheme has no registered backend.
+    """
+    scheme, separator, rest = location.partition("://")
+    if not separator:
+        scheme, rest = "sqlite", location
+    backend = QUEUE_BACKENDS.get(scheme)
+    if backend is None:
+        raise ValueError(f"Unknown build queue scheme '{scheme}'. Available: {', '.join(sorted(QUEUE_BACKENDS))}")
+    return backend(rest, lease_seconds)
@@ -41,4 +41,35 @@ def load_yaml_file(file_path, file_description="config file"):
         return None
     except Exception as e:
         print(f"  [config_loader.py] An unexpected error occurred while loading {file_description} {file_path}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def load_merged_config(default_config_path, user_config_path):
+    """
+    Loads the default config and merges the user's config over it, mirroring what
+    entrypoint.sh writes to the active config file. A missing user config yields the defaults.
+    """
+    default_conf = load_yaml_file(default_config_path, "default config file")
+    if default_conf is None:
+        return None
+    user_conf = {}
+    if user_config_path and os.path.exists(user_config_path):
+        user_conf = load_yaml_file(user_config_path, "user config file")
+        if user_conf is None:
+            return None
+    return merge_configs(default_conf, user_conf)
+
+def resolve_platform_config(full_config, platform_name):
+    """
+    Returns the config for one platform, with top-level app_name, package_name, url,
+    app_config, asset_tokens and cache used as defaults for keys the platform section does not override.
+    """
+    platform_config_data = full_config.get("platform_config", {}).get(platform_name, {}) or {}
+    return {
+        "app_name": platform_config_data.get("app_name", full_config.get("app_name", "")),
+        "package_name": platform_config_data.get("package_name", full_config.get("package_name", "")),
+        "url": platform_config_data.get("url", full_config.get("url", "")),
+        "app_config": platform_config_data.get("app_config", full_config.get("app_config", {})),
+        "asset_tokens": platform_config_data.get("asset_tokens", full_config.get("asset_tokens", {})),
+        "cache": platform_config_data.get("cache", full_config.get("cache", {})),
+        **platform_config_data
+    }
@@ -1,12 +1,14 @@
 # android/utils/splashscreen.py
 from PIL import Image, ImageOps
 import os
-import urllib.request
 import io
 import shutil
 import sys # For error logging/exit
+from urllib.error import URLError
 
-def handle_splash_image(splash_config, android_res_path, webapp_assets_dir):
+from utils.scratch import job_scratch
+
+def handle_splash_image(splash_config, android_res_path, webapp_assets_dir, scratch=None):
     """
     Handles copying or downloading the splash screen image to the Android drawable folder.
 
@@ -14,6 +16,7 @@ def handle_splash_image(splash_config, android_res_path, webapp_assets_dir):
         splash_config (dict): The 'splash' section from the config.
         android_res_path (str): Path to the Android 'res' directory (e.g., 'android/app/src/main/res').
         webapp_assets_dir (str): The path where user's input assets are mounted (e.g., '/app/src/webapp').
+        scratch (ScratchSpace, optional): The job's scratch space for remote images (see utils/scratch.py).
     """
     print("\n--- [Resource Generator] Handling Splash Screen Image ---")
     splash_type = splash_config.get("type")
@@ -24,15 +27,18 @@ def handle_splash_image(splash_config, android_res_path, webapp_assets_dir):
         return False
 
     input_path = None
+    owned_scratch = None
     try:
         if splash_content.startswith("http"):
-            # Temporary path for downloaded image
-            input_path = os.path.join("/tmp", "downloaded_splash_image.png")
+            # Downloaded into the job's own scratch dir, so concurrent jobs never share the file
+            if scratch is None:
+                scratch = owned_scratch = job_scratch("splash")
+            input_path = os.path.join(scratch.path, "downloaded_splash_image.png")
             try:
                 print(f"  [Splash] 🌐 Downloading splash image from {splash_content}...")
-                urllib.request.urlretrieve(splash_content, input_path)
+                scratch.download(splash_content, os.path.basename(input_path))
                 print(f"  [Splash] ✅ Downloaded splash image to {input_path}")
-            except urllib.error.URLError as e:
+            except URLError as e:
                 print(f"  [Splash] ❌ URL Error downloading splash image from {splash_content}: {e}")
                 return False
             except Exception as e:
@@ -78,4 +84,6 @@ def handle_splash_image(splash_config, android_res_path, webapp_assets_dir):
         # Clean up downloaded file if it was remote
         if splash_content.startswith("http") and input_path and os.path.exists(input_path):
             os.remove(input_path)
-            print(f"  [Splash] 🗑️ Cleaned up temporary downloaded splash image: {input_path}")
\ No newline at end of file
+            print(f"  [Splash] 🗑️ Cleaned up temporary downloaded splash image: {input_path}")
+        if owned_scratch is not None:
+            owned_scratch.cleanup()
@@ -0,0 +1,125 @@
+# generator/utils/journal.py
+import os
+import json
+import time
+import hashlib
+import tempfile
+
+from utils.remote_cache import fingerprint
+
+# Per-job build journal: every stage of a run (generate, each native build) is recorded with the
+# fingerprint of its inputs and the outputs it left behind. A resumed run (entrypoint.sh -r) skips a
+# stage whose inputs are unchanged and whose outputs are still intact, so retrying after a transient
+# failure only redoes the stages that failed or were invalidated.
+JOURNAL_NAME = "build-journal.json"
+JOURNAL_VERSION = 1
+
+DONE = "done"
+FAILED = "failed"
+
+GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATOR_SOURCE_EXTENSIONS = (".py", ".yaml")
+CHUNK_SIZE = 1024 * 1024
+
+def generator_fingerprint():
+    """Fingerprint of the generator's own sources (bytecode caches excluded), so a new generator invalidates old stages."""
+    parts = []
+    for root, dirs, files in os.walk(GENERATOR_DIR):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(GENERATOR_SOURCE_EXTENSIONS):
+                path = os.path.join(root, name)
+                parts += [os.path.relpath(path, GENERATOR_DIR), ("path", path)]
+    return fingerprint("generator", *parts)
+
+def stage_key(kind, inputs):
+    """
+    Input fingerprint of a stage: its kind (e.g., 'generate-android'), the generator's sources and
+    `inputs`, each an existing file or dir (hashed by content) or a plain value.
+    """
+    return fingerprint("journal", kind, generator_fingerprint(),
+                       *(("path", os.path.abspath(value)) if os.path.exists(value) else value for value in inputs))
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _describe_output(path):
+    path = os.path.abspath(path)
+    if os.path.isdir(path):
+        return {"path": path, "kind": "dir"}
+    return {"path": path, "kind": "file", "size": os.path.getsize(path), "sha256": _sha256(path)}
+
+def _check_output(output):
+    """None if `output` is still as recorded, else why not."""
+    path = output["path"]
+    if output["kind"] == "dir":
+        return None if os.path.isdir(path) else f"{path} is gone"
+    if not os.path.isfile(path):
+        return f"{path} is gone"
+    if os.path.getsize(path) != output["size"] or _sha256(path) != output["sha256"]:
+        return f"{path} changed"
+    return None
+
+class BuildJournal:
+    """The stages of one job, persisted as JSON; every update is written atomically."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.stages = data["stages"] if data.get("version") == JOURNAL_VERSION else {}
+        except (FileNotFoundError, ValueError, KeyError):
+            self.stages = {}
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".journal-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": JOURNAL_VERSION, "stages": self.stages}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def reset(self):
+        self.stages = {}
+        self.save()
+
+    def check(self, stage, key):
+        """
+        Whether `stage` can be skipped: it completed with the same input key and its outputs are intact.
+
+        Returns:
+            tuple: (bool, reason)
+        """
+        entry = self.stages.get(stage)
+        if entry is None:
+            return False, "not run yet"
+        if entry["status"] != DONE:
+            return False, f"{entry['status']} last time"
+        if entry["key"] != key:
+            return False, "inputs changed"
+        for output in entry["outputs"]:
+            problem = _check_output(output)
+            if problem:
+                return False, problem
+        return True, f"done at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(entry['finished_at']))}"
+
+    def record(self, stage, key, status, outputs=()):
+        """
+        Records the outcome of `stage`. With DONE, `outputs` (files are hashed, dirs only need to exist)
+        are what a resumed run verifies before skipping it.
+
+        Raises:
+            OSError: If an output does not exist.
+        """
+        self.stages[stage] = {
+            "key": key,
+            "status": status,
+            "finished_at": int(time.time()),
+            "outputs": [_describe_output(path) for path in outputs] if status == DONE else [],
+        }
+        self.save()
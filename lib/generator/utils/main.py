@@ -2,6 +2,10 @@
 import os
 import shutil
 import re
+import filecmp
+
+from utils.metrics import BYTES_COPIED, FILES_COPIED
+from utils.reproducible import source_date_epoch
 
 def replace_in_file(file_path, replacements):
     """
@@ -79,3 +83,120 @@ def replace_placeholders(file_path, replacements):
     except Exception as e:
         print(f"  [file_ops] Unexpected error replacing placeholders in {file_path}: {e}")
         raise
+
+
+def stream_replace_in_file(file_path, replacements, chunk_size=64 * 1024):
+    """
+    Replaces byte tokens in a file of any size with constant memory.
+    The file is rewritten chunk by chunk into a temp file next to it, then swapped in; a tail of
+    (longest token - 1) bytes is carried into the next chunk so tokens split across chunks still match.
+
+    Args:
+        file_path (str): File to rewrite in place.
+        replacements (dict): {token (bytes): value (bytes)}.
+        chunk_size (int): Bytes read per step.
+
+    Returns:
+        int: Number of tokens replaced. The file is left untouched when this is 0.
+    """
+    if not replacements:
+        return 0
+    # Longest first, so a token that is a prefix of another never wins the alternation.
+    tokens = sorted(replacements, key=len, reverse=True)
+    pattern = re.compile(b"|".join(re.escape(token) for token in tokens))
+    overlap = len(tokens[0]) - 1
+    replaced = 0
+    temp_path = f"{file_path}.appizer-tmp"
+
+    try:
+        with open(file_path, "rb") as src, open(temp_path, "wb") as dst:
+            carry = b""
+            while True:
+                chunk = src.read(chunk_size)
+                buffer = carry + chunk
+                at_eof = not chunk
+                # Matches starting at or after safe_end might continue in the next chunk: keep them for later.
+                safe_end = len(buffer) if at_eof else max(0, len(buffer) - overlap)
+                pos = 0
+                for match in pattern.finditer(buffer):
+                    if match.start() >= safe_end:
+                        break
+                    dst.write(buffer[pos:match.start()])
+                    dst.write(replacements[match.group()])
+                    pos = match.end()
+                    replaced += 1
+                emit_to = max(pos, safe_end)
+                dst.write(buffer[pos:emit_to])
+                carry = buffer[emit_to:]
+                if at_eof:
+                    break
+        if replaced:
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+            print(f"  [file_ops] Streamed {replaced} token replacement(s) into: {file_path}")
+        return replaced
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def sync_directory(src_dir, dest_dir, delete_extra=True, preserve=()):
+    """
+    Incrementally mirrors `src_dir` into `dest_dir`.
+    Only files whose size or mtime differ are copied, so re-running after a small
+    edit touches just that file instead of re-copying the whole tree. In reproducible mode
+    the copies' mtimes were normalized (see utils/reproducible.py), so same-size files are
+    compared by content instead.
+
+    Args:
+        src_dir (str): Source directory (e.g., the mounted webapp assets).
+        dest_dir (str): Destination directory inside the platform project.
+        delete_extra (bool): Remove files in `dest_dir` that no longer exist in `src_dir`.
+        preserve (iterable): Relative paths in `dest_dir` that are never removed (files the generator writes itself).
+
+    Returns:
+        list: Relative paths that were copied or removed.
+    """
+    print(f"  [file_ops] Entering sync_directory. Src: {src_dir}, Dest: {dest_dir}")
+    changed = []
+    seen = set()
+    compare_content = source_date_epoch() is not None
+    os.makedirs(dest_dir, exist_ok=True)
+
+    for root, dirs, files in os.walk(src_dir):
+        dirs.sort()
+        rel_root = os.path.relpath(root, src_dir)
+        target_root = dest_dir if rel_root == "." else os.path.join(dest_dir, rel_root)
+        os.makedirs(target_root, exist_ok=True)
+        for name in sorted(files):
+            src_path = os.path.join(root, name)
+            dst_path = os.path.join(target_root, name)
+            rel_path = os.path.normpath(os.path.join(rel_root, name))
+            seen.add(rel_path)
+            src_stat = os.stat(src_path)
+            try:
+                dst_stat = os.stat(dst_path)
+                # Exact mtimes: copy2 keeps nanoseconds, and whole seconds would miss an edit within the same second
+                if dst_stat.st_size == src_stat.st_size and (dst_stat.st_mtime_ns == src_stat.st_mtime_ns or
+                                                            (compare_content and filecmp.cmp(src_path, dst_path, shallow=False))):
+                    continue
+            except FileNotFoundError:
+                pass
+            shutil.copy2(src_path, dst_path)
+            changed.append(rel_path)
+            BYTES_COPIED.labels(kind="sync").inc(src_stat.st_size)
+            FILES_COPIED.labels(kind="sync").inc()
+
+    if delete_extra:
+        for root, dirs, files in os.walk(dest_dir, topdown=False):
+            for name in files:
+                dst_path = os.path.join(root, name)
+                rel_path = os.path.relpath(dst_path, dest_dir)
+                if rel_path not in seen and rel_path not in preserve:
+                    os.remove(dst_path)
+                    changed.append(rel_path)
+            if root != dest_dir and not os.listdir(root):
+                os.rmdir(root)
+
+    print(f"  [file_ops] sync_directory updated {len(changed)} file(s) in {dest_dir}")
+    return changed
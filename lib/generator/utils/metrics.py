@@ -0,0 +1,360 @@
+# generator/utils/metrics.py
+import os
+import re
+import time
+import fcntl
+import bisect
+import tempfile
+import threading
+import contextlib
+
+# Exposed over HTTP (serve_metrics) or as a node-exporter textfile (write_textfile).
+METRICS_TEXTFILE_ENV = "APPIZER_METRICS_TEXTFILE"
+METRICS_PORT_ENV = "APPIZER_METRICS_PORT"
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a fast generator stage up to a cold release build.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)="((?:[^"\\]|\\.)*)"')
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(pairs):
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+class _Shards:
+    """
+    Per-thread value arrays. Each thread only ever writes its own array, so updates take no lock;
+    readers sum the arrays at scrape time (a scrape may miss an in-flight update, never corrupt one).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self._by_thread = {}
+
+    def local(self):
+        values = self._by_thread.get(threading.get_ident())
+        if values is None:
+            values = self._by_thread[threading.get_ident()] = [0.0] * self.size
+        return values
+
+    def totals(self):
+        totals = [0.0] * self.size
+        for values in tuple(self._by_thread.values()):
+            for i, value in enumerate(values):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild:
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount=1):
+        self._shards.local()[0] += amount
+
+    def value(self):
+        return self._shards.totals()[0]
+
+
+class _GaugeChild:
+    def __init__(self):
+        self._value = 0.0
+        self._function = None
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self._value = float(value)
+
+    def inc(self, amount=1):
+        with self._lock: # Gauges go up and down from several threads; these updates are rare
+            self._value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+    def set_function(self, function):
+        """Reads the value from `function()` at scrape time (e.g. queue depth)."""
+        self._function = function
+
+    def value(self):
+        return float(self._function()) if self._function else self._value
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Cumulative bucket counts (incl. +Inf), then sum; cumulative so merged textfiles add up per bucket.
+        self._shards = _Shards(len(buckets) + 2)
+
+    def observe(self, value):
+        values = self._shards.local()
+        for i in range(bisect.bisect_left(self.buckets, value), len(self.buckets) + 1):
+            values[i] += 1
+        values[-1] += value
+
+    @contextlib.contextmanager
+    def time(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def _merge(self, bucket_index, amount):
+        self._shards.local()[bucket_index] += amount
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        return sorted(tuple(self._children.items()))
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for key, child in self._items():
+            lines.extend(self._render_child(list(zip(self.labelnames, key)), child))
+        return lines
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _render_child(self, pairs, child):
+        return [f"{self.name}{_format_labels(pairs)} {_format_value(child.value())}"]
+
+
+class Gauge(_Metric):
+    metric_type = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def _render_child(self, pairs, child):
+        try:
+            return [f"{self.name}{_format_labels(pairs)} {_format_value(child.value())}"]
+        except Exception as e: # A failing callback must not break the whole scrape
+            print(f"  [metrics] ⚠️ Could not read {self.name}: {e}")
+            return []
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _render_child(self, pairs, child):
+        totals = child._shards.totals()
+        lines = [f"{self.name}_bucket{_format_labels(pairs + [('le', _format_value(le))])} {_format_value(totals[i])}"
+                 for i, le in enumerate(self.buckets + (float("inf"),))]
+        lines.append(f"{self.name}_sum{_format_labels(pairs)} {_format_value(totals[-1])}")
+        lines.append(f"{self.name}_count{_format_labels(pairs)} {_format_value(totals[len(self.buckets)])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def merge_text(self, text):
+        """
+        Adds the counter and histogram samples of another process's exposition (e.g. a generator run's
+        textfile) into the matching metrics here. Gauges are point-in-time values and are skipped.
+        """
+        for line in text.splitlines():
+            match = SAMPLE_PATTERN.match(line.strip())
+            if not match:
+                continue
+            name, label_text, value = match.groups()
+            labels = dict((key, raw.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+                          for key, raw in LABEL_PATTERN.findall(label_text or ""))
+            metric = self._metrics.get(name)
+            if isinstance(metric, Counter) and set(labels) == set(metric.labelnames):
+                metric.labels(**labels).inc(float(value))
+                continue
+            base, _, suffix = name.rpartition("_")
+            metric = self._metrics.get(base)
+            if not isinstance(metric, Histogram):
+                continue
+            le = labels.pop("le", None)
+            if set(labels) != set(metric.labelnames):
+                continue
+            child = metric.labels(**labels)
+            if suffix == "bucket" and le is not None:
+                bounds = metric.buckets + (float("inf"),)
+                le_value = float(le)
+                if le_value in bounds:
+                    child._merge(bounds.index(le_value), float(value))
+            elif suffix == "sum":
+                child._merge(len(metric.buckets) + 1, float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+# --- Generator ---
+GENERATOR_PLATFORM_SECONDS = REGISTRY.register(Histogram(
+    "appizer_generator_platform_seconds", "Generator time per platform run.", ("platform", "status")))
+GENERATOR_STAGE_SECONDS = REGISTRY.register(Histogram(
+    "appizer_generator_stage_seconds", "Generator time per modifier stage.", ("platform", "stage")))
+ICON_GENERATION_SECONDS = REGISTRY.register(Histogram(
+    "appizer_icon_generation_seconds", "Time to produce one launcher icon set.", ("source",)))
+BYTES_COPIED = REGISTRY.register(Counter(
+    "appizer_bytes_copied_total", "Bytes copied into platform workspaces.", ("kind",)))
+FILES_COPIED = REGISTRY.register(Counter(
+    "appizer_files_copied_total", "Files copied into platform workspaces.", ("kind",)))
+
+# --- Build cache (utils/remote_cache.py) ---
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "appizer_cache_requests_total", "Build cache lookups by tier and result.", ("tier", "result")))
+CACHE_BYTES = REGISTRY.register(Counter(
+    "appizer_cache_bytes_total", "Uncompressed bytes fetched from or stored in the build cache.", ("direction",)))
+
+# --- Build farm (build_worker.py) ---
+QUEUE_JOBS = REGISTRY.register(Gauge(
+    "appizer_queue_jobs", "Jobs in the shared build queue by status.", ("status",)))
+QUEUE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "appizer_queue_wait_seconds", "Time from enqueue to the first claim of a job."))
+BUILD_SECONDS = REGISTRY.register(Histogram(
+    "appizer_build_seconds", "Wall time per build attempt.", ("platform", "status")))
+WORKER_CAPACITY = REGISTRY.register(Gauge(
+    "appizer_worker_capacity", "Concurrent builds this worker runs at most."))
+WORKER_BUSY_SLOTS = REGISTRY.register(Gauge(
+    "appizer_worker_busy_slots", "Builds this worker is running right now."))
+WORKER_RESERVED = REGISTRY.register(Gauge(
+    "appizer_worker_reserved", "CPU and memory (MB) reserved by this worker's running builds.", ("resource",)))
+
+
+class StageStopwatch:
+    """
+    Times consecutive stages without re-indenting them: start("icons") closes the previous
+    stage and opens the next; stop() closes the last one.
+    """
+
+    def __init__(self, platform_name, histogram=GENERATOR_STAGE_SECONDS):
+        self.platform_name = platform_name
+        self.histogram = histogram
+        self._stage = None
+        self._started = 0.0
+
+    def start(self, stage):
+        self.stop()
+        self._stage, self._started = stage, time.perf_counter()
+
+    def stop(self):
+        if self._stage is not None:
+            self.histogram.labels(platform=self.platform_name, stage=self._stage).observe(time.perf_counter() - self._started)
+            self._stage = None
+
+
+def write_textfile(path, registry=REGISTRY):
+    """Writes the exposition atomically, so a node exporter never reads a half-written file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.chmod(temp_path, 0o644)
+    os.replace(temp_path, path)
+
+def write_textfile_from_env(registry=REGISTRY):
+    """
+    Adds this process's counters and histograms to $APPIZER_METRICS_TEXTFILE (if set), so the short-lived
+    processes of one or many builds (main.py, artifact_cache.py, ...) accumulate into one file.
+    Call it once, at process exit; long-running processes serve_metrics() instead.
+    Errors are reported, never raised.
+    """
+    path = os.environ.get(METRICS_TEXTFILE_ENV)
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX) # Concurrent builds on one node share the file
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    registry.merge_text(f.read())
+            write_textfile(path, registry)
+    except OSError as e:
+        print(f"  [metrics] ⚠️ Could not write metrics to {path}: {e}")
+
+
+def serve_metrics(port, host="0.0.0.0", registry=REGISTRY):
+    """Serves GET /metrics from a daemon thread. Returns the server (call shutdown() to stop it)."""
+    # Only the long-running workers serve metrics, so one-shot generator runs never load http.server (and http.client)
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass # Scrapes every few seconds would drown the build logs
+
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    print(f"  [metrics] 📊 Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,98 @@
+# generator/utils/placeholder_scan.py
+import os
+import re
+import mmap
+from concurrent.futures import ThreadPoolExecutor
+
+# Same token shape replace_placeholders() fills in.
+PLACEHOLDER_PATTERN = re.compile(rb"\{\{[A-Z0-9_]+\}\}")
+
+# A line containing this marker may keep its {{TOKEN}} (e.g., documentation inside a template).
+ALLOWLIST_MARKER = b"appizer:allow-placeholder"
+
+# Never rendered by the generator: VCS/IDE metadata and build outputs.
+SKIPPED_DIR_NAMES = {".git", ".gradle", ".idea", "build", "node_modules"}
+
+# Per-platform dirs holding the user's synced webapp, which is copied verbatim and may use {{...}} itself.
+PLATFORM_SCAN_EXCLUDES = {
+    "android": ("app/src/main/assets",),
+    "windows": ("frontend",),
+}
+
+# Known binary formats, skipped without opening them.
+BINARY_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".jar", ".aar", ".apk", ".zip",
+                     ".keystore", ".jks", ".so", ".dex", ".exe", ".ttf", ".otf", ".woff", ".woff2")
+
+BINARY_SNIFF_BYTES = 8192
+
+def _scan_file(file_path):
+    """Returns [(line_number, token, line_text)] for one file; binary and empty files yield nothing."""
+    try:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if b"\0" in mm[:BINARY_SNIFF_BYTES] or mm.find(b"{{") == -1:
+                    return []
+                findings = []
+                line_number, counted_up_to = 1, 0
+                for match in PLACEHOLDER_PATTERN.finditer(mm):
+                    start = match.start()
+                    line_number += mm[counted_up_to:start].count(b"\n")
+                    counted_up_to = start
+                    line_start = mm.rfind(b"\n", 0, start) + 1
+                    line_end = mm.find(b"\n", start)
+                    line = mm[line_start:line_end if line_end != -1 else len(mm)]
+                    if ALLOWLIST_MARKER in line:
+                        continue
+                    findings.append((line_number, match.group().decode("ascii"), line.decode("utf-8", "replace").strip()))
+                return findings
+    except (OSError, ValueError) as e:
+        print(f"  [placeholder_scan] ⚠️ Could not scan {file_path}: {e}")
+        return []
+
+def iter_scannable_files(root, exclude=()):
+    """Yields every file under `root`, minus SKIPPED_DIR_NAMES, `exclude` (paths relative to root) and binaries."""
+    root = os.path.normpath(root)
+    excluded = {os.path.join(root, os.path.normpath(path)) for path in exclude}
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIR_NAMES and os.path.join(current, d) not in excluded)
+        for name in sorted(files):
+            if not name.lower().endswith(BINARY_EXTENSIONS):
+                yield os.path.join(current, name)
+
+def scan_for_placeholders(root, exclude=(), max_workers=None):
+    """
+    Finds {{TOKEN}} literals left behind after rendering.
+
+    Args:
+        root (str): The rendered workspace (e.g., '/app/android').
+        exclude (iterable): Paths relative to `root` that are not scanned.
+        max_workers (int, optional): Thread pool size. Defaults to ThreadPoolExecutor's own default.
+
+    Returns:
+        list: (relative_path, line_number, token, line_text) tuples, sorted by path and line.
+    """
+    files = list(iter_scannable_files(root, exclude))
+    findings = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for file_path, file_findings in zip(files, pool.map(_scan_file, files)):
+            rel_path = os.path.relpath(file_path, root)
+            findings.extend((rel_path, line_number, token, text) for line_number, token, text in file_findings)
+    return findings
+
+def check_rendered_workspace(root, platform_name):
+    """
+    Scans a rendered platform workspace and reports every unresolved placeholder.
+
+    Raises:
+        ValueError: If any placeholder is left, so the run fails before the (slow) native build starts.
+    """
+    findings = scan_for_placeholders(root, PLATFORM_SCAN_EXCLUDES.get(platform_name, ()))
+    if not findings:
+        print(f"  [placeholder_scan] ✅ No unresolved placeholders in {root}.")
+        return
+    for rel_path, line_number, token, text in findings:
+        print(f"  [placeholder_scan] ❌ {rel_path}:{line_number}: {token} in: {text}")
+    tokens = sorted({token for _, _, token, _ in findings})
+    raise ValueError(f"{len(findings)} unresolved placeholder(s) in {platform_name} workspace: {', '.join(tokens)}")
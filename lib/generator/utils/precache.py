@@ -0,0 +1,148 @@
+# generator/utils/precache.py
+import os
+import json
+import hashlib
+
+PRECACHE_MANIFEST_NAME = "precache-manifest.json"
+SERVICE_WORKER_NAME = "sw.js"
+
+# Files the generator itself writes into an asset root; never listed in the manifest.
+GENERATED_ASSET_NAMES = {PRECACHE_MANIFEST_NAME, SERVICE_WORKER_NAME}
+
+SERVICE_WORKER_TEMPLATE = """// Generated by the appizer generator from {manifest_name}. Do not edit.
+const CACHE_PREFIX = "appizer-precache-";
+const CACHE_NAME = CACHE_PREFIX + "{version}";
+const PRECACHE_URLS = {urls};
+
+self.addEventListener("install", (event) => {{
+  event.waitUntil(
+    caches.open(CACHE_NAME).then((cache) => cache.addAll(PRECACHE_URLS)).then(() => self.skipWaiting())
+  );
+}});
+
+self.addEventListener("activate", (event) => {{
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(
+        keys.filter((key) => key.startsWith(CACHE_PREFIX) && key !== CACHE_NAME).map((key) => caches.delete(key))
+      ))
+      .then(() => self.clients.claim())
+  );
+}});
+
+// Cache-first: precached files are content-addressed by the manifest version, so they never need revalidation.
+self.addEventListener("fetch", (event) => {{
+  if (event.request.method !== "GET") return;
+  event.respondWith(
+    caches.match(event.request, {{ ignoreSearch: true }}).then((cached) => cached || fetch(event.request))
+  );
+}});
+"""
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Returns the SHA-256 hex digest of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def precache_version(files):
+    """Short hash over all (path, sha256) entries; changes whenever any file does."""
+    version_digest = hashlib.sha256()
+    for rel_path in sorted(files):
+        version_digest.update(f"{rel_path}\0{files[rel_path]['sha256']}\n".encode("utf-8"))
+    return version_digest.hexdigest()[:16]
+
+def build_precache_manifest(assets_dir):
+    """
+    Hashes every file under `assets_dir` into a manifest.
+
+    Returns:
+        dict: {"version": <hash over all entries>, "files": {relpath: {"sha256": ..., "size": ...}}}
+              with paths sorted, so identical bundles always give identical manifests.
+    """
+    files = {}
+    for root, dirs, names in os.walk(assets_dir):
+        dirs.sort()
+        for name in sorted(names):
+            file_path = os.path.join(root, name)
+            rel_path = os.path.relpath(file_path, assets_dir).replace(os.sep, "/")
+            if rel_path in GENERATED_ASSET_NAMES:
+                continue
+            files[rel_path] = {"sha256": hash_file(file_path), "size": os.path.getsize(file_path)}
+    return {"version": precache_version(files), "files": files}
+
+def verify_precache_manifest(assets_dir, manifest):
+    """
+    Checks the files under `assets_dir` against a manifest.
+
+    Returns:
+        list: Human-readable problems (missing, size or hash mismatch). Empty if everything matches.
+    """
+    problems = []
+    for rel_path, entry in manifest.get("files", {}).items():
+        file_path = os.path.join(assets_dir, rel_path)
+        if not os.path.isfile(file_path):
+            problems.append(f"missing: {rel_path}")
+        elif os.path.getsize(file_path) != entry["size"]:
+            problems.append(f"size mismatch: {rel_path}")
+        elif hash_file(file_path) != entry["sha256"]:
+            problems.append(f"hash mismatch: {rel_path}")
+    return problems
+
+def verify_synced_bundle(source_dir, assets_dir):
+    """
+    Builds the manifest from the source webapp dir and verifies the copy in `assets_dir` against it.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        RuntimeError: If the copied bundle does not match the source.
+    """
+    print(f"  [precache] Building precache manifest for {source_dir}...")
+    manifest = build_precache_manifest(source_dir)
+    problems = verify_precache_manifest(assets_dir, manifest)
+    if problems:
+        for problem in problems:
+            print(f"  [precache] ❌ {problem}")
+        raise RuntimeError(f"Asset bundle in {assets_dir} failed integrity check ({len(problems)} problem(s)).")
+    return manifest
+
+def save_precache_files(assets_dir, manifest, service_worker=False, updated_paths=()):
+    """
+    Writes the manifest (and optionally a cache-first service worker) into `assets_dir`.
+
+    Args:
+        assets_dir (str): The platform asset root.
+        manifest (dict): From build_precache_manifest / verify_synced_bundle.
+        service_worker (bool): Also emit sw.js that precaches every manifest entry.
+        updated_paths (iterable): Relative paths in `assets_dir` written or rewritten after the manifest was
+            built (e.g., app-config.js, token-substituted bundles); they are re-hashed from `assets_dir`.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    for rel_path in updated_paths:
+        file_path = os.path.join(assets_dir, rel_path)
+        manifest["files"][rel_path] = {"sha256": hash_file(file_path), "size": os.path.getsize(file_path)}
+    if updated_paths:
+        manifest["files"] = dict(sorted(manifest["files"].items()))
+        manifest["version"] = precache_version(manifest["files"])
+
+    manifest_path = os.path.join(assets_dir, PRECACHE_MANIFEST_NAME)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"  [precache] ✅ Wrote {PRECACHE_MANIFEST_NAME} ({len(manifest['files'])} files, version {manifest['version']}).")
+
+    if service_worker:
+        urls = ["./" + rel_path for rel_path in manifest["files"]]
+        with open(os.path.join(assets_dir, SERVICE_WORKER_NAME), "w", encoding="utf-8") as f:
+            f.write(SERVICE_WORKER_TEMPLATE.format(
+                manifest_name=PRECACHE_MANIFEST_NAME,
+                version=manifest["version"],
+                urls=json.dumps(urls, indent=2),
+            ))
+        print(f"  [precache] ✅ Wrote {SERVICE_WORKER_NAME}. Register it from your page to enable offline caching.")
+    return manifest
@@ -0,0 +1,254 @@
+# generator/utils/remote_cache.py
+import os
+import re
+import gzip
+import json
+import shutil
+import tarfile
+import hashlib
+import tempfile
+
+from utils.metrics import CACHE_REQUESTS, CACHE_BYTES
+from utils.reproducible import normalize_tarinfo
+
+# Env overrides for the `cache` config section (the build farm sets these per node).
+CACHE_DIR_ENV = "APPIZER_CACHE_DIR"
+REMOTE_CACHE_URL_ENV = "APPIZER_REMOTE_CACHE_URL"
+
+CACHE_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# Directory names never part of a fingerprint (build outputs, VCS/IDE metadata).
+FINGERPRINT_SKIPPED_DIRS = {".git", ".gradle", ".idea", "build", "node_modules"}
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+class RemoteCacheError(Exception):
+    """A remote cache request failed (network error or unexpected HTTP status)."""
+
+
+def fingerprint(*parts):
+    """
+    Content fingerprint (SHA-256 hex) over values and paths.
+
+    Args:
+        *parts: str/bytes/int values, dicts/lists (hashed as sorted JSON), or ("path", <file or dir>) tuples,
+            whose content is hashed (dirs walked in sorted order, skipping FINGERPRINT_SKIPPED_DIRS).
+
+    Returns:
+        str: 64 hex chars, usable as a cache key.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, tuple) and len(part) == 2 and part[0] == "path":
+            _fingerprint_path(digest, part[1])
+        elif isinstance(part, bytes):
+            digest.update(b"b\0" + part + b"\0")
+        elif isinstance(part, (dict, list)):
+            digest.update(b"j\0" + json.dumps(part, sort_keys=True, default=str).encode("utf-8") + b"\0")
+        else:
+            digest.update(b"s\0" + str(part).encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+def _fingerprint_path(digest, path):
+    if os.path.isfile(path):
+        digest.update(b"f\0")
+        _update_with_file(digest, path)
+        return
+    if not os.path.isdir(path):
+        digest.update(b"missing\0" + path.encode("utf-8") + b"\0")
+        return
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in FINGERPRINT_SKIPPED_DIRS)
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            digest.update(b"f\0" + os.path.relpath(file_path, path).replace(os.sep, "/").encode("utf-8") + b"\0")
+            _update_with_file(digest, file_path)
+
+def _update_with_file(digest, file_path):
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    digest.update(b"\0")
+
+
+class LocalCache:
+    """Blobs on local disk under <root>/<key[:2]>/<key>, written atomically."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key, dest_path):
+        """Copies the blob for `key` to `dest_path`. Returns False on a miss."""
+        try:
+            shutil.copyfile(self._path(key), dest_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def put(self, key, src_path):
+        blob_path = self._path(key)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(blob_path), prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copyfile(src_path, temp_path)
+            os.replace(temp_path, blob_path) # Readers never see a partial blob
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+class HttpCache:
+    """
+    GET/PUT-by-key HTTP protocol (see cache_server.py):
+        GET <base_url>/cas/<key>  -> 200 with the blob (may be Content-Encoding: gzip), or 404
+        PUT <base_url>/cas/<key>  <- gzip-compressed body with Content-Encoding: gzip
+    """
+
+    def __init__(self, base_url, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def get(self, key, dest_path):
+        import urllib.error
+        import urllib.request # Loads http.client and ssl, so only when a remote cache is configured
+        request = urllib.request.Request(f"{self.base_url}/cas/{key}", headers={"Accept-Encoding": "gzip"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response, open(dest_path, "wb") as dst:
+                source = gzip.GzipFile(fileobj=response) if response.headers.get("Content-Encoding") == "gzip" else response
+                shutil.copyfileobj(source, dst, COPY_CHUNK_SIZE)
+            return True
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return False
+            raise RemoteCacheError(f"GET {key[:12]}: HTTP {e.code}") from e
+        except (urllib.error.URLError, OSError, EOFError) as e:
+            raise RemoteCacheError(f"GET {key[:12]}: {e}") from e
+
+    def put(self, key, src_path):
+        import urllib.error
+        import urllib.request
+        with tempfile.TemporaryFile() as compressed:
+            with open(src_path, "rb") as src, gzip.GzipFile(fileobj=compressed, mode="wb", compresslevel=6, mtime=0) as gz:
+                shutil.copyfileobj(src, gz, COPY_CHUNK_SIZE)
+            size = compressed.tell()
+            compressed.seek(0)
+            request = urllib.request.Request(f"{self.base_url}/cas/{key}", data=compressed, method="PUT", headers={
+                "Content-Type": "application/octet-stream",
+                "Content-Encoding": "gzip",
+                "Content-Length": str(size),
+            })
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError) as e:
+                raise RemoteCacheError(f"PUT {key[:12]}: {e}") from e
+
+
+class BuildCache:
+    """
+    Local cache in front of an optional remote one. Remote failures are logged and the cache
+    degrades to local-only for the rest of the run, so a flaky cache server never fails a build.
+    """
+
+    def __init__(self, local, remote=None):
+        self.local = local
+        self.remote = remote
+        self.stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "uploads": 0, "remote_errors": 0}
+
+    def _remote_failed(self, error):
+        self.stats["remote_errors"] += 1
+        CACHE_REQUESTS.labels(tier="remote", result="error").inc()
+        print(f"  [cache] ⚠️ Remote cache unavailable ({error}); continuing with the local cache only.")
+        self.remote = None
+
+    def get_file(self, key, dest_path):
+        """Fetches the blob for `key` into `dest_path`. Returns True on a hit."""
+        if self.local and self.local.get(key, dest_path):
+            self.stats["local_hits"] += 1
+            CACHE_REQUESTS.labels(tier="local", result="hit").inc()
+            CACHE_BYTES.labels(direction="download").inc(os.path.getsize(dest_path))
+            return True
+        if self.remote:
+            try:
+                if self.remote.get(key, dest_path):
+                    self.stats["remote_hits"] += 1
+                    CACHE_REQUESTS.labels(tier="remote", result="hit").inc()
+                    CACHE_BYTES.labels(direction="download").inc(os.path.getsize(dest_path))
+                    if self.local:
+                        self.local.put(key, dest_path) # Next lookup on this node stays local
+                    return True
+            except RemoteCacheError as e:
+                self._remote_failed(e)
+        self.stats["misses"] += 1
+        CACHE_REQUESTS.labels(tier="local" if self.remote is None else "remote", result="miss").inc()
+        return False
+
+    def put_file(self, key, src_path):
+        CACHE_BYTES.labels(direction="upload").inc(os.path.getsize(src_path))
+        if self.local:
+            self.local.put(key, src_path)
+        if self.remote:
+            try:
+                self.remote.put(key, src_path)
+                self.stats["uploads"] += 1
+            except RemoteCacheError as e:
+                self._remote_failed(e)
+
+    def get_dir(self, key, dest_dir):
+        """Restores a directory stored with put_dir/put_files into `dest_dir`. Returns True on a hit."""
+        with tempfile.NamedTemporaryFile(suffix=".tar") as archive:
+            if not self.get_file(key, archive.name):
+                return False
+            os.makedirs(dest_dir, exist_ok=True)
+            with tarfile.open(archive.name, "r") as tar:
+                tar.extractall(dest_dir, filter="data")
+        return True
+
+    def put_dir(self, key, src_dir):
+        """Stores every file under `src_dir` (paths relative to it)."""
+        self.put_files(key, {os.path.relpath(os.path.join(root, name), src_dir): os.path.join(root, name)
+                             for root, _, files in os.walk(src_dir) for name in files})
+
+    def put_files(self, key, files):
+        """Stores {archive_path: source_path} as one blob; get_dir restores them under the given paths."""
+        with tempfile.NamedTemporaryFile(suffix=".tar") as archive:
+            with tarfile.open(archive.name, "w") as tar:
+                for archive_path in sorted(files):
+                    tar.add(files[archive_path], arcname=archive_path, recursive=False, filter=normalize_tarinfo)
+            self.put_file(key, archive.name)
+
+    def report(self):
+        stats = self.stats
+        print(f"  [cache] Local hits: {stats['local_hits']}, remote hits: {stats['remote_hits']}, misses: {stats['misses']}, "
+              f"uploads: {stats['uploads']}, remote errors: {stats['remote_errors']}.")
+
+
+def create_build_cache(config):
+    """
+    Builds the cache described by the top-level `cache` config section
+    ({"local_dir": ..., "remote_url": ..., "timeout": ...}); $APPIZER_CACHE_DIR and
+    $APPIZER_REMOTE_CACHE_URL override it.
+
+    Returns:
+        BuildCache|None: None when neither a local dir nor a remote URL is configured.
+    """
+    cache_config = (config or {}).get("cache") or {}
+    local_dir = os.environ.get(CACHE_DIR_ENV) or cache_config.get("local_dir") or ""
+    remote_url = os.environ.get(REMOTE_CACHE_URL_ENV) or cache_config.get("remote_url") or ""
+    if not local_dir and not remote_url:
+        return None
+    local = None
+    if local_dir:
+        try:
+            os.makedirs(local_dir, exist_ok=True)
+            local = LocalCache(local_dir)
+        except OSError as e:
+            print(f"  [cache] ⚠️ Local cache dir {local_dir} is not usable ({e}).")
+    remote = HttpCache(remote_url, cache_config.get("timeout", 10)) if remote_url else None
+    if local is None and remote is None:
+        return None
+    return BuildCache(local, remote)
@@ -0,0 +1,126 @@
+# generator/utils/scheduler.py
+
+# Resources one job of each type reserves on a worker node. A job payload may override them
+# with "cpus"/"memory_mb" (e.g., a large app that needs a bigger Gradle heap).
+JOB_TYPE_BUDGETS = {
+    "android": {"cpus": 4, "memory_mb": 6144},  # Gradle + Kotlin daemons, R8, aapt2
+    "all": {"cpus": 4, "memory_mb": 6144},      # Platforms build one after another; Android dominates
+    "windows": {"cpus": 2, "memory_mb": 2048},  # go build + wails
+    "preview": {"cpus": 0.5, "memory_mb": 256}, # Generator only, no native build
+}
+DEFAULT_JOB_BUDGET = {"cpus": 2, "memory_mb": 2048}
+
+# Lower runs first. Payloads name a class or give a number.
+PRIORITY_CLASSES = {"interactive": 0, "default": 50, "batch": 100}
+DEFAULT_PRIORITY = PRIORITY_CLASSES["default"]
+
+# Waiting this long improves a job's effective priority by one level, so batch jobs are never starved.
+AGING_SECONDS_PER_LEVEL = 6
+
+# Jobs may only be preempted by jobs whose base priority is at least this many levels more urgent (never within a class).
+PREEMPTION_PRIORITY_GAP = PRIORITY_CLASSES["default"]
+
+def job_type(payload):
+    """'preview' for generator-only jobs, otherwise the platform being built."""
+    return "preview" if payload.get("preview") else payload.get("platform", "android")
+
+def job_budget(payload):
+    """{"cpus": float, "memory_mb": int} the job reserves while it runs."""
+    budget = dict(JOB_TYPE_BUDGETS.get(job_type(payload), DEFAULT_JOB_BUDGET))
+    for key in ("cpus", "memory_mb"):
+        if payload.get(key):
+            budget[key] = payload[key]
+    return budget
+
+def priority_value(priority):
+    """Maps 'interactive'/'default'/'batch' or a number to the numeric priority (lower runs first)."""
+    if priority is None:
+        return DEFAULT_PRIORITY
+    if isinstance(priority, str) and not priority.lstrip("-").isdigit():
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority '{priority}'. Use one of {', '.join(PRIORITY_CLASSES)} or a number.")
+        return PRIORITY_CLASSES[priority]
+    return int(priority)
+
+def effective_priority(job, now):
+    return job["priority"] - max(0.0, now - job["created_at"]) / AGING_SECONDS_PER_LEVEL
+
+def scheduling_order(queued, running, now):
+    """
+    Orders queued jobs: by effective (aged) priority, then fair share, then age.
+    Fair share: a tenant with fewer reserved CPUs right now goes before one that already holds more,
+    so one tenant's batch of 200 builds cannot lock everyone else out.
+    """
+    tenant_cpus = {}
+    for job in running:
+        tenant_cpus[job["tenant"]] = tenant_cpus.get(job["tenant"], 0.0) + job["cpus"]
+    return sorted(queued, key=lambda job: (round(effective_priority(job, now)), tenant_cpus.get(job["tenant"], 0.0),
+                                           job["available_at"], job["created_at"]))
+
+def fits(job, free):
+    return job["cpus"] <= free["cpus"] + 1e-9 and job["memory_mb"] <= free["memory_mb"]
+
+def pick_job(queued, running, free, now):
+    """
+    The first job in scheduling order that fits the claiming node's free budget, or None.
+    Smaller jobs backfill around one that does not fit; aging keeps the big one moving up.
+    """
+    for job in scheduling_order(queued, running, now):
+        if fits(job, free):
+            return job
+    return None
+
+def pick_preemption_victims(job, own_running, free):
+    """
+    Running jobs on the claiming node to stop so `job` fits, least urgent first, or [] if `job`
+    cannot be made to fit by preempting only jobs at least PREEMPTION_PRIORITY_GAP levels less urgent.
+    Base priorities only: aging orders the queue but never lets a job preempt one of its own class,
+    which would otherwise re-queue (already aged) and preempt its replacement in turn.
+    """
+    candidates = sorted((running for running in own_running if running["priority"] - job["priority"] >= PREEMPTION_PRIORITY_GAP),
+                        key=lambda running: (-running["priority"], -(running["started_at"] or 0)))
+    victims = []
+    freed = dict(free)
+    for victim in candidates:
+        if fits(job, freed):
+            break
+        victims.append(victim)
+        freed = {"cpus": freed["cpus"] + victim["cpus"], "memory_mb": freed["memory_mb"] + victim["memory_mb"]}
+    return victims if fits(job, freed) else []
+
+def average_durations(finished):
+    """Mean successful run time per job type from (job_type, seconds) pairs."""
+    totals = {}
+    for job_type_name, seconds in finished:
+        total, count = totals.get(job_type_name, (0.0, 0))
+        totals[job_type_name] = (total + seconds, count + 1)
+    return {name: total / count for name, (total, count) in totals.items()}
+
+def estimate_wait(job, queued, running, durations, now):
+    """
+    Queue position and a rough ETA (seconds until the job finishes) for a queued or running job.
+    The farm's parallelism is taken as the number of builds running now (at least one).
+
+    Returns:
+        tuple: (position, eta_seconds). position is 0 once the job runs; eta is None without history.
+    """
+    if job["status"] == "running":
+        position = 0
+    else:
+        order = scheduling_order(queued, running, now)
+        order_ids = [other["id"] for other in order]
+        ahead = order[:order_ids.index(job["id"])] if job["id"] in order_ids else order
+        position = len(ahead) + 1
+
+    default_duration = sum(durations.values()) / len(durations) if durations else None
+    own_duration = durations.get(job["job_type"], default_duration)
+    if own_duration is None:
+        return position, None
+    if job["status"] == "running":
+        return position, max(0.0, own_duration - (now - (job["started_at"] or now)))
+
+    remaining_running = sum(max(0.0, durations.get(other["job_type"], own_duration) - (now - (other["started_at"] or now)))
+                            for other in running)
+    queued_work = sum(durations.get(other["job_type"], own_duration) for other in ahead)
+    parallelism = max(1, len(running))
+    return position, (remaining_running + queued_work) / parallelism + own_duration
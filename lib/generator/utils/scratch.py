@@ -0,0 +1,255 @@
+# generator/utils/scratch.py
+import os
+import json
+import time
+import shutil
+import socket
+import tempfile
+
+# Per-job scratch space: downloads, intermediate images and the merged config of one job live in a
+# directory of their own, so concurrent jobs on one host never share a path. It sits on tmpfs when the
+# host has memory to spare and on disk otherwise, is capped by a per-job quota and is removed when the
+# job ends; directories left behind by killed jobs are reaped when the next job starts.
+SCRATCH_ROOT_ENV = "APPIZER_SCRATCH_ROOT"   # Parent of the per-job dirs; chosen automatically when unset
+SCRATCH_DIR_ENV = "APPIZER_SCRATCH_DIR"     # A job's dir, handed down to the processes of that job
+SCRATCH_QUOTA_ENV = "APPIZER_SCRATCH_QUOTA_MB"
+DEFAULT_SCRATCH_QUOTA_MB = 512
+
+TMPFS_ROOT = "/dev/shm"
+SCRATCH_DIR_NAME = "appizer-scratch"
+# tmpfs pages count as memory: only used when this many quotas' worth is still available, so Gradle keeps its share.
+TMPFS_MEMORY_HEADROOM = 4
+
+OWNER_FILE = ".owner"
+# Dirs whose owner cannot be checked (other host, unreadable owner file) are reaped after this long.
+STALE_AFTER_SECONDS = 24 * 3600
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+class ScratchQuotaError(Exception):
+    """A job tried to use more scratch space than its quota."""
+
+def scratch_quota_bytes():
+    """The per-job quota from $APPIZER_SCRATCH_QUOTA_MB (DEFAULT_SCRATCH_QUOTA_MB if unset or invalid)."""
+    value = os.environ.get(SCRATCH_QUOTA_ENV, "")
+    try:
+        return max(1, int(value)) * 1024 * 1024
+    except ValueError:
+        if value:
+            print(f"  [scratch] ⚠️ Invalid {SCRATCH_QUOTA_ENV}={value!r}. Using {DEFAULT_SCRATCH_QUOTA_MB} MB.")
+        return DEFAULT_SCRATCH_QUOTA_MB * 1024 * 1024
+
+def _available_memory_bytes(cgroup_root="/sys/fs/cgroup"):
+    """MemAvailable, capped by what is left under a cgroup v2 memory limit; None if unknown."""
+    available = None
+    try:
+        with open("/proc/meminfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    available = int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(os.path.join(cgroup_root, "memory.max"), "r", encoding="utf-8") as f:
+            limit = f.read().strip()
+        with open(os.path.join(cgroup_root, "memory.current"), "r", encoding="utf-8") as f:
+            current = int(f.read().strip())
+        if limit != "max":
+            left = int(limit) - current
+            available = left if available is None else min(available, left)
+    except (OSError, ValueError):
+        pass
+    return available
+
+def default_scratch_root(quota_bytes=None):
+    """
+    $APPIZER_SCRATCH_ROOT if set; else a dir on tmpfs (/dev/shm) if it and the host's memory have room
+    for TMPFS_MEMORY_HEADROOM quotas; else one in the system temp dir (disk).
+    """
+    if os.environ.get(SCRATCH_ROOT_ENV):
+        return os.environ[SCRATCH_ROOT_ENV]
+    quota_bytes = quota_bytes or scratch_quota_bytes()
+    try:
+        tmpfs = os.statvfs(TMPFS_ROOT)
+        tmpfs_free = tmpfs.f_bavail * tmpfs.f_frsize
+    except OSError:
+        tmpfs_free = 0
+    memory = _available_memory_bytes()
+    if tmpfs_free >= quota_bytes and memory is not None and memory >= quota_bytes * TMPFS_MEMORY_HEADROOM:
+        return os.path.join(TMPFS_ROOT, SCRATCH_DIR_NAME)
+    return os.path.join(tempfile.gettempdir(), SCRATCH_DIR_NAME)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def reap_stale_scratch(root=None, max_age_seconds=STALE_AFTER_SECONDS):
+    """
+    Removes job dirs under `root` whose owner process on this host is gone, and any dir older than
+    `max_age_seconds` whose owner cannot be checked.
+
+    Returns:
+        int: Number of dirs removed.
+    """
+    root = root or default_scratch_root()
+    if not os.path.isdir(root):
+        return 0
+    reaped = 0
+    now = time.time()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if not os.path.isdir(path) or os.path.islink(path):
+            continue
+        try:
+            with open(os.path.join(path, OWNER_FILE), "r", encoding="utf-8") as f:
+                owner = json.load(f)
+            stale = owner["host"] == socket.gethostname() and not _pid_alive(int(owner["pid"]))
+        except (OSError, ValueError, KeyError, TypeError):
+            owner, stale = None, False
+        if not stale and (owner is None or owner["host"] != socket.gethostname()):
+            try:
+                stale = now - os.stat(path).st_mtime > max_age_seconds
+            except OSError:
+                continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+            reaped += 1
+    if reaped:
+        print(f"  [scratch] 🗑️ Reaped {reaped} stale scratch dir(s) in {root}.")
+    return reaped
+
+class ScratchSpace:
+    """
+    One job's scratch dir. Use as a context manager: the dir is removed on exit if this object created it.
+    An existing dir (a parent process's, via $APPIZER_SCRATCH_DIR) is used as-is and left to its owner.
+    """
+
+    def __init__(self, path, quota_bytes, owned):
+        self.path = path
+        self.quota_bytes = quota_bytes
+        self.owned = owned
+
+    @classmethod
+    def create(cls, job_name="job", root=None, quota_bytes=None, owner_pid=None):
+        """
+        Creates a fresh job dir, reaping stale ones first.
+
+        Args:
+            job_name (str): Prefix of the dir name (e.g., the build job id).
+            root (str, optional): Parent dir. Defaults to default_scratch_root().
+            quota_bytes (int, optional): Defaults to scratch_quota_bytes().
+            owner_pid (int, optional): Process whose exit makes the dir stale. Defaults to this one.
+        """
+        quota_bytes = quota_bytes or scratch_quota_bytes()
+        root = root or default_scratch_root(quota_bytes)
+        os.makedirs(root, mode=0o700, exist_ok=True)
+        reap_stale_scratch(root)
+        path = tempfile.mkdtemp(dir=root, prefix=f"{job_name}-")
+        with open(os.path.join(path, OWNER_FILE), "w", encoding="utf-8") as f:
+            json.dump({"host": socket.gethostname(), "pid": owner_pid or os.getpid(), "created": int(time.time())}, f)
+        return cls(path, quota_bytes, owned=True)
+
+    def join(self, *parts):
+        """
+        Path of `parts` inside the scratch dir, with its parent dirs created.
+
+        Raises:
+            ScratchQuotaError: If the job already uses its whole quota.
+        """
+        self.check_quota()
+        path = os.path.join(self.path, *parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def mkdtemp(self, prefix="tmp-"):
+        """
+        A new, unique subdir (for callers that need several at once).
+
+        Raises:
+            ScratchQuotaError: If the job already uses its whole quota.
+        """
+        self.check_quota()
+        return tempfile.mkdtemp(dir=self.path, prefix=prefix)
+
+    def usage_bytes(self):
+        used = 0
+        for current_root, _dirs, files in os.walk(self.path):
+            for name in files:
+                try:
+                    used += os.lstat(os.path.join(current_root, name)).st_size
+                except OSError:
+                    pass
+        return used
+
+    def check_quota(self, extra_bytes=0):
+        """
+        Called before handing out new paths (join, mkdtemp) and after large writes (staged icons, patched APKs),
+        so writers other than download() stay within the quota too.
+
+        Raises:
+            ScratchQuotaError: If the dir plus `extra_bytes` would exceed the quota.
+        """
+        used = self.usage_bytes() + extra_bytes
+        if used > self.quota_bytes:
+            raise ScratchQuotaError(f"Scratch space of {self.path} would grow to {used // (1024 * 1024)} MB "
+                                    f"(quota {self.quota_bytes // (1024 * 1024)} MB, see {SCRATCH_QUOTA_ENV}).")
+
+    def download(self, url, name):
+        """
+        Streams `url` into the scratch dir, stopping as soon as it would exceed the quota.
+
+        Returns:
+            str: The downloaded file's path.
+
+        Raises:
+            ScratchQuotaError: If the download does not fit.
+        """
+        import urllib.request # Loads http.client and ssl, so only when something is actually downloaded
+        path = self.join(name)
+        budget = self.quota_bytes - self.usage_bytes()
+        written = 0
+        try:
+            with urllib.request.urlopen(url) as response, open(path, "wb") as f:
+                length = response.headers.get("Content-Length")
+                if length and length.isdigit() and int(length) > budget:
+                    raise ScratchQuotaError(f"{url} is {int(length) // (1024 * 1024)} MB; only {budget // (1024 * 1024)} MB "
+                                            f"of scratch quota left (see {SCRATCH_QUOTA_ENV}).")
+                for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_BYTES), b""):
+                    written += len(chunk)
+                    if written > budget:
+                        raise ScratchQuotaError(f"{url} exceeds the {budget // (1024 * 1024)} MB of scratch quota left "
+                                                f"(see {SCRATCH_QUOTA_ENV}).")
+                    f.write(chunk)
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        return path
+
+    def cleanup(self):
+        if self.owned:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
+        return False
+
+def job_scratch(job_name="job"):
+    """
+    The scratch space for the current job: the dir in $APPIZER_SCRATCH_DIR if a parent process
+    (entrypoint.sh, build_worker.py) set one up, else a new one owned and removed by the caller.
+
+    Returns:
+        ScratchSpace: Use as a context manager.
+    """
+    existing = os.environ.get(SCRATCH_DIR_ENV)
+    if existing and os.path.isdir(existing):
+        return ScratchSpace(existing, scratch_quota_bytes(), owned=False)
+    return ScratchSpace.create(job_name)
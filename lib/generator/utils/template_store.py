@@ -0,0 +1,251 @@
+# generator/utils/template_store.py
+import os
+import re
+import json
+import stat
+import shutil
+import hashlib
+import tempfile
+
+# The template-app, stored as one content-addressed bundle per platform (built into the image by the Dockerfile).
+TEMPLATE_STORE_ENV = "APPIZER_TEMPLATE_STORE"
+DEFAULT_TEMPLATE_STORE = "/opt/appizer/templates"
+INDEX_NAME = "index.json"
+CHUNK_SIZE = 1024 * 1024
+# Templates are materialized into each run's own workspace (entrypoint.sh's /app, a build worker's job dir),
+# so an absolute /app/... path in a template file only works for some runs.
+ABSOLUTE_WORKSPACE_PATH = re.compile(rb"(?<![\w.-])/app/")
+
+class TemplateStoreError(Exception):
+    """A template bundle is missing, or a stored object does not match its manifest."""
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _is_text(path):
+    """Same heuristic as grep -I: a NUL byte in the first block means binary."""
+    with open(path, "rb") as f:
+        return b"\0" not in f.read(8192)
+
+class TemplateStore:
+    """
+    Per-platform template bundles in a shared, content-addressed store:
+        objects/<sha[:2]>/<sha>           file contents, read-only, shared by all bundles
+        bundles/<platform>-<id>.json      manifest: dirs, files (path, sha256, size, mode, link), symlinks
+        index.json                        {platform: bundle id}
+
+    Workspaces get only the platforms they build. Binary, non-executable files (Gradle wrapper jar,
+    keystores, images) are hardlinked from the store; text files are copied, since the generator and
+    the native toolchains rewrite them in place (a write through a hardlink would change the store and
+    every other job's workspace). Every file is checked against its manifest hash on the way.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.bundles_dir = os.path.join(root, "bundles")
+
+    def object_path(self, sha256):
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def _write_json(self, path, data):
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(temp_path, path)
+
+    def load_index(self):
+        try:
+            with open(os.path.join(self.root, INDEX_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _add_object(self, src_path, sha256):
+        object_path = self.object_path(sha256)
+        if os.path.exists(object_path):
+            return
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path), prefix=".tmp-")
+        with os.fdopen(fd, "wb") as dst, open(src_path, "rb") as src:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.chmod(temp_path, 0o444)
+        os.replace(temp_path, object_path)
+
+    def add_platform(self, platform_name, platform_root):
+        """
+        Stores `platform_root` (e.g., template-app/android) as the bundle for `platform_name`.
+
+        Returns:
+            str: The bundle id, a hash of the manifest (same tree, same id).
+        """
+        entries = {"dirs": [], "files": [], "symlinks": []}
+        for root, dirs, names in os.walk(platform_root):
+            dirs.sort()
+            rel_root = os.path.relpath(root, platform_root).replace(os.sep, "/")
+            if rel_root != ".":
+                entries["dirs"].append(rel_root)
+            for name in sorted(names) + [d for d in dirs if os.path.islink(os.path.join(root, d))]:
+                path = os.path.join(root, name)
+                rel_path = name if rel_root == "." else f"{rel_root}/{name}"
+                if os.path.islink(path):
+                    entries["symlinks"].append({"path": rel_path, "target": os.readlink(path)})
+                    continue
+                if not os.path.isfile(path):
+                    raise TemplateStoreError(f"Unsupported file type in template: {path}")
+                sha256 = _file_sha256(path)
+                mode = stat.S_IMODE(os.stat(path).st_mode)
+                text = _is_text(path)
+                if text:
+                    with open(path, "rb") as f:
+                        if ABSOLUTE_WORKSPACE_PATH.search(f.read()):
+                            raise TemplateStoreError(f"{path} refers to /app/...; use a path relative to the project instead.")
+                self._add_object(path, sha256)
+                entries["files"].append({"path": rel_path, "sha256": sha256, "size": os.path.getsize(path), "mode": mode,
+                                         "link": not (mode & 0o111) and not text})
+            dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+        bundle_id = hashlib.sha256(json.dumps(entries, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        os.makedirs(self.bundles_dir, exist_ok=True)
+        self._write_json(os.path.join(self.bundles_dir, f"{platform_name}-{bundle_id}.json"), entries)
+        index = self.load_index()
+        index[platform_name] = bundle_id
+        self._write_json(os.path.join(self.root, INDEX_NAME), index)
+        return bundle_id
+
+    def load_bundle(self, platform_name):
+        """The manifest of the platform's current bundle, or None if the store has no such platform."""
+        bundle_id = self.load_index().get(platform_name)
+        if bundle_id is None:
+            return None
+        with open(os.path.join(self.bundles_dir, f"{platform_name}-{bundle_id}.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def mirror(self, dest_root):
+        """
+        Copies the store to `dest_root` (e.g., onto the volume holding build workspaces, which hardlinks
+        cannot reach from the image) and returns the copy. Objects already there are kept: same name, same content.
+        """
+        mirror = TemplateStore(dest_root)
+        for root, _dirs, names in os.walk(self.objects_dir):
+            for name in names:
+                if not name.startswith("."):
+                    mirror._add_object(os.path.join(root, name), name)
+        shutil.copytree(self.bundles_dir, mirror.bundles_dir, dirs_exist_ok=True)
+        mirror._write_json(os.path.join(dest_root, INDEX_NAME), self.load_index())
+        return mirror
+
+    def _place_file(self, entry, dest_path):
+        """Hardlinks or copies one file out of the store, verifying its hash. Returns True if it was linked."""
+        object_path = self.object_path(entry["sha256"])
+        if entry["link"]:
+            if _file_sha256(object_path) != entry["sha256"]:
+                raise TemplateStoreError(f"Stored object for {entry['path']} is corrupted; rebuild the template store.")
+            try:
+                os.link(object_path, dest_path)
+                return True
+            except OSError:
+                pass # Another filesystem (EXDEV) or no hardlink support: copy instead
+
+        digest = hashlib.sha256()
+        with open(object_path, "rb") as src, open(dest_path, "wb") as dst:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+        if digest.hexdigest() != entry["sha256"]:
+            raise TemplateStoreError(f"Stored object for {entry['path']} is corrupted; rebuild the template store.")
+        os.chmod(dest_path, entry["mode"])
+        return False
+
+    def extract_file(self, platform_name, rel_path, dest_path):
+        """
+        Copies one file of the platform's bundle (e.g., android 'debug.keystore') to `dest_path`, verified.
+
+        Raises:
+            TemplateStoreError: If the store has no bundle for the platform, the bundle has no such file,
+                or its object fails verification.
+        """
+        entries = self.load_bundle(platform_name)
+        if entries is None:
+            raise TemplateStoreError(f"Template store {self.root} has no '{platform_name}' bundle.")
+        entry = next((entry for entry in entries["files"] if entry["path"] == rel_path), None)
+        if entry is None:
+            raise TemplateStoreError(f"The '{platform_name}' bundle in {self.root} has no {rel_path}.")
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        self._place_file(dict(entry, link=False), dest_path)
+        return dest_path
+
+    def materialize(self, platform_name, dest):
+        """
+        Lays out the platform's template at `dest`, unless something is already there (a workspace
+        from an earlier run, or a project mounted by the user).
+        Built next to `dest` and renamed into place, so an interrupted run leaves no half-made project.
+
+        Returns:
+            dict or None: {"files", "linked", "bytes"} if the template was materialized, None if `dest` already existed.
+
+        Raises:
+            TemplateStoreError: If the store has no bundle for the platform or an object fails verification.
+        """
+        if os.path.exists(dest):
+            return None
+        entries = self.load_bundle(platform_name)
+        if entries is None:
+            raise TemplateStoreError(f"Template store {self.root} has no '{platform_name}' bundle.")
+
+        parent = os.path.dirname(os.path.abspath(dest))
+        os.makedirs(parent, exist_ok=True)
+        temp_root = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(dest)}-")
+        summary = {"files": 0, "linked": 0, "bytes": 0}
+        try:
+            for rel_dir in entries["dirs"]:
+                os.makedirs(os.path.join(temp_root, *rel_dir.split("/")), exist_ok=True)
+            for entry in entries["files"]:
+                linked = self._place_file(entry, os.path.join(temp_root, *entry["path"].split("/")))
+                summary["files"] += 1
+                summary["linked"] += linked
+                summary["bytes"] += 0 if linked else entry["size"]
+            for entry in entries["symlinks"]:
+                os.symlink(entry["target"], os.path.join(temp_root, *entry["path"].split("/")))
+            os.chmod(temp_root, 0o755)
+            os.rename(temp_root, dest)
+        except BaseException:
+            shutil.rmtree(temp_root, ignore_errors=True)
+            raise
+        return summary
+
+def build_template_store(template_root, store_root):
+    """
+    Stores every platform dir of `template_root` (android, windows, ...) as its own bundle.
+
+    Returns:
+        dict: {platform: bundle id}
+    """
+    store = TemplateStore(store_root)
+    os.makedirs(store_root, exist_ok=True)
+    return {name: store.add_platform(name, os.path.join(template_root, name))
+            for name in sorted(os.listdir(template_root)) if os.path.isdir(os.path.join(template_root, name))}
+
+def default_template_store():
+    """The store named by $APPIZER_TEMPLATE_STORE, else the one baked into the image."""
+    return TemplateStore(os.environ.get(TEMPLATE_STORE_ENV, DEFAULT_TEMPLATE_STORE))
+
+def materialize_platform(platform_name, project_root, store_root=None):
+    """
+    Materializes a missing platform project from the template store (APPIZER_TEMPLATE_STORE by default).
+
+    Returns:
+        bool: True if the project was laid out now.
+    """
+    store = TemplateStore(store_root) if store_root else default_template_store()
+    summary = store.materialize(platform_name, project_root)
+    if summary is None:
+        return False
+    print(f"  [template] ✅ Materialized {platform_name} template into {project_root}: {summary['files']} files, "
+          f"{summary['linked']} hardlinked from {store.root}, {summary['bytes']} bytes copied.")
+    return True
@@ -0,0 +1,155 @@
+# generator/utils/watcher.py
+import os
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+
+# inotify(7) constants (Linux). Only the events that signal content changes are watched.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct("iIII") # wd, mask, cookie, len
+
+
+class InotifyWatcher:
+    """
+    Watches files and directory trees with inotify.
+    Single files are watched through their parent directory so editors that save by
+    renaming a temp file over the original are still picked up.
+    """
+
+    def __init__(self, paths, debounce=0.1):
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found; inotify is unavailable.")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not supported on this platform.")
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._debounce = debounce
+        self._wd_to_dir = {}
+        self._files = set()
+        self._trees = []
+
+        for path in paths:
+            path = os.path.abspath(path)
+            if os.path.isdir(path):
+                self._trees.append(path)
+                self._add_tree(path)
+            else:
+                self._files.add(path)
+                self._add_watch(os.path.dirname(path))
+
+    def _add_watch(self, directory):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            print(f"  [watcher] ⚠️ Could not watch {directory} (errno {ctypes.get_errno()}).")
+            return
+        self._wd_to_dir[wd] = directory
+
+    def _add_tree(self, root):
+        for current, dirs, _ in os.walk(root):
+            self._add_watch(current)
+
+    def _is_relevant(self, path):
+        return path in self._files or any(path == tree or path.startswith(tree + os.sep) for tree in self._trees)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until something changes (or `timeout` seconds pass).
+
+        Returns:
+            set: Absolute paths that changed. Empty on timeout.
+        """
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        time.sleep(self._debounce) # Let bursts (e.g. a bundler writing many files) coalesce
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                directory = self._wd_to_dir.get(wd)
+                if directory is None:
+                    continue
+                path = os.path.join(directory, os.fsdecode(name)) if name else directory
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and self._is_relevant(path):
+                    self._add_tree(path)
+                if self._is_relevant(path):
+                    changed.add(path)
+        return changed
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that compares (mtime, size) snapshots every `interval` seconds."""
+
+    def __init__(self, paths, interval=1.0):
+        self._paths = [os.path.abspath(p) for p in paths]
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for path in self._paths:
+            if os.path.isdir(path):
+                for current, _, files in os.walk(path):
+                    for name in files:
+                        file_path = os.path.join(current, name)
+                        try:
+                            st = os.stat(file_path)
+                        except FileNotFoundError:
+                            continue
+                        snapshot[file_path] = (st.st_mtime_ns, st.st_size)
+            elif os.path.exists(path):
+                st = os.stat(path)
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Same contract as InotifyWatcher.wait."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self._interval)
+            current = self._take_snapshot()
+            changed = {p for p in set(current) | set(self._snapshot) if current.get(p) != self._snapshot.get(p)}
+            self._snapshot = current
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def create_watcher(paths, poll_interval=1.0):
+    """Returns an InotifyWatcher when the kernel supports it, otherwise a PollingWatcher."""
+    try:
+        watcher = InotifyWatcher(paths)
+        print("  [watcher] Using inotify for change detection.")
+        return watcher
+    except (OSError, AttributeError) as e:
+        print(f"  [watcher] ℹ️ inotify unavailable ({e}). Falling back to polling every {poll_interval}s.")
+        return PollingWatcher(paths, poll_interval)
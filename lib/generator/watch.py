@@ -0,0 +1,238 @@
+# generator/watch.py
+import os
+import sys
+import time
+import shutil
+
+from modifiers.android import inject_into_android_files, ANDROID_STAGES
+from modifiers.windows import inject_into_windows_files, WINDOWS_STAGES
+from utils.config_loader import load_merged_config, resolve_platform_config
+from utils.scratch import job_scratch
+from utils.watcher import create_watcher
+from utils.placeholder_scan import check_rendered_workspace
+from utils.template_store import TemplateStore
+
+# Which modifier stages depend on which (platform-resolved) config keys.
+# The first matching prefix wins; "full" means the platform workspace is re-materialized from the template.
+ANDROID_STAGE_TRIGGERS = [
+    ("app_config", ("assets",)),
+    ("asset_tokens", ("assets",)),
+    ("package_name", "full"),
+    ("logo", ("icons",)),
+    ("flavors", ("render", "icons")),
+    ("webapp.theme_color", ("render", "icons")),
+    ("splash.content", ("render", "splash")),
+    ("splash.type", ("render", "splash")),
+    ("resources", ("icons", "splash")),
+    ("build.min_sdk_version", ("render", "icons", "splash")), # WebP output falls back to PNG below API 18
+    ("url", ("render", "assets")),
+    ("", ("render",)),
+]
+
+WINDOWS_STAGE_TRIGGERS = [
+    ("app_config", ("assets",)),
+    ("asset_tokens", ("assets",)),
+    ("url", ("render", "assets")),
+    ("", ("render",)),
+]
+
+WATCHED_PLATFORMS = {
+    "android": (inject_into_android_files, ANDROID_STAGES, ANDROID_STAGE_TRIGGERS),
+    "windows": (inject_into_windows_files, WINDOWS_STAGES, WINDOWS_STAGE_TRIGGERS),
+}
+
+
+def flatten_config(config, prefix=""):
+    """Flattens nested dicts into {"a.b.c": value} so two configs can be diffed key by key."""
+    flat = {}
+    for key, value in (config or {}).items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict) and value:
+            flat.update(flatten_config(value, dotted + "."))
+        else:
+            flat[dotted] = value
+    return flat
+
+def stages_for_config_change(old_config, new_config, triggers):
+    """
+    Maps the keys that differ between two platform configs to the stages that must be re-applied.
+
+    Returns:
+        set: Stage names, or {"full"} if the workspace has to be rebuilt from the template.
+    """
+    old_flat, new_flat = flatten_config(old_config), flatten_config(new_config)
+    stages = set()
+    for key in set(old_flat) | set(new_flat):
+        if old_flat.get(key) == new_flat.get(key):
+            continue
+        for prefix, triggered in triggers:
+            if key == prefix or key.startswith(prefix + ".") or prefix == "":
+                if triggered == "full":
+                    return {"full"}
+                stages.update(triggered)
+                break
+    return stages
+
+def stages_for_asset_change(changed_paths, platform_config, webapp_assets_dir):
+    """Every asset change needs an asset sync; splash/logo source files also re-run their stage."""
+    stages = {"assets"}
+    splash_content = (platform_config.get("splash") or {}).get("content") or ""
+    splash_source = os.path.join(webapp_assets_dir, splash_content) if splash_content else None
+    logo_source = platform_config.get("logo") or None
+    for path in changed_paths:
+        if splash_source and os.path.abspath(path) == os.path.abspath(splash_source):
+            stages.add("splash")
+        if logo_source and os.path.abspath(path) == os.path.abspath(logo_source):
+            stages.add("icons")
+    return stages
+
+def restore_rendered_files(template_platform_root, workspace_platform_root):
+    """
+    Copies every template file that contains {{...}} placeholders back into the workspace,
+    so the render stage can be re-applied to pristine content.
+    """
+    restored = 0
+    for root, _, files in os.walk(template_platform_root):
+        for name in files:
+            src_path = os.path.join(root, name)
+            try:
+                with open(src_path, "r", encoding="utf-8") as f:
+                    if "{{" not in f.read():
+                        continue
+            except (UnicodeDecodeError, OSError):
+                continue
+            dst_path = os.path.join(workspace_platform_root, os.path.relpath(src_path, template_platform_root))
+            os.makedirs(os.path.dirname(dst_path), exist_ok=True)
+            shutil.copy2(src_path, dst_path)
+            restored += 1
+    print(f"  [watch] Restored {restored} template file(s) for re-rendering.")
+
+def pristine_template_root(template_root, platforms, scratch):
+    """
+    A dir holding the pristine template of each watched platform. `template_root` is used as-is when it
+    is a template-app dir; a template store (e.g., /opt/appizer/templates) is materialized once into
+    `scratch` for the whole session, since the image ships no template-app tree.
+
+    Raises:
+        TemplateStoreError: If the store has no bundle for one of `platforms`.
+    """
+    store = TemplateStore(template_root)
+    if not store.load_index():
+        return template_root
+    pristine_root = scratch.mkdtemp(prefix="template-")
+    for name in platforms:
+        store.materialize(name, os.path.join(pristine_root, name))
+    print(f"  [watch] Materialized {', '.join(platforms)} from template store {template_root}.")
+    return pristine_root
+
+def apply_platform(platform_name, stages, full_config, template_root, workspace_root, webapp_assets_dir):
+    """Re-applies `stages` for one platform and reports how long it took."""
+    inject, all_stages, _ = WATCHED_PLATFORMS[platform_name]
+    template_platform_root = os.path.join(template_root, platform_name)
+    workspace_platform_root = os.path.join(workspace_root, platform_name)
+    started = time.perf_counter()
+
+    if "full" in stages:
+        if os.path.exists(workspace_platform_root):
+            shutil.rmtree(workspace_platform_root)
+        shutil.copytree(template_platform_root, workspace_platform_root, symlinks=True)
+        stages = set(all_stages)
+    elif "render" in stages:
+        restore_rendered_files(template_platform_root, workspace_platform_root)
+        if "sources" in all_stages:
+            stages = set(stages) | {"sources"} # Restored Java files sit in the template package again
+
+    ordered_stages = [stage for stage in all_stages if stage in stages]
+    platform_config = resolve_platform_config(full_config, platform_name)
+    # Each re-apply gets a fresh scratch dir (downloads, staged icons), removed right after
+    with job_scratch("watch") as scratch:
+        inject(platform_config, workspace_platform_root, workspace_root, webapp_assets_dir, stages=ordered_stages, scratch=scratch)
+    if "render" in ordered_stages:
+        check_rendered_workspace(workspace_platform_root, platform_name)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"⏱️  [watch] {platform_name}: applied {', '.join(ordered_stages)} in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    # Expected arguments:
+    # 1. template_root (e.g., /opt/appizer/templates, or a template-app dir) - pristine templates, never modified
+    # 2. workspace_root (e.g., /workspace) - persistent project that is updated incrementally
+    # 3. config_file (e.g., /config.yaml) - user's config, merged over default_config.yaml
+    # 4. webapp_assets_dir (e.g., /webapp)
+    # 5. platform (e.g., "android", or "all" for every watchable platform)
+    # 6. poll_interval in seconds, used only when inotify is unavailable (optional, default 1.0)
+    if len(sys.argv) < 6:
+        print("Usage: python3 watch.py <template_root> <workspace_root> <config_file> <webapp_assets_dir> <platform> [poll_interval]")
+        sys.exit(1)
+
+    template_root = os.path.abspath(sys.argv[1])
+    workspace_root = os.path.abspath(sys.argv[2])
+    config_file = os.path.abspath(sys.argv[3])
+    webapp_assets_dir = os.path.abspath(sys.argv[4])
+    platform = sys.argv[5]
+    poll_interval = float(sys.argv[6]) if len(sys.argv) > 6 else 1.0
+
+    platforms = list(WATCHED_PLATFORMS) if platform == "all" else [platform]
+    for name in platforms:
+        if name not in WATCHED_PLATFORMS:
+            print(f"❌ Watch mode supports: {', '.join(WATCHED_PLATFORMS)} (got '{name}').")
+            sys.exit(1)
+
+    default_config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_config.yaml")
+    full_config = load_merged_config(default_config_path, config_file)
+    if full_config is None:
+        sys.exit(1)
+
+    # Pristine files for restores and full re-materializations; lives as long as the session
+    template_scratch = job_scratch("watch-template")
+    try:
+        template_root = pristine_template_root(template_root, platforms, template_scratch)
+    except Exception as e:
+        template_scratch.cleanup()
+        print(f"❌ [watch] Could not prepare the templates: {e}")
+        sys.exit(1)
+
+    # Initial apply: materialize missing workspaces, re-render existing ones.
+    for name in platforms:
+        workspace_exists = os.path.isdir(os.path.join(workspace_root, name))
+        apply_platform(name, {"render", *WATCHED_PLATFORMS[name][1]} if workspace_exists else {"full"},
+                       full_config, template_root, workspace_root, webapp_assets_dir)
+
+    watcher = create_watcher([config_file, webapp_assets_dir], poll_interval)
+    print(f"👀 [watch] Watching {config_file} and {webapp_assets_dir}. Press Ctrl+C to stop.")
+    try:
+        while True:
+            changed_paths = watcher.wait()
+            if not changed_paths:
+                continue
+
+            config_changed = config_file in changed_paths
+            asset_changes = {p for p in changed_paths if p != config_file}
+
+            new_config = full_config
+            if config_changed:
+                new_config = load_merged_config(default_config_path, config_file)
+                if new_config is None:
+                    print("⚠️  [watch] Config is invalid; keeping the last good config until it is fixed.")
+                    new_config = full_config
+
+            for name in platforms:
+                old_platform_config = resolve_platform_config(full_config, name)
+                new_platform_config = resolve_platform_config(new_config, name)
+                stages = stages_for_config_change(old_platform_config, new_platform_config, WATCHED_PLATFORMS[name][2])
+                if asset_changes:
+                    stages |= stages_for_asset_change(asset_changes, new_platform_config, webapp_assets_dir)
+                if not stages:
+                    print(f"  [watch] {name}: no stages affected.")
+                    continue
+                try:
+                    apply_platform(name, stages, new_config, template_root, workspace_root, webapp_assets_dir)
+                except Exception as e:
+                    print(f"❌ [watch] {name}: incremental apply failed: {e}")
+            full_config = new_config
+    except KeyboardInterrupt:
+        print("\n[watch] Stopped.")
+    finally:
+        watcher.close()
+        template_scratch.cleanup()
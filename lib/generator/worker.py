@@ -0,0 +1,135 @@
+# generator/worker.py
+import os
+import io
+import sys
+import json
+import time
+import socket
+import contextlib
+import socketserver
+
+from api import generate
+from modifiers.loader import PLATFORM_MODIFIERS, load_modifier
+from utils.metrics import METRICS_PORT_ENV, serve_metrics
+
+def warm_up():
+    """Imports every implemented modifier and Pillow up front, so the first job pays no import cost."""
+    started = time.perf_counter()
+    for platform_name in PLATFORM_MODIFIERS:
+        load_modifier(platform_name)
+    try:
+        import PIL.Image, PIL.ImageDraw, PIL.ImageFont # noqa: F401 (preloaded for icon generation)
+    except ImportError:
+        print("  [worker] ⚠️ Pillow is not installed; icon generation will fail.")
+    print(f"  [worker] Warmed up in {(time.perf_counter() - started) * 1000:.1f} ms.")
+
+def handle_request(request):
+    """
+    Runs one request and returns the response dict.
+
+    Requests:
+        {"op": "ping"}
+        {"op": "generate", "config": {...}, "workspace": "...", "platforms": "android",
+         "webapp_assets_dir": "...", "template_root": "...", "stages": {...}}
+
+    Responses:
+        {"ok": true, "result": <api.generate result>, "log": "..."} or {"ok": false, "error": "...", "log": "..."}
+    """
+    op = request.get("op", "generate")
+    if op == "ping":
+        return {"ok": True}
+    if op != "generate":
+        return {"ok": False, "error": f"Unknown op '{op}'."}
+
+    log = io.StringIO()
+    try:
+        # Jobs run one at a time per worker, so redirecting the process-wide stdout is safe here.
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            result = generate(
+                request["config"],
+                request["workspace"],
+                request.get("platforms", "all"),
+                request.get("webapp_assets_dir", ""),
+                request.get("template_root"),
+                request.get("stages"),
+            )
+        return {"ok": True, "result": result, "log": log.getvalue()}
+    except Exception as e:
+        return {"ok": False, "error": str(e), "log": log.getvalue()}
+
+
+class GeneratorJobHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request per line, one response per line, many per connection."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as e:
+                response = {"ok": False, "error": f"Invalid JSON: {e}"}
+            else:
+                started = time.perf_counter()
+                response = handle_request(request)
+                print(f"  [worker] {request.get('op', 'generate')} handled in {(time.perf_counter() - started) * 1000:.1f} ms "
+                      f"(ok={response['ok']}).")
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+def serve(socket_path):
+    """Serves generator jobs on a Unix socket until interrupted."""
+    if os.path.exists(socket_path):
+        os.remove(socket_path) # Stale socket from a previous worker
+    warm_up()
+    if os.environ.get(METRICS_PORT_ENV):
+        serve_metrics(int(os.environ[METRICS_PORT_ENV]))
+    with socketserver.UnixStreamServer(socket_path, GeneratorJobHandler) as server:
+        print(f"✅ [worker] Generator worker listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n[worker] Stopped.")
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+
+def submit_job(socket_path, request, timeout=None):
+    """
+    Sends one request to a running worker and waits for its response.
+
+    Args:
+        socket_path (str): The worker's Unix socket.
+        request (dict): See handle_request.
+        timeout (float, optional): Socket timeout in seconds.
+
+    Returns:
+        dict: The worker's response.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError(f"Worker at {socket_path} closed the connection without a response.")
+    return json.loads(line)
+
+
+if __name__ == "__main__":
+    # Usage:
+    #   python3 worker.py serve <socket_path>
+    #   python3 worker.py submit <socket_path> <request.json>   (prints the response JSON)
+    if len(sys.argv) < 3 or sys.argv[1] not in ("serve", "submit") or (sys.argv[1] == "submit" and len(sys.argv) < 4):
+        print("Usage: python3 worker.py serve <socket_path> | python3 worker.py submit <socket_path> <request.json>")
+        sys.exit(1)
+
+    if sys.argv[1] == "serve":
+        serve(sys.argv[2])
+    else:
+        with open(sys.argv[3], "r", encoding="utf-8") as f:
+            response = submit_job(sys.argv[2], json.load(f))
+        print(json.dumps(response, indent=2))
+        sys.exit(0 if response.get("ok") and response.get("result", {}).get("success", True) else 1)
@@ -0,0 +1,71 @@
+package com.example.app; // This will be updated by the Python script
+
+import android.content.Context;
+import android.graphics.Color;
+import android.util.Log;
+import androidx.core.content.ContextCompat;
+import org.json.JSONObject;
+import java.io.ByteArrayOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.charset.StandardCharsets;
+
+// Runtime values read at startup. The generator bakes defaults into the activities; with
+// `runtime_config: true` it also bundles assets/appizer-config.json, whose values win. The
+// re-skin path swaps that asset inside a prebuilt APK, so no recompile is needed to change them.
+final class AppConfig {
+
+    static final String ASSET_NAME = "appizer-config.json";
+
+    private static JSONObject values;
+
+    private AppConfig() {}
+
+    static synchronized JSONObject values(Context context) {
+        if (values == null) {
+            try {
+                values = new JSONObject(readAsset(context, ASSET_NAME));
+            } catch (Exception e) {
+                values = new JSONObject(); // No runtime config bundled: use the built-in defaults
+            }
+        }
+        return values;
+    }
+
+    static String getString(Context context, String key, String fallback) {
+        return values(context).optString(key, fallback);
+    }
+
+    static boolean getBoolean(Context context, String key, boolean fallback) {
+        return values(context).optBoolean(key, fallback);
+    }
+
+    static int getInt(Context context, String key, int fallback) {
+        return values(context).optInt(key, fallback);
+    }
+
+    // Parses a "#RRGGBB" value, falling back to a color resource (which product flavors may override).
+    static int getColor(Context context, String key, int fallbackResId) {
+        String value = values(context).optString(key, "");
+        if (!value.isEmpty()) {
+            try {
+                return Color.parseColor(value);
+            } catch (IllegalArgumentException e) {
+                Log.w("AppConfig", "Invalid color for " + key + ": " + value);
+            }
+        }
+        return ContextCompat.getColor(context, fallbackResId);
+    }
+
+    static String readAsset(Context context, String name) throws IOException {
+        try (InputStream in = context.getAssets().open(name)) {
+            ByteArrayOutputStream buffer = new ByteArrayOutputStream();
+            byte[] chunk = new byte[8192];
+            int read;
+            while ((read = in.read(chunk)) != -1) {
+                buffer.write(chunk, 0, read);
+            }
+            return new String(buffer.toByteArray(), StandardCharsets.UTF_8);
+        }
+    }
+}
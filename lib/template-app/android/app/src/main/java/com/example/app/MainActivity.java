@@ -2,14 +2,10 @@ package com.example.app; // This will be updated by the Python script
 
 import android.os.Bundle;
 import androidx.appcompat.app.AppCompatActivity;
-import android.webkit.WebSettings;
 import android.webkit.WebView;
-import android.webkit.WebViewClient;
-import android.graphics.Color;
+import android.view.ViewGroup;
 import android.view.WindowManager;
-import android.net.Uri;
-import android.content.Intent;
-import android.os.Build; // Import Build class
+import android.widget.FrameLayout;
 
 public class MainActivity extends AppCompatActivity {
 
@@ -19,49 +15,17 @@ public class MainActivity extends AppCompatActivity {
     protected void onCreate(Bundle savedInstanceState) {
         super.onCreate(savedInstanceState);
 
-        if ({{FULLSCREEN}}) {
+        if (AppConfig.getBoolean(this, "fullscreen", {{FULLSCREEN}})) {
             getWindow().setFlags(WindowManager.LayoutParams.FLAG_FULLSCREEN,
                                  WindowManager.LayoutParams.FLAG_FULLSCREEN);
         }
 
-        setContentView(R.layout.activity_main); // Make sure you have an activity_main.xml layout with a WebView ID
+        setContentView(R.layout.activity_main); // Make sure you have an activity_main.xml layout with a webview_container ID
 
-        webView = findViewById(R.id.webview);
-
-        WebSettings webSettings = webView.getSettings();
-        webSettings.setJavaScriptEnabled({{ENABLE_JS}});
-        webSettings.setAllowFileAccess({{ALLOW_FILE_ACCESS}});
-
-        // --- REMOVE OR COMMENT OUT THESE LINES IF TARGETING API 33+ ---
-        // These methods are deprecated and removed in modern Android APIs (e.g., API 33+)
-        // They cause compilation errors when compileSdk is 33 or higher.
-        // If you specifically need AppCache, DOM Storage, or Database features,
-        // you would need to implement them using alternative, modern APIs
-        // or conditionally apply them only for older SDK versions (e.g., Build.VERSION.SDK_INT < Build.VERSION_CODES.TIRAMISU)
-        // webSettings.setDomStorageEnabled({{DOM_STORAGE_ENABLED}});
-        // webSettings.setDatabaseEnabled({{DATABASE_ENABLED}});
-        // webSettings.setAppCacheEnabled({{APP_CACHE_ENABLED}});
-        // --- END REMOVAL/COMMENT ---
-
-        webSettings.setBuiltInZoomControls({{BUILT_IN_ZOOM_CONTROLS}});
-        webSettings.setSupportZoom({{SUPPORT_ZOOM}});
-
-        // Custom User Agent (if provided)
-        String userAgent = "{{USER_AGENT}}";
-        if (!userAgent.isEmpty()) {
-            webSettings.setUserAgentString(userAgent);
-        }
-
-        webView.setWebViewClient(new WebViewClient() {
-            @Override
-            public boolean shouldOverrideUrlLoading(WebView view, String url) {
-                // For simplicity, always load in internal WebView for now.
-                // You can add logic here to open external URLs in a browser if needed.
-                return false;
-            }
-        });
-
-        webView.loadUrl("{{URL}}");
+        // The WebView the splash preloaded (already loading or painted), or a new one; settings live in WebViewPreloader.
+        webView = WebViewPreloader.adopt(this);
+        FrameLayout container = findViewById(R.id.webview_container);
+        container.addView(webView, new FrameLayout.LayoutParams(ViewGroup.LayoutParams.MATCH_PARENT, ViewGroup.LayoutParams.MATCH_PARENT));
     }
 
     @Override
@@ -72,4 +36,4 @@ public class MainActivity extends AppCompatActivity {
             super.onBackPressed();
         }
     }
-}
\ No newline at end of file
+}
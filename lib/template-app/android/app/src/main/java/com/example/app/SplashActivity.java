@@ -6,9 +6,14 @@ package com.example.app; // This line should be at the very top, ONLY ONCE.
 import android.content.Intent;
 import android.os.Bundle;
 import android.os.Handler;
+import android.os.Looper;
+import android.os.SystemClock;
 import android.graphics.Color;
 import android.view.WindowManager;
 import androidx.appcompat.app.AppCompatActivity;
+import androidx.core.splashscreen.SplashScreen;
+import android.webkit.WebView;
+import android.widget.FrameLayout;
 import android.widget.ImageView;
 import android.widget.TextView;
 import android.view.Gravity;
@@ -19,12 +24,17 @@ import android.util.Log; // Ensure Log import is present if you use Log.e
 
 public class SplashActivity extends AppCompatActivity {
 
+    private final Handler handler = new Handler(Looper.getMainLooper());
+    private boolean dismissed = false;
+
     @Override
     protected void onCreate(Bundle savedInstanceState) {
+        // Must run before super.onCreate(); hands the window over from Theme.App.Starting.
+        SplashScreen systemSplash = SplashScreen.installSplashScreen(this);
         super.onCreate(savedInstanceState);
 
         // Set fullscreen if requested
-        if ({{FULLSCREEN}}) {
+        if (AppConfig.getBoolean(this, "fullscreen", {{FULLSCREEN}})) {
             getWindow().setFlags(WindowManager.LayoutParams.FLAG_FULLSCREEN,
                                  WindowManager.LayoutParams.FLAG_FULLSCREEN);
         }
@@ -35,17 +45,21 @@ public class SplashActivity extends AppCompatActivity {
         splashLayout.setOrientation(LinearLayout.VERTICAL);
         splashLayout.setGravity(Gravity.CENTER);
 
-        // Set background color safely
-        try {
-            splashLayout.setBackgroundColor(Color.parseColor("{{SPLASH_BACKGROUND_COLOR}}"));
-        } catch (IllegalArgumentException e) {
-            splashLayout.setBackgroundColor(Color.BLACK); // fallback
-            Log.e("SplashActivity", "Invalid SPLASH_BACKGROUND_COLOR, using fallback.");
-        }
-
-        String splashType = "{{SPLASH_TYPE}}";  // "image" or "text"
-        if ("image".equalsIgnoreCase(splashType)) {
-            String splashContentName = "{{SPLASH_CONTENT}}";  // e.g., "splash.png"
+        // Colors and app name come from resources so product flavors can override them;
+        // a bundled runtime config (see AppConfig) overrides the colors again.
+        splashLayout.setBackgroundColor(AppConfig.getColor(this, "splash_background_color", R.color.splash_background));
+
+        String splashType = AppConfig.getString(this, "splash_type", "{{SPLASH_TYPE}}");  // "image", "text" or "system"
+        if ("system".equalsIgnoreCase(splashType)) {
+            // Only the system splash (theme background + launcher icon); it stays up until dismissSplash().
+            systemSplash.setKeepOnScreenCondition(new SplashScreen.KeepOnScreenCondition() {
+                @Override
+                public boolean shouldKeepOnScreen() {
+                    return !dismissed;
+                }
+            });
+        } else if ("image".equalsIgnoreCase(splashType)) {
+            String splashContentName = AppConfig.getString(this, "splash_content", "{{SPLASH_CONTENT}}");  // e.g., "splash.png"
 
             if (splashContentName != null && !splashContentName.isEmpty()) {
                 String drawableName;
@@ -85,32 +99,82 @@ public class SplashActivity extends AppCompatActivity {
         } else {
             // Default to text splash
             TextView appNameText = new TextView(this);
-            appNameText.setText("{{APP_NAME}}");
-
-            try {
-                appNameText.setTextColor(Color.parseColor("{{SPLASH_TEXT_COLOR}}"));
-            } catch (IllegalArgumentException e) {
-                appNameText.setTextColor(Color.WHITE);
-                Log.e("SplashActivity", "Invalid SPLASH_TEXT_COLOR, using white.");
-            }
+            appNameText.setText(R.string.app_name);
+            appNameText.setTextColor(AppConfig.getColor(this, "splash_text_color", R.color.splash_text_color));
 
             appNameText.setTextSize(TypedValue.COMPLEX_UNIT_SP, 36);
             appNameText.setGravity(Gravity.CENTER);
             splashLayout.addView(appNameText);
         }
 
-        // Set the view
-        setContentView(splashLayout);
+        // "timer": show the splash for splash_duration ms. "preload": load the WebView underneath the splash
+        // and dismiss once it is ready (no sooner than splash_min_duration, no later than splash_duration).
+        String splashMode = AppConfig.getString(this, "splash_mode", "{{SPLASH_MODE}}");
+        int maxDuration = AppConfig.getInt(this, "splash_duration", {{SPLASH_DURATION}});
+        if ("preload".equalsIgnoreCase(splashMode)) {
+            final int minDuration = AppConfig.getInt(this, "splash_min_duration", {{SPLASH_MIN_DURATION}});
+            final long startedAt = SystemClock.uptimeMillis();
+            // While the system splash is kept on screen nothing is drawn, so first paint never comes.
+            String dismissOn = "system".equalsIgnoreCase(splashType)
+                    ? WebViewPreloader.PAGE_FINISHED
+                    : AppConfig.getString(this, "splash_dismiss_on", "{{SPLASH_DISMISS_ON}}");
+
+            WebView webView = WebViewPreloader.preload(this, dismissOn, new WebViewPreloader.Listener() {
+                @Override
+                public void onReady() {
+                    long remaining = minDuration - (SystemClock.uptimeMillis() - startedAt);
+                    if (remaining <= 0) {
+                        dismissSplash();
+                    } else {
+                        handler.postDelayed(new Runnable() {
+                            @Override
+                            public void run() {
+                                dismissSplash();
+                            }
+                        }, remaining);
+                    }
+                }
+            });
+
+            // The WebView has to be attached to lay out and paint; the opaque splash layout covers it.
+            FrameLayout root = new FrameLayout(this);
+            root.addView(webView, new FrameLayout.LayoutParams(LayoutParams.MATCH_PARENT, LayoutParams.MATCH_PARENT));
+            root.addView(splashLayout, new FrameLayout.LayoutParams(LayoutParams.MATCH_PARENT, LayoutParams.MATCH_PARENT));
+            setContentView(root);
+        } else {
+            setContentView(splashLayout);
+        }
 
-        // Start MainActivity after delay
-        new Handler().postDelayed(new Runnable() {
+        // Start MainActivity after delay (in preload mode: the upper bound, for pages that never finish loading)
+        handler.postDelayed(new Runnable() {
             @Override
             public void run() {
-                Intent intent = new Intent(SplashActivity.this, MainActivity.class);
-                startActivity(intent);
-                finish();
+                dismissSplash();
             }
-        }, {{SPLASH_DURATION}});
+        }, maxDuration);
+    }
+
+    private void dismissSplash() {
+        if (dismissed || isFinishing()) {
+            return;
+        }
+        dismissed = true;
+        handler.removeCallbacksAndMessages(null);
+        Intent intent = new Intent(SplashActivity.this, MainActivity.class);
+        startActivity(intent);
+        // No transition: the adopted WebView shows the same page the splash just uncovered.
+        overridePendingTransition(0, 0);
+        finish();
+    }
+
+    @Override
+    protected void onDestroy() {
+        handler.removeCallbacksAndMessages(null);
+        if (!dismissed) {
+            // Left before MainActivity took the WebView over (back pressed, config change)
+            WebViewPreloader.discard();
+        }
+        super.onDestroy();
     }
 
     // Helper function for fallback error messages
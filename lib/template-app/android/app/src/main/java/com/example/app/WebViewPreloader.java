@@ -0,0 +1,163 @@
+package com.example.app; // This will be updated by the Python script
+
+import android.app.Activity;
+import android.content.Context;
+import android.content.MutableContextWrapper;
+import android.os.Build;
+import android.view.ViewGroup;
+import android.webkit.WebResourceRequest;
+import android.webkit.WebResourceResponse;
+import android.webkit.WebSettings;
+import android.webkit.WebView;
+import android.webkit.WebViewClient;
+import androidx.webkit.WebViewAssetLoader;
+
+// Creates the app's WebView. With `splash.mode: preload`, SplashActivity creates it during the splash
+// (on a MutableContextWrapper over the application context) and starts loading the start URL right away;
+// MainActivity then adopts the same, already painted WebView instead of starting from a blank one.
+final class WebViewPreloader {
+
+    static final String FIRST_PAINT = "first_paint";
+    static final String PAGE_FINISHED = "page_finished";
+
+    private static final String LOCAL_ASSET_PREFIX = "file:///android_asset/";
+
+    interface Listener {
+        // Called on the main thread once the preloaded page reached the requested event.
+        void onReady();
+    }
+
+    private static WebView preloaded;
+    private static MutableContextWrapper preloadedContext;
+    private static Listener listener;
+    private static String dismissOn = FIRST_PAINT;
+
+    private WebViewPreloader() {}
+
+    // Creates the WebView and starts loading; `onReady` fires on `event` (FIRST_PAINT or PAGE_FINISHED).
+    static WebView preload(Activity splashActivity, String event, Listener onReady) {
+        preloadedContext = new MutableContextWrapper(splashActivity.getApplicationContext());
+        dismissOn = event;
+        listener = onReady;
+        preloaded = create(preloadedContext);
+        preloaded.loadUrl(startUrl(splashActivity));
+        return preloaded;
+    }
+
+    // The preloaded WebView, rebased onto `activity` and detached from the splash; or a new one that starts loading now.
+    static WebView adopt(Activity activity) {
+        if (preloaded == null) {
+            WebView webView = create(activity);
+            webView.loadUrl(startUrl(activity));
+            return webView;
+        }
+        WebView webView = preloaded;
+        preloaded = null;
+        listener = null;
+        // Popups, dialogs and autofill need an Activity context from now on.
+        preloadedContext.setBaseContext(activity);
+        preloadedContext = null;
+        if (webView.getParent() instanceof ViewGroup) {
+            ((ViewGroup) webView.getParent()).removeView(webView);
+        }
+        return webView;
+    }
+
+    // Destroys a preloaded WebView nobody adopted (the splash went away without starting MainActivity).
+    static void discard() {
+        if (preloaded == null) {
+            return;
+        }
+        if (preloaded.getParent() instanceof ViewGroup) {
+            ((ViewGroup) preloaded.getParent()).removeView(preloaded);
+        }
+        preloaded.destroy();
+        preloaded = null;
+        preloadedContext = null;
+        listener = null;
+    }
+
+    private static void signal(String event) {
+        // Page finished implies it painted; either event is reported once.
+        if (listener != null && (event.equals(dismissOn) || PAGE_FINISHED.equals(event))) {
+            Listener ready = listener;
+            listener = null;
+            ready.onReady();
+        }
+    }
+
+    private static WebView create(Context context) {
+        WebView webView = new WebView(context);
+
+        WebSettings webSettings = webView.getSettings();
+        webSettings.setJavaScriptEnabled(AppConfig.getBoolean(context, "enable_javascript", {{ENABLE_JS}}));
+        webSettings.setAllowFileAccess(AppConfig.getBoolean(context, "allow_file_access", {{ALLOW_FILE_ACCESS}}));
+
+        // AppCache was removed in API 33; DOM storage (localStorage/sessionStorage) is still supported.
+        webSettings.setDomStorageEnabled(AppConfig.getBoolean(context, "dom_storage", {{DOM_STORAGE_ENABLED}}));
+
+        webSettings.setBuiltInZoomControls(AppConfig.getBoolean(context, "built_in_zoom_controls", {{BUILT_IN_ZOOM_CONTROLS}}));
+        webSettings.setSupportZoom(AppConfig.getBoolean(context, "support_zoom", {{SUPPORT_ZOOM}}));
+
+        // Custom User Agent (if provided)
+        String userAgent = AppConfig.getString(context, "user_agent", "{{USER_AGENT}}");
+        if (!userAgent.isEmpty()) {
+            webSettings.setUserAgentString(userAgent);
+        }
+
+        // --- Performance tuning (rendered from the `webapp` config) ---
+        webSettings.setCacheMode({{WEBVIEW_CACHE_MODE}});
+        webView.setLayerType({{WEBVIEW_LAYER_TYPE}}, null);
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.M) {
+            // Rasterize tiles while the WebView is still offscreen, so the first frame is ready sooner.
+            webSettings.setOffscreenPreRaster({{OFFSCREEN_PRE_RASTER}});
+        }
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            webView.setRendererPriorityPolicy({{RENDERER_PRIORITY}}, true);
+        }
+
+        // Serve bundled assets from a virtual https origin instead of file://, so same-origin rules apply
+        // and the page can register a service worker. Assets are read from the APK on every request
+        // (no HTTP cache in between); repeat-load caching comes from precache-manifest.json and sw.js.
+        final boolean useAssetLoader = AppConfig.getBoolean(context, "use_asset_loader", {{USE_ASSET_LOADER}});
+        final WebViewAssetLoader assetLoader = new WebViewAssetLoader.Builder()
+                .addPathHandler("/assets/", new WebViewAssetLoader.AssetsPathHandler(context))
+                .build();
+
+        webView.setWebViewClient(new WebViewClient() {
+            @Override
+            public WebResourceResponse shouldInterceptRequest(WebView view, WebResourceRequest request) {
+                if (useAssetLoader) {
+                    return assetLoader.shouldInterceptRequest(request.getUrl());
+                }
+                return super.shouldInterceptRequest(view, request);
+            }
+
+            @Override
+            public boolean shouldOverrideUrlLoading(WebView view, String url) {
+                // For simplicity, always load in internal WebView for now.
+                // You can add logic here to open external URLs in a browser if needed.
+                return false;
+            }
+
+            @Override
+            public void onPageCommitVisible(WebView view, String url) {
+                signal(FIRST_PAINT); // API 23+; older devices dismiss on page finished
+            }
+
+            @Override
+            public void onPageFinished(WebView view, String url) {
+                signal(PAGE_FINISHED);
+            }
+        });
+        return webView;
+    }
+
+    private static String startUrl(Context context) {
+        String startUrl = AppConfig.getString(context, "url", BuildConfig.START_URL);
+        if (AppConfig.getBoolean(context, "use_asset_loader", {{USE_ASSET_LOADER}}) && startUrl.startsWith(LOCAL_ASSET_PREFIX)) {
+            startUrl = "https://" + WebViewAssetLoader.DEFAULT_DOMAIN + "/assets/" + startUrl.substring(LOCAL_ASSET_PREFIX.length());
+        }
+        return startUrl;
+    }
+}